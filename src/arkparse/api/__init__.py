@@ -4,4 +4,5 @@ from .equipment_api import EquipmentApi
 from .player_api import PlayerApi
 from .rcon_api import RconApi
 from .stackable_api import StackableApi
-from .structure_api import StructureApi
\ No newline at end of file
+from .structure_api import StructureApi
+from .scan_coordinator import ScanCoordinator
\ No newline at end of file
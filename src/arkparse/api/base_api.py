@@ -1,4 +1,4 @@
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Set
 from uuid import UUID, uuid4
 from pathlib import Path
 import os
@@ -40,13 +40,7 @@ class BaseApi(StructureApi):
         if structures is None or len(structures) == 0:
             return None
         
-        all_structures: Dict[UUID, Structure] = {}
-        connected = self.get_connected_structures(structures)
-        for key, structure in structures.items():
-            all_structures[key] = structure
-            for key, conn_structure in connected.items():
-                if key not in all_structures:
-                    all_structures[key] = conn_structure
+        all_structures: Dict[UUID, Structure] = self.get_connected_structures(structures)
 
         if owner_tribe_id is not None or owner_tribe_name is not None:
             all_structures = {k: v for k, v in all_structures.items() if (v.owner.tribe_id == owner_tribe_id or v.owner.tribe_name == owner_tribe_name)}
@@ -57,7 +51,7 @@ class BaseApi(StructureApi):
         filtered_structures = {k: v for k, v in all_structures.items() if v.owner == keystone_owner}
 
         return Base(keystone.object.uuid, filtered_structures) if keystone is not None else None
-    
+
     def __get_all_files_from_dir_recursive(self, dir_path: Path) -> tuple[list[ImportFile], Optional[Path]]:
         out = []
         base_file = None
@@ -91,102 +85,110 @@ class BaseApi(StructureApi):
                 # print(f"Replacing {uuid} with {uuid_map[uuid]}")
             return bytes_
 
-        actor_transforms: Dict[UUID, ActorTransform] = {}
-        structures: Dict[UUID, Structure] = {}
-
-        files: Optional[List[ImportFile]] = None
-        base_file: Optional[Path] = None
-        files, base_file = self.__get_all_files_from_dir_recursive(path)
-
-        # assign new uuids to all
-        for file in files:
-            uuid_translation_map[file.uuid] = uuid4()
-
-        # Assign new uuids to all actor transforms and add them to the database
-        new_actor_transforms: bytes = bytes()
-        for file in files:
-            if file.type == "loc":
-                new_uuid: UUID = uuid_translation_map[file.uuid]
-                actor_transforms[new_uuid] = ActorTransform(from_json=Path(file.path))
-                new_actor_transforms += new_uuid.bytes + actor_transforms[new_uuid].to_bytes()
-        self.save.add_actor_transforms(new_actor_transforms)
-        # Update actor transforms in save context
-        self.save.read_actor_locations()
-
-        # get all inventory items and add them to DB
-        for file in files:
-            if file.type == "itm":
-                new_uuid = uuid_translation_map[file.uuid]
-                parser = ArkBinaryParser(file.bytes, self.save.save_context)
-                parser.byte_buffer = replace_uuids(uuid_translation_map, parser.byte_buffer)
-                parser.replace_name_ids(file.names, self.save)
-                self.save.add_obj_to_db(new_uuid, parser.byte_buffer)
-                item = InventoryItem(uuid=new_uuid, save=self.save)
-                item.reidentify(new_uuid)
+        # All objects, names and actor transforms are written in one transaction
+        with self.save.batch():
+            actor_transforms: Dict[UUID, ActorTransform] = {}
+            structures: Dict[UUID, Structure] = {}
+
+            files: Optional[List[ImportFile]] = None
+            base_file: Optional[Path] = None
+            files, base_file = self.__get_all_files_from_dir_recursive(path)
+
+            # assign new uuids to all
+            for file in files:
+                uuid_translation_map[file.uuid] = uuid4()
+
+            # Assign new uuids to all actor transforms and add them to the database
+            new_actor_transforms: bytes = bytes()
+            for file in files:
+                if file.type == "loc":
+                    new_uuid: UUID = uuid_translation_map[file.uuid]
+                    actor_transforms[new_uuid] = ActorTransform(from_json=Path(file.path))
+                    new_actor_transforms += new_uuid.bytes + actor_transforms[new_uuid].to_bytes()
+            self.save.add_actor_transforms(new_actor_transforms)
+
+            # get all inventory items and add them to DB
+            for file in files:
+                if file.type == "itm":
+                    new_uuid = uuid_translation_map[file.uuid]
+                    parser = ArkBinaryParser(file.bytes, self.save.save_context)
+                    parser.byte_buffer = replace_uuids(uuid_translation_map, parser.byte_buffer)
+                    parser.replace_name_ids(file.names, self.save)
+                    self.save.add_obj_to_db(new_uuid, parser.byte_buffer)
+                    item = InventoryItem(uuid=new_uuid, save=self.save)
+                    item.reidentify(new_uuid)
                 
-                # parser = ArkBinaryParser(self.save.get_game_obj_binary(new_uuid), self.save.save_context)
-                # obj = ArkGameObject(uuid=new_uuid, binary_reader=parser)
-
-        # Get all inventories and add them to DB
-        for file in files:
-            if file.type == "inv":
-                new_uuid = uuid_translation_map[file.uuid]
-                parser = ArkBinaryParser(file.bytes, self.save.save_context)
-                parser.byte_buffer = replace_uuids(uuid_translation_map, parser.byte_buffer)
-                parser.replace_name_ids(file.names, self.save)
-                self.save.add_obj_to_db(new_uuid, parser.byte_buffer)
-                inventory = Inventory(uuid=new_uuid, save=self.save)
-                inventory.reidentify(new_uuid)
+                    # parser = ArkBinaryParser(self.save.get_game_obj_binary(new_uuid), self.save.save_context)
+                    # obj = ArkGameObject(uuid=new_uuid, binary_reader=parser)
+
+            # Get all inventories and add them to DB
+            for file in files:
+                if file.type == "inv":
+                    new_uuid = uuid_translation_map[file.uuid]
+                    parser = ArkBinaryParser(file.bytes, self.save.save_context)
+                    parser.byte_buffer = replace_uuids(uuid_translation_map, parser.byte_buffer)
+                    parser.replace_name_ids(file.names, self.save)
+                    self.save.add_obj_to_db(new_uuid, parser.byte_buffer)
+                    inventory = Inventory(uuid=new_uuid, save=self.save)
+                    inventory.reidentify(new_uuid)
                 
-                # parser = ArkBinaryParser(self.save.get_game_obj_binary(new_uuid), self.save.save_context)
-                # obj = ArkGameObject(uuid=new_uuid, binary_reader=parser)
-
-        # Get all structures and add them to DB
-        for file in files:
-            if file.type == "str":
-                new_uuid = uuid_translation_map[file.uuid]
-                parser = ArkBinaryParser(file.bytes, self.save.save_context)
-                parser.byte_buffer = replace_uuids(uuid_translation_map, parser.byte_buffer)
-                parser.replace_name_ids(file.names, self.save)
-                self.save.add_obj_to_db(new_uuid, parser.byte_buffer)
-                obj = ArkGameObject(uuid=new_uuid, binary_reader=parser)
-                structure = self._parse_single_structure(obj)
-                structure.reidentify(new_uuid)
-                if isinstance(structure, StructureWithInventory) and structure.inventory is not None:
-                    structure.inventory.renumber_name(new_number=structure.object.get_name_number())
-                    structure.inventory.update_binary()
-                structures[new_uuid] = structure
-                # parser = ArkBinaryParser(self.save.get_game_obj_binary(new_uuid), self.save.save_context)
-                # obj = ArkGameObject(uuid=new_uuid, binary_reader=parser)
-
-        keystone_uuid = uuid_translation_map[UUID(json.loads(Path(base_file).read_text())["keystone"])]
-        base = Base(keystone_uuid, structures)
-        # base = Base(structures=structures)
-
-        # input(f"Imported base with {len(structures)} structures, keystone {base.keystone.object.uuid} at {base.keystone.location}")
-        if location is not None:
-            base.move_to(location, self.save)
-
-        return base
+                    # parser = ArkBinaryParser(self.save.get_game_obj_binary(new_uuid), self.save.save_context)
+                    # obj = ArkGameObject(uuid=new_uuid, binary_reader=parser)
+
+            # Get all structures and add them to DB
+            for file in files:
+                if file.type == "str":
+                    new_uuid = uuid_translation_map[file.uuid]
+                    parser = ArkBinaryParser(file.bytes, self.save.save_context)
+                    parser.byte_buffer = replace_uuids(uuid_translation_map, parser.byte_buffer)
+                    parser.replace_name_ids(file.names, self.save)
+                    self.save.add_obj_to_db(new_uuid, parser.byte_buffer)
+                    obj = ArkGameObject(uuid=new_uuid, binary_reader=parser)
+                    structure = self._parse_single_structure(obj)
+                    structure.reidentify(new_uuid)
+                    if isinstance(structure, StructureWithInventory) and structure.inventory is not None:
+                        structure.inventory.renumber_name(new_number=structure.object.get_name_number())
+                        structure.inventory.update_binary()
+                    structures[new_uuid] = structure
+                    # parser = ArkBinaryParser(self.save.get_game_obj_binary(new_uuid), self.save.save_context)
+                    # obj = ArkGameObject(uuid=new_uuid, binary_reader=parser)
+
+            keystone_uuid = uuid_translation_map[UUID(json.loads(Path(base_file).read_text())["keystone"])]
+            base = Base(keystone_uuid, structures)
+            # base = Base(structures=structures)
+
+            # input(f"Imported base with {len(structures)} structures, keystone {base.keystone.object.uuid} at {base.keystone.location}")
+            if location is not None:
+                base.move_to(location, self.save)
+
+            return base
     
     def get_all_bases(self, only_connected: bool = False, radius: float = 0.3, min_structures: int = 10) -> List[Base]:
         all_bases: List[Base] = []
         all_structures: Dict[UUID, Structure] = super().get_all()
-        visited_structures: List[UUID] = []
+        visited_structures: Set[UUID] = set()
+
+        if only_connected:
+            # Every group of connected structures is a base, taken from the structure graph in one pass
+            for component in self.get_structure_graph().components():
+                connected = {uuid: all_structures[uuid] for uuid in component if uuid in all_structures}
+                if len(connected) == 0:
+                    continue
+                base = Base(next(iter(connected)), connected)
+                if len(base.structures) >= min_structures:
+                    all_bases.append(base)
+                    ArkSaveLogger.api_log(f"Parsed base at {'Unknown' if base.location is None else base.keystone.location.as_map_coords(self.map)} with {len(base.structures)} structures, owner: {base.owner}")
+            return all_bases
 
         for key, structure in all_structures.items():
             base = None
             if key in visited_structures:
                 continue
     
-            if only_connected:
-                connected = self.get_connected_structures({key: structure})
-                base = Base(structure.uuid, connected)
-            else:
-                base = self.get_base_at(structure.location.as_map_coords(self.map), radius, structure.owner.tribe_id, structure)
+            base = self.get_base_at(structure.location.as_map_coords(self.map), radius, structure.owner.tribe_id, structure)
 
             for structure in base.structures.values():
-                visited_structures.append(structure.uuid)
+                visited_structures.add(structure.uuid)
 
             
             if base is not None and len(base.structures) >= min_structures:
@@ -1,4 +1,4 @@
-from typing import Dict, List, Optional, Tuple
+from typing import Callable, Dict, List, Optional, Tuple, TYPE_CHECKING
 from uuid import UUID, uuid4
 from pathlib import Path
 import os
@@ -6,6 +6,8 @@ import sys
 import threading
 from concurrent.futures import ThreadPoolExecutor
 
+import numpy as np
+
 from arkparse.object_model.cryopods.cryopod import Cryopod
 from arkparse.object_model.dinos.dino import Dino, DinoStats, DinoId
 from arkparse.object_model.dinos.tamed_baby import TamedBaby
@@ -27,6 +29,10 @@ from arkparse.object_model.misc.inventory import Inventory
 from arkparse.object_model.misc.inventory_item import InventoryItem
 from arkparse.object_model.dinos.pedigree import Pedigree
 from arkparse.logging.ark_save_logger import mark_as_worker_thread
+from arkparse.utils.heatmap import create_heatmap, locations_to_columns, transform_columns
+
+if TYPE_CHECKING:
+    from .scan_coordinator import ScanCoordinator
 
 
 def _is_parallel_enabled() -> bool:
@@ -64,6 +70,9 @@ class DinoApi:
     def is_applicable_bp(blueprint: str) -> bool:
         return DinoApi._DEFAULT_CONFIG.blueprint_name_filter(blueprint)
 
+    def _register_scan(self, scan: "ScanCoordinator"):
+        scan.register(self._DEFAULT_CONFIG, lambda objects: setattr(self, "all_objects", objects))
+
     def get_all_objects(self, config: GameObjectReaderConfiguration = None) -> Dict[UUID, ArkGameObject]:
         reuse = False
 
@@ -161,6 +170,10 @@ class DinoApi:
                 self.parsed_dinos[cryopod.dino.uuid] = cryopod.dino
 
     def _parse_dinos_batch(self, dino_objects_to_parse: List[Tuple[UUID, ArkGameObject, bool, bool]], dinos: Dict[UUID, Dino], max_workers: int, bypass_inventory: bool = True):
+        # Status components and AI controllers (and inventories) of all dinos in one batch, the wrappers then find them cached
+        references = ("MyCharacterStatusComponent", "Owner") if bypass_inventory else ("MyCharacterStatusComponent", "Owner", "MyInventoryComponent")
+        self.save.prefetch_references([obj for _, obj, _, _ in dino_objects_to_parse], references)
+
         if _PARALLEL_ENABLED and max_workers > 1:
             ArkSaveLogger.api_log(f"Parsing {len(dino_objects_to_parse)} dinos with {max_workers} workers...")
             save = self.save
@@ -243,7 +256,15 @@ class DinoApi:
                         raise e
 
     def get_at_location(self, map: ArkMap, coords: MapCoords, radius: float = 0.3, tamed: bool = True, untamed: bool = True) -> Dict[UUID, Dino]:
-        dinos = self.get_all()
+        # Only parse the dinos the spatial index finds near the location, and the ones without
+        # an actor transform (located by SavedBaseWorldLocation instead)
+        candidates = set(self.save.get_spatial_index().query_map_coordinates(map, coords, radius))
+        actor_transforms = self.save.save_context.actor_transforms
+        config = GameObjectReaderConfiguration(
+            uuid_filter=lambda uuid: uuid in candidates or uuid not in actor_transforms,
+            blueprint_name_filter=self._DEFAULT_CONFIG.blueprint_name_filter
+        )
+        dinos = self.get_all(config, include_cryos=False, include_wild=untamed, include_tamed=tamed)
 
         filtered_dinos = {}
 
@@ -482,39 +503,55 @@ class DinoApi:
         return cryopodded
     
     def modify_dinos(self, dinos: Dict[UUID, TamedDino], new_owner: DinoOwner = None):
-        for key, dino in dinos.items():
-            if new_owner is not None:
-                dino.owner.replace_with(new_owner, dino.binary)
-                dino.update_binary()
-
-    def create_heatmap(self, map: ArkMap, resolution: int = 100, dinos: Dict[UUID, TamedDino] = None, classes: List[str] = None, owner: DinoOwner = None, only_tamed: bool = False):
-        import math
-        import numpy as np
-
-        tamed = None if not only_tamed else True
-        if dinos is None:
+        with self.save.batch():
+            for key, dino in dinos.items():
+                if new_owner is not None:
+                    dino.owner.replace_with(new_owner, dino.binary)
+                    dino.update_binary()
+
+    def create_heatmap(self, map: ArkMap, resolution: int = 100, dinos: Dict[UUID, TamedDino] = None, classes: List[str] = None, owner: DinoOwner = None, only_tamed: bool = False, weights: Callable[[Dino], float] = None, sub_map: Optional[str] = None):
+        """Heatmap of the dino locations, cryopodded dinos excluded (see arkparse.utils.heatmap.create_heatmap).
+
+        Cells hold the number of dinos, or the sum of weights(dino) when weights is given (for
+        example lambda dino: dino.stats.current_level). Without dinos and weights, classes, owner
+        and only_tamed are matched on the raw objects and the dinos are not parsed.
+        """
+        if dinos is None and weights is not None:
+            tamed = None if not only_tamed else True
             dinos = self.get_all_filtered(class_names=classes, tamed=tamed, include_cryopodded=False)
 
-        heatmap = [[0 for _ in range(resolution)] for _ in range(resolution)]
-        # print(f"Found {len(dinos)} dinos")
-
-        for key, dino in dinos.items():
-            if dino.location is None:
-                continue
-
-            coords: MapCoords = dino.location.as_map_coords(map)
-
-            y = math.floor(coords.long)
-            x = math.floor(coords.lat)
-
-            if x < 0 or x >= resolution or y < 0 or y >= resolution:
-                continue
-
-            heatmap[x][y] += 1
+        if dinos is not None:
+            xs, ys, zs, mask = locations_to_columns([dino.location for dino in dinos.values()])
+            if owner is not None:
+                mask &= np.array([isinstance(dino, TamedDino) and dino.owner.matches(owner) for dino in dinos.values()], dtype=bool)
+            if weights is not None:
+                weights = np.array([weights(dino) for dino in dinos.values()], dtype=np.float64)
+        else:
+            decode_only = ["TamedTimeStamp", "SavedBaseWorldLocation"] + (list(DinoOwner.PROPERTY_NAMES) if owner is not None else [])
+            config = GameObjectReaderConfiguration(
+                # The creatures of the default filter, without their status components and cryopods
+                blueprint_name_filter=lambda name: name is not None and \
+                    (name in classes if classes is not None else
+                     DinoApi._DEFAULT_CONFIG.blueprint_name_filter(name) and "_Character_" in name),
+                decode_only=decode_only
+            )
+            objects = self.save.get_game_objects(config)
+            dino_objects = list(objects.values())
+            xs, ys, zs, mask = transform_columns(self.save.save_context.actor_transforms, objects.keys())
+
+            # Dinos without an actor transform are located by their SavedBaseWorldLocation
+            for i in np.flatnonzero(~mask).tolist():
+                saved_location = dino_objects[i].get_property_value("SavedBaseWorldLocation")
+                if saved_location is not None:
+                    xs[i], ys[i], zs[i] = saved_location.x, saved_location.y, saved_location.z
+                    mask[i] = True
+            if only_tamed:
+                mask &= np.array([obj.get_property_value("TamedTimeStamp") is not None for obj in dino_objects], dtype=bool)
+            if owner is not None:
+                mask &= np.array([DinoOwner(obj).matches(owner) for obj in dino_objects], dtype=bool)
+
+        return create_heatmap(map, xs, ys, zs, resolution=resolution, weights=weights, mask=mask, sub_map=sub_map)
 
-        return np.array(heatmap)
-    
-    
     def get_best_dino_for_stat(self, classes: List[str] = None, stat: ArkStat = None, only_tamed: bool = False, only_untamed: bool = False, base_stat: bool = False, mutated_stat=False, level_upper_bound=None) -> (Dino, int, ArkStat):
         if only_tamed and only_untamed:
             raise ValueError("Cannot specify both only_tamed and only_untamed")
@@ -554,6 +591,13 @@ class DinoApi:
     
         
     def get_container_of_inventory(self, inv_uuid: UUID, include_cryopodded: bool = True, tamed_dinos: dict[UUID, TamedDino] = None) -> TamedDino:
+        container_uuid = self.save.get_ownership_index().get_container_of_inventory(inv_uuid)
+        if container_uuid is not None:
+            container = tamed_dinos.get(container_uuid) if tamed_dinos is not None else self.get_by_uuid(container_uuid)
+            if isinstance(container, TamedDino) and container.inv_uuid == inv_uuid:
+                return container
+
+        # Dinos in cryopods are not actors in the save, so their inventories are not in the ownership index
         if tamed_dinos is None:
             tamed_dinos = self.get_all_tamed(include_cryopodded=include_cryopodded)
         for _, obj in tamed_dinos.items():
@@ -651,8 +695,6 @@ class DinoApi:
                 new_actor_transforms += new_uuid.bytes + actor_transforms[new_uuid].to_bytes()
                 ArkSaveLogger.api_log(f"Added actor transform {new_uuid} to DB")
         self.save.add_actor_transforms(new_actor_transforms)
-        # Update actor transforms in save context
-        self.save.read_actor_locations()
 
         # get all inventory items and add them to DB
         for file in files:
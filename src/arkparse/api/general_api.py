@@ -1,4 +1,4 @@
-from typing import Dict, List, Tuple
+from typing import Dict, List, Tuple, TYPE_CHECKING
 from uuid import UUID
 import sys
 import threading
@@ -11,6 +11,9 @@ from arkparse.saves.asa_save import AsaSave
 from arkparse.parsing import GameObjectReaderConfiguration
 from arkparse.object_model.misc.__parsed_object_base import ParsedObjectBase
 
+if TYPE_CHECKING:
+    from .scan_coordinator import ScanCoordinator
+
 
 def _is_parallel_enabled() -> bool:
     if hasattr(sys, '_is_gil_enabled'):
@@ -28,6 +31,9 @@ class GeneralApi:
         self.all_objects = None
         self.parsed_objects: Dict[UUID, ParsedObjectBase] = {}
 
+    def _register_scan(self, scan: "ScanCoordinator"):
+        scan.register(self.config, lambda objects: setattr(self, "all_objects", objects))
+
     def get_all_objects(self, config: GameObjectReaderConfiguration = None) -> Dict[UUID, ArkGameObject]:
         reuse = False
         if config is None:
@@ -19,6 +19,7 @@ from arkparse.object_model.ark_game_object import ArkGameObject
 
 if TYPE_CHECKING:
     from arkparse.object_model.cluster_data.ark_cluster_data import ClusterData
+    from .scan_coordinator import ScanCoordinator
 
 class _TribeAndPlayerData:
     HEADER_OFFSET_ADJUSTMENT = 4
@@ -177,13 +178,20 @@ class PlayerApi:
         self.save = None
         ArkSaveLogger.api_log("PlayerApi stopped")
 
+    @staticmethod
+    def __pawn_config() -> GameObjectReaderConfiguration:
+        pawn_bps = [Player.pawn_female, Player.pawn_male]
+        return GameObjectReaderConfiguration(
+            blueprint_name_filter=lambda name: name is not None and name in pawn_bps,
+        )
+
     def __init_pawns(self):
         if self.save is not None:
-            pawn_bps = [Player.pawn_female, Player.pawn_male]
-            config = GameObjectReaderConfiguration(
-                blueprint_name_filter=lambda name: name is not None and name in pawn_bps,
-            )
-            self.pawns = self.save.get_game_objects(config)
+            self.pawns = self.save.get_game_objects(self.__pawn_config())
+
+    def _register_scan(self, scan: "ScanCoordinator"):
+        # Construct the api with no_pawns=True so it does not scan for the pawns on its own
+        scan.register(self.__pawn_config(), lambda objects: setattr(self, "pawns", objects))
     
     def __find_cluster_data_file_in_save_dir(self, player: ArkPlayer) -> Optional[Path]:
         if self.save is not None and self.save.save_dir is not None:
@@ -0,0 +1,49 @@
+from typing import Callable, Dict, List, Tuple, TypeVar
+from uuid import UUID
+
+from arkparse.object_model.ark_game_object import ArkGameObject
+from arkparse.parsing import GameObjectReaderConfiguration
+from arkparse.saves.asa_save import AsaSave
+from arkparse.logging import ArkSaveLogger
+
+_Api = TypeVar("_Api")
+
+
+class ScanCoordinator:
+    """Fill the object caches of several apis with a single scan of the game table.
+
+    On their own, the dino, structure, equipment, stackable and player apis each scan the whole
+    game table for their objects. Added to a coordinator, they register their reader
+    configurations instead and run() reads and classifies every blob once against all of them:
+
+        scan = ScanCoordinator(save)
+        dino_api = scan.add(DinoApi(save))
+        structure_api = scan.add(StructureApi(save))
+        player_api = scan.add(PlayerApi(save, no_pawns=True))
+        scan.run()
+
+    Apis take part through a _register_scan(coordinator) method, other callers can register a
+    configuration and a callback directly.
+    """
+
+    def __init__(self, save: AsaSave):
+        self.save = save
+        self._requests: List[Tuple[GameObjectReaderConfiguration, Callable[[Dict[UUID, ArkGameObject]], None]]] = []
+
+    def register(self, config: GameObjectReaderConfiguration, callback: Callable[[Dict[UUID, ArkGameObject]], None]):
+        """Call callback with the objects matching config on the next run, callbacks are called in registration order."""
+        self._requests.append((config, callback))
+
+    def add(self, api: _Api) -> _Api:
+        api._register_scan(self)
+        return api
+
+    def run(self):
+        if len(self._requests) == 0:
+            return
+        requests, self._requests = self._requests, []
+
+        ArkSaveLogger.api_log(f"Scanning game objects for {len(requests)} reader configurations at once")
+        results = self.save.get_game_objects_multi([config for config, _ in requests])
+        for (_, callback), objects in zip(requests, results):
+            callback(objects)
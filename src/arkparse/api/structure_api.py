@@ -1,10 +1,13 @@
-from typing import Dict, Union, List, Tuple
+from typing import Callable, Collection, Dict, Optional, Union, List, Tuple, TYPE_CHECKING
 from uuid import UUID
 import sys
 import threading
 from concurrent.futures import ThreadPoolExecutor
 
+import numpy as np
+
 from arkparse.saves.asa_save import AsaSave
+from arkparse.saves.structure_graph import StructureGraph
 from arkparse.parsing import GameObjectReaderConfiguration
 from arkparse.object_model.ark_game_object import ArkGameObject
 from arkparse.object_model.misc.object_owner import ObjectOwner
@@ -13,6 +16,10 @@ from arkparse.parsing.struct.actor_transform import MapCoords
 from arkparse.enums.ark_map import ArkMap
 from arkparse.logging import ArkSaveLogger
 from arkparse.logging.ark_save_logger import mark_as_worker_thread
+from arkparse.utils.heatmap import create_heatmap, locations_to_columns, transform_columns
+
+if TYPE_CHECKING:
+    from .scan_coordinator import ScanCoordinator
 
 
 def _is_parallel_enabled() -> bool:
@@ -30,51 +37,56 @@ class StructureApi:
         self.save = save
         self.retrieved_all = False
         self.parsed_structures = {}
+        # All structure objects, with the save fingerprint they were read at (see get_all_objects)
+        self._all_objects: Optional[Tuple[int, Dict[UUID, ArkGameObject]]] = None
+
+    @staticmethod
+    def _scan_configs(uuid_filter: Optional[Callable[[UUID], bool]] = None, decode_only: Optional[Collection[str]] = None) -> List[GameObjectReaderConfiguration]:
+        """Reader configurations for the structures, and for the containers the structure blueprint filter misses."""
+        structures = GameObjectReaderConfiguration(
+            uuid_filter=uuid_filter,
+            decode_only=decode_only,
+            blueprint_name_filter=lambda name: name is not None \
+                                               and "Structures" in name \
+                                               and (not "PrimalItemStructure_" in name or "PrimalItemStructure_ASR" in name) \
+                                               and not "/Skins/" in name \
+                                               and not "PrimalInventory" in name \
+                                               and not "/TreasureMap/" in name \
+                                            #    and not "Tileset" in name \
+                                               and not "PrimalItemStructureSkin" in name \
+                                               and not "PrimalItemResource" in name \
+                                               and not "/TrainCarts/" in name \
+        )
 
-    def get_all_objects(self, config: GameObjectReaderConfiguration = None) -> Dict[UUID, ArkGameObject]:
-        if config is None:
-            ArkSaveLogger.api_log("Retrieving all structure objects from save")
-            reader_config = GameObjectReaderConfiguration(
-                blueprint_name_filter=lambda name: name is not None \
-                                                   and "Structures" in name \
-                                                   and (not "PrimalItemStructure_" in name or "PrimalItemStructure_ASR" in name) \
-                                                   and not "/Skins/" in name \
-                                                   and not "PrimalInventory" in name \
-                                                   and not "/TreasureMap/" in name \
-                                                #    and not "Tileset" in name \
-                                                   and not "PrimalItemStructureSkin" in name \
-                                                   and not "PrimalItemResource" in name \
-                                                   and not "/TrainCarts/" in name \
-            )
-
-            objects = self.save.get_game_objects(reader_config)
-
-            ArkSaveLogger.api_log(f"Found {len(objects)} structure objects, now looking for containers that were missed")
-            config = GameObjectReaderConfiguration()
-            config.property_names = ["MyInventoryComponent"]
-            config.blueprint_name_filter = lambda name: name is not None and not "PlayerPawn" in name and not "/Dinos/" in name and not "Character_BP" in name
-            containers = self.save.get_game_objects(config)
-            for key, obj in containers.items():
-                if key not in objects.keys():
-                    objects[key] = obj
-            ArkSaveLogger.api_log(f"After adding containers, {len(objects)} structure objects remain")
-
-            # Filter engrams out
-            ArkSaveLogger.api_log("Filtering engrams out of structure list")
-            for key in list(objects.keys()):
-                obj: ArkGameObject = objects[key]
-                if obj.get_property_value("bIsEngram") is not None:
-                    del objects[key]
-
-            ArkSaveLogger.api_log(f"After filtering engrams, {len(objects)} structure objects remain")
-        else:
-            reader_config = config
-            objects = self.save.get_game_objects(reader_config)
+        containers = GameObjectReaderConfiguration(uuid_filter=uuid_filter, decode_only=decode_only)
+        containers.property_names = ["MyInventoryComponent"]
+        containers.blueprint_name_filter = lambda name: name is not None and not "PlayerPawn" in name and not "/Dinos/" in name and not "Character_BP" in name
+        return [structures, containers]
+
+    @staticmethod
+    def _merge_containers(objects: Dict[UUID, ArkGameObject], containers: Dict[UUID, ArkGameObject]) -> Dict[UUID, ArkGameObject]:
+        ArkSaveLogger.api_log(f"Found {len(objects)} structure objects, now adding containers that were missed")
+        for key, obj in containers.items():
+            if key not in objects.keys():
+                objects[key] = obj
+        ArkSaveLogger.api_log(f"After adding containers, {len(objects)} structure objects remain")
+
+        # Filter engrams out
+        ArkSaveLogger.api_log("Filtering engrams out of structure list")
+        for key in list(objects.keys()):
+            obj: ArkGameObject = objects[key]
+            if obj.has_property("bIsEngram"):
+                del objects[key]
+
+        ArkSaveLogger.api_log(f"After filtering engrams, {len(objects)} structure objects remain")
+        return objects
 
+    @staticmethod
+    def _filter_non_structures(objects: Dict[UUID, ArkGameObject]) -> Dict[UUID, ArkGameObject]:
         ArkSaveLogger.api_log(f"Total objects retrieved for structure parsing: {len(objects)}")
         to_remove = []
         for obj in objects.values():
-            if obj.get_property_value("StructureID") is None:
+            if not obj.has_property("StructureID"):
                 if obj.blueprint not in SKIPPED_STRUCTURE_BPS:
                     SKIPPED_STRUCTURE_BPS.append(obj.blueprint)
                     ArkSaveLogger.warning_log(f"Object {obj.uuid} ({obj.blueprint}) does not seem to be a structure, skipping bps of this type")
@@ -87,6 +99,33 @@ class StructureApi:
 
         return objects
 
+    def _set_all_objects(self, objects: Dict[UUID, ArkGameObject], containers: Dict[UUID, ArkGameObject]):
+        """Keep the result of a full structure scan (structures and containers) until the save changes."""
+        objects = self._filter_non_structures(self._merge_containers(objects, containers))
+        self._all_objects = (self.save.fingerprint, objects)
+        return objects
+
+    def _register_scan(self, scan: "ScanCoordinator"):
+        structure_config, container_config = self._scan_configs()
+        found = {}
+        scan.register(structure_config, found.update)
+        scan.register(container_config, lambda containers: self._set_all_objects(found, containers))
+
+    def get_all_objects(self, config: GameObjectReaderConfiguration = None, uuid_filter: Optional[Callable[[UUID], bool]] = None, decode_only: Optional[Collection[str]] = None, cache: bool = True) -> Dict[UUID, ArkGameObject]:
+        if config is not None:
+            return self._filter_non_structures(self.save.get_game_objects(config))
+
+        full_scan = uuid_filter is None and decode_only is None
+        if full_scan and self._all_objects is not None and self._all_objects[0] == self.save.fingerprint:
+            return dict(self._all_objects[1])
+
+        # Structures and the containers they miss are read with one scan
+        ArkSaveLogger.api_log("Retrieving all structure objects from save")
+        objects, containers = self.save.get_game_objects_multi(self._scan_configs(uuid_filter, decode_only), cache)
+        if full_scan:
+            return dict(self._set_all_objects(objects, containers))
+        return self._filter_non_structures(self._merge_containers(objects, containers))
+
     def _parse_single_structure(self, obj: ArkGameObject, bypass_inventory: bool = True) -> Union[Structure, StructureWithInventory]:
         if obj.uuid in self.parsed_structures.keys():
             return self.parsed_structures[obj.uuid]
@@ -161,7 +200,14 @@ class StructureApi:
             return self.parsed_structures
         
         objects = self.get_all_objects(config)
+        structures = self._parse_structures(objects, bypass_inventory, max_workers)
 
+        if config is None:
+            self.retrieved_all = True
+
+        return structures
+
+    def _parse_structures(self, objects: Dict[UUID, ArkGameObject], bypass_inventory: bool = True, max_workers: int = 6) -> Dict[UUID, Union[Structure, StructureWithInventory]]:
         structures = {}
 
         # Classify: cached vs to-parse
@@ -181,18 +227,14 @@ class StructureApi:
         if not bypass_inventory and max_workers > 1 and _PARALLEL_ENABLED and len(to_parse) > 0:
             self.save.save_connection.cache_all_classes()
 
-        self._parse_structures_batch(to_parse, structures, bypass_inventory, max_workers)
+        if not bypass_inventory:
+            # Inventories of all structures in one batch, the wrappers then find them cached
+            self.save.prefetch_references([obj for _, obj in to_parse], ["MyInventoryComponent"])
 
-        if config is None:
-            self.retrieved_all = True
+        self._parse_structures_batch(to_parse, structures, bypass_inventory, max_workers)
 
         return structures
 
-        if config is None:
-            self.retrieved_all = True
-
-        return structures    
-
     def get_by_id(self, id: UUID) -> Union[Structure, StructureWithInventory]:
         obj = self.save.get_game_object_by_id(id)
         if obj is None:
@@ -200,18 +242,21 @@ class StructureApi:
         return self._parse_single_structure(obj)
     
     def get_at_location(self, map: ArkMap, coords: MapCoords, radius: float = 0.3, classes: List[str] = None) -> Dict[UUID, Union[Structure, StructureWithInventory]]:
+        ArkSaveLogger.api_log(f"Getting structures at location {coords} on map {map.name} within radius {radius}")
+
+        # Only the structures the spatial index finds near the location are parsed
+        candidates = set(self.save.get_spatial_index().query_map_coordinates(map, coords, radius))
         if classes is not None:
-            config = GameObjectReaderConfiguration(
+            objects = self.get_all_objects(GameObjectReaderConfiguration(
+                uuid_filter=lambda uuid: uuid in candidates,
                 blueprint_name_filter=lambda name: name in classes
-            )
+            ))
         else:
-            config = None
+            objects = self.get_all_objects(uuid_filter=lambda uuid: uuid in candidates)
 
-        structures = self.get_all(config)
+        structures = self._parse_structures(objects)
         result = {}
 
-        ArkSaveLogger.api_log(f"Getting structures at location {coords} on map {map.name} within radius {radius}")
-
         for key, obj in structures.items():
             obj: Structure = obj
             if obj.location is None:
@@ -292,88 +337,79 @@ class StructureApi:
     def filter_by_location(self, map: ArkMap, coords: MapCoords, radius: float, structures: Dict[UUID, Union[Structure, StructureWithInventory]]) -> Dict[UUID, Union[Structure, StructureWithInventory]]:
         result = {}
 
+        candidates = set(self.save.get_spatial_index().query_map_coordinates(map, coords, radius))
+        actor_transforms = self.save.save_context.actor_transforms
         for key, obj in structures.items():
+            # Structures whose location does not come from the save's actor transforms are checked one by one
+            if key not in candidates and actor_transforms.get(key) is obj.location:
+                continue
             if obj.location.is_at_map_coordinate(map, coords, tolerance=radius):
                 result[key] = obj
 
         return result
     
+    def get_structure_graph(self) -> StructureGraph:
+        """Graph of the links between all structures in the save, see AsaSave.get_structure_graph."""
+        return self.save.get_structure_graph()
+
     def get_connected_structures(self, structures: Dict[UUID, Union[Structure, StructureWithInventory]]) -> Dict[UUID, Union[Structure, StructureWithInventory]]:
-        from collections import deque
-        
         result = structures.copy()
-        ignore = set()
-        processed = set()
-        
-        # Initialize queue with all structures to process
-        queue = deque(structures.values())
-        
-        while queue:
-            s = queue.popleft()
-            
-            if s.uuid in processed:
-                continue
-            processed.add(s.uuid)
-            
-            for uuid in s.linked_structure_uuids:
-                if uuid in result or uuid in ignore:
-                    continue
-                
-                obj = self.get_by_id(uuid)
-                if obj is not None:
-                    result[uuid] = obj
-                    queue.append(obj)
-                else:
-                    ignore.add(uuid)
-                    ArkSaveLogger.api_log(f"Could not find linked structure {uuid}, ignoring")
-        
-        return result
-     
-    def modify_structures(self, structures: Dict[UUID, Union[Structure, StructureWithInventory]], new_owner: ObjectOwner = None, new_max_health: float = None):
-        for key, obj in structures.items():
-            for uuid in obj.linked_structure_uuids:
-                if uuid not in structures.keys():
-                    raise ValueError(f"Linked structure {uuid} is not in the structures list, please change owner of all linked structures")
-
-            if new_max_health is not None:
-                obj.set_max_health(new_max_health)
-            
-            if new_owner is not None:
-                obj.owner.replace_self_with(new_owner, binary=obj.binary)
-
-            obj.update_binary()
 
-    def create_heatmap(self, map: ArkMap, resolution: int = 100, structures: Dict[UUID, Union[Structure, StructureWithInventory]] = None, classes: List[str] = None, owner: ObjectOwner = None, min_in_section: int = 1):
-        import math
-        import numpy as np
+        # Structures that are connected but not passed in are parsed in one batch
+        missing = self.get_structure_graph().connected(structures.keys()) - result.keys()
+        if missing:
+            result.update(self._parse_structures(self.get_all_objects(uuid_filter=lambda uuid: uuid in missing)))
 
-        structs = structures
-
-        if classes is not None:
-            structs = self.get_by_class(classes)
-        elif structures is None:
-            structs = self.get_all()
-        heatmap = [[0 for _ in range(resolution)] for _ in range(resolution)]
-
-        for key, obj in structs.items():
-            obj: Structure = obj
-            if obj.location is None:
-                continue
-
-            if owner is not None and not obj.is_owned_by(owner):
-                continue
+        return result
 
-            coords: MapCoords = obj.location.as_map_coords(map)
-            y = math.floor(coords.long)
-            x = math.floor(coords.lat)
-            heatmap[x][y] += 1
+    def modify_structures(self, structures: Dict[UUID, Union[Structure, StructureWithInventory]], new_owner: ObjectOwner = None, new_max_health: float = None):
+        with self.save.batch():
+            for key, obj in structures.items():
+                for uuid in obj.linked_structure_uuids:
+                    if uuid not in structures.keys():
+                        raise ValueError(f"Linked structure {uuid} is not in the structures list, please change owner of all linked structures")
+
+                if new_max_health is not None:
+                    obj.set_max_health(new_max_health)
+                
+                if new_owner is not None:
+                    obj.owner.replace_self_with(new_owner, binary=obj.binary)
+
+                obj.update_binary()
+
+    def create_heatmap(self, map: ArkMap, resolution: int = 100, structures: Dict[UUID, Union[Structure, StructureWithInventory]] = None, classes: List[str] = None, owner: ObjectOwner = None, min_in_section: int = 1, weights: Callable[[Structure], float] = None, sub_map: Optional[str] = None):
+        """Heatmap of the structure locations (see arkparse.utils.heatmap.create_heatmap).
+
+        Cells hold the number of structures, or the sum of weights(structure) when weights is given.
+        Without structures and weights, classes and owner are matched on the raw objects and the
+        structures are not parsed.
+        """
+        if structures is None and weights is not None:
+            structures = self.get_by_class(classes) if classes is not None else self.get_all()
+
+        if structures is not None:
+            xs, ys, zs, mask = locations_to_columns([obj.location for obj in structures.values()])
+            if owner is not None:
+                mask &= np.array([obj.is_owned_by(owner) for obj in structures.values()], dtype=bool)
+            if weights is not None:
+                weights = np.array([weights(obj) for obj in structures.values()], dtype=np.float64)
+        else:
+            decode_only = ["bIsEngram"] + (list(ObjectOwner.PROPERTY_NAMES) if owner is not None else [])
+            if classes is not None:
+                objects = self.get_all_objects(GameObjectReaderConfiguration(
+                    blueprint_name_filter=lambda name: name in classes,
+                    decode_only=decode_only
+                ))
+            else:
+                objects = self.get_all_objects(decode_only=decode_only)
+            xs, ys, zs, mask = transform_columns(self.save.save_context.actor_transforms, objects.keys())
+            if owner is not None:
+                mask &= np.array([ObjectOwner(obj).matches(owner) for obj in objects.values()], dtype=bool)
 
-        for i in range(resolution):
-            for j in range(resolution):
-                if heatmap[i][j] < min_in_section:
-                    heatmap[i][j] = 0
+        heatmap = create_heatmap(map, xs, ys, zs, resolution=resolution, weights=weights, mask=mask, sub_map=sub_map)
+        heatmap[heatmap < min_in_section] = 0
 
-        return np.array(heatmap)
+        return heatmap
     
     def get_all_with_inventory(self) -> Dict[UUID, StructureWithInventory]:
         structures = self.get_all()
@@ -383,8 +419,15 @@ class StructureApi:
         return result
     
     def get_container_of_inventory(self, inv_uuid: UUID, structures: dict[UUID, StructureWithInventory] = None) -> StructureWithInventory:
+        container_uuid = self.save.get_ownership_index().get_container_of_inventory(inv_uuid)
+        if container_uuid is not None:
+            container = structures.get(container_uuid) if structures is not None else self.get_by_id(container_uuid)
+            if isinstance(container, StructureWithInventory) and container.inventory_uuid == inv_uuid:
+                return container
+
         if structures is None:
-            structures = self.get_all_with_inventory()
+            return None
+        # Structures that are not (yet) stored in the save are not in the ownership index
         for _, obj in structures.items():
             if not isinstance(obj, StructureWithInventory):
                 continue
@@ -1,5 +1,5 @@
 from dataclasses import dataclass, field
-from typing import List, Optional, TYPE_CHECKING
+from typing import Collection, List, Optional, Tuple, TYPE_CHECKING
 from uuid import UUID
 import random
 
@@ -39,8 +39,10 @@ class ArkGameObject(ArkPropertyContainer):
     unknown: Optional[int] = None
     properties_offset : int = 0
     parser_type: type = None
+    # Reader, properties start position and decode_only of an object parsed with lazy=True, until decoded
+    _lazy_state: Optional[Tuple[ArkBinaryParser, int, Optional[Collection[str]]]] = field(default=None, repr=False)
 
-    def __init__(self, uuid: Optional[UUID] = None, blueprint: Optional[str] = None, binary_reader: Optional[ArkBinaryParser|LegacyArkBinaryParser] = None, from_custom_bytes: bool = False, no_header: bool = False):
+    def __init__(self, uuid: Optional[UUID] = None, blueprint: Optional[str] = None, binary_reader: Optional[ArkBinaryParser|LegacyArkBinaryParser] = None, from_custom_bytes: bool = False, no_header: bool = False, decode_only: Optional[Collection[str]] = None, lazy: bool = False):
         self.parser_type = ArkProperty if (isinstance(binary_reader, ArkBinaryParser) or binary_reader is None) else LegacyArkProperty
         self.uuid = uuid
         self.blueprint = blueprint
@@ -118,18 +120,11 @@ class ArkGameObject(ArkPropertyContainer):
                         binary_reader.validate_uint32(0)
 
                 if not from_custom_bytes:
-                    ArkSaveLogger.parser_log(f"Reading properties for object {self.blueprint} ({self.uuid})")
-                    self.read_properties(binary_reader, self.parser_type, binary_reader.size())
-                    
-                    if  binary_reader.size() - binary_reader.position >= 20:
-                        binary_reader.set_position(binary_reader.size() - 20)
-                        binary_reader.read_int()
-                        self.uuid2 = binary_reader.read_uuid()
-
-                        if binary_reader.has_more():
-                            # ArkSaveLogger.enable_debug = True
-                            ArkSaveLogger.open_hex_view()
-                            raise Exception("Unknown data left")
+                    if lazy and not no_header:
+                        # Only the header is read, properties are decoded on first access
+                        self._lazy_state = (binary_reader, binary_reader.position, decode_only)
+                    else:
+                        self._read_object_properties(binary_reader, decode_only)
                         
                 if no_header:
                     bp_ref = self.get_property_value("ItemArchetype", None)
@@ -140,6 +135,69 @@ class ArkGameObject(ArkPropertyContainer):
                 ArkSaveLogger.set_file(binary_reader, "debug.bin")
                 raise e
     
+    @property
+    def properties(self) -> List[ArkProperty]:
+        if self._lazy_state is not None:
+            self._decode_lazy_properties()
+        return self._properties
+
+    @properties.setter
+    def properties(self, properties: List[ArkProperty]):
+        self._properties = properties
+
+    @property
+    def partially_decoded(self) -> bool:
+        return self._lazy_state is not None or super().partially_decoded
+
+    @property
+    def undecoded_size(self) -> int:
+        """Number of property bytes of a lazily parsed object that have not been decoded yet."""
+        if self._lazy_state is None:
+            return 0
+        binary_reader, position, _ = self._lazy_state
+        return binary_reader.size() - position
+
+    def complete_decoding(self) -> None:
+        if self._lazy_state is not None:
+            self._decode_lazy_properties()
+        super().complete_decoding()
+
+    def shift_positions(self, from_position: int, delta: int) -> None:
+        super().shift_positions(from_position, delta)
+        for md in self.name_metadata:
+            if md.offset >= from_position:
+                md.offset += delta
+
+    def has_property(self, name: str) -> bool:
+        if self._lazy_state is not None:
+            self._decode_lazy_properties()
+        return super().has_property(name)
+
+    def _decode_lazy_properties(self):
+        binary_reader, position, decode_only = self._lazy_state
+        self._lazy_state = None
+        binary_reader.set_position(position)
+        try:
+            self._read_object_properties(binary_reader, decode_only)
+        except Exception as e:
+            ArkSaveLogger.error_log(f"Error while reading object {self.blueprint} ({self.uuid}): {e}")
+            ArkSaveLogger.set_file(binary_reader, "debug.bin")
+            raise e
+
+    def _read_object_properties(self, binary_reader: ArkBinaryParser, decode_only: Optional[Collection[str]] = None):
+        ArkSaveLogger.parser_log(f"Reading properties for object {self.blueprint} ({self.uuid})")
+        self.read_properties(binary_reader, self.parser_type, binary_reader.size(), decode_only)
+
+        if  binary_reader.size() - binary_reader.position >= 20:
+            binary_reader.set_position(binary_reader.size() - 20)
+            binary_reader.read_int()
+            self.uuid2 = binary_reader.read_uuid()
+
+            if binary_reader.has_more():
+                # ArkSaveLogger.enable_debug = True
+                ArkSaveLogger.open_hex_view()
+                raise Exception("Unknown data left")
+    
     def __replace_name(self, new_class: str, binary: ArkBinaryParser):
         new_short_name = new_class.split(".")[-1] + "_"
         as_bytes = new_short_name.encode("utf-8")
@@ -105,8 +105,10 @@ class Base:
             structure.location.update(structure.location.x + offset_x, structure.location.y + offset_y, structure.location.z + offset_z)
 
         if save is not None:
-            for _, structure in self.structures.items():
-                save.modify_actor_transform(structure.object.uuid, structure.location.to_bytes())
+            # The ActorTransforms blob is written once for all structures
+            with save.batch():
+                for _, structure in self.structures.items():
+                    save.modify_actor_transform(structure.object.uuid, structure.location.to_bytes())
 
     def set_owner(self, new_owner: ObjectOwner):
         for uuid, structure in self.structures.items():
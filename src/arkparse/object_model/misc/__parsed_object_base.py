@@ -13,10 +13,38 @@ if TYPE_CHECKING:
 
 class ParsedObjectBase:
     _binary: ArkBinaryParser = None
-    object: "ArkGameObject" = None
+    _object: "ArkGameObject" = None
     props_initialized: bool = False
     save: "AsaSave" = None
 
+    @property
+    def object(self) -> "ArkGameObject":
+        return self._object
+
+    @object.setter
+    def object(self, obj: "ArkGameObject"):
+        if self._binary is not None and self._object is not None:
+            self._binary.untrack_positions(self._object)
+        self._object = obj
+        if obj is None:
+            return
+        if self._binary is not None:
+            self._track_edits(obj)
+        elif self.save is not None and isinstance(obj.uuid, UUID):
+            # Keep the wrapped object in the save's object cache for as long as this wrapper lives
+            self.save.pin_object(obj.uuid, self)
+
+    def _track_edits(self, obj: "ArkGameObject"):
+        # The binary moves the property positions of obj along with its edits, those only match the
+        # stored binary again after update_binary. Until then obj is private to this wrapper, the
+        # save's cache parses its own object from the stored binary.
+        if self.save is not None and isinstance(obj.uuid, UUID):
+            cache = self.save.object_cache
+            if obj.uuid in cache and cache.get(obj.uuid) is obj:
+                del cache[obj.uuid]
+            cache.unpin(obj.uuid, self)
+        self._binary.track_positions(obj)
+
     @property
     def uuid(self) -> UUID:
         return self.object.uuid if self.object is not None else None
@@ -32,12 +60,15 @@ class ParsedObjectBase:
     def __init_props__(self):
         pass
 
-    def __init__(self, uuid: UUID = None, save: "AsaSave" = None):
+    def __init__(self, uuid: UUID = None, save: "AsaSave" = None, obj: "ArkGameObject" = None):
         if uuid is None or save is None:
             return
 
         self.save = save
-        if not save.is_in_db(uuid):
+        if obj is not None:
+            # Already parsed by the caller, e.g. together with other objects in one batch
+            self.object = obj
+        elif not save.is_in_db(uuid):
             ArkSaveLogger.error_log(f"Could not find binary for game object {uuid} in save")
         else:
             self.object = save.get_game_object_by_id(uuid)
@@ -48,6 +79,8 @@ class ParsedObjectBase:
     def binary(self) -> ArkBinaryParser:
         if self._binary is None and self.object is not None and self.save is not None:
             self._binary = self.save.get_parser_for_game_object(self.object.uuid)
+            if self._binary is not None:
+                self._track_edits(self.object)
         return self._binary
 
     @staticmethod
@@ -126,10 +159,31 @@ class ParsedObjectBase:
             ArkSaveLogger.error_log("This object has no ArkGameObject associated with it, cannot update binary as not in save")
             return
         if self.save is not None:
-            self.save.modify_game_obj(self.object.uuid, self.binary.byte_buffer)
+            binary = self.binary
+            patches = binary.patches
+            # Only fixed size values changed: write those bytes in place instead of the whole binary
+            if patches is None or not self.save.patch_game_obj(self.object.uuid, patches, binary.patch_base):
+                self.save.modify_game_obj(self.object.uuid, binary.byte_buffer)
+            binary.track_patches(self.save.get_object_revision(self.object.uuid))
         else:
             ArkSaveLogger.error_log("Parsed objects should have a save attached")
 
+    def store_properties(self):
+        """Encode the current property values of the object into its binary and write it to the save.
+
+        Use after changing values on the properties themselves (prop.value, struct properties,
+        appended properties) instead of on the binary, see ArkPropertySerializer.
+        """
+        if self.object is None or self.binary is None:
+            ArkSaveLogger.error_log("This object has no ArkGameObject or binary associated with it, cannot store properties")
+            return
+
+        from arkparse.parsing.ark_property_serializer import ArkPropertySerializer
+        serializer = ArkPropertySerializer(self.binary.save_context)
+        self.binary.byte_buffer = serializer.encode_object(self.object, self.binary.byte_buffer)
+        self.update_binary()
+        self.update_object()
+
     def update_object(self):
         if self.object is None:
             ArkSaveLogger.error_log("This object has no ArkGameObject associated with it, cannot update object")
@@ -16,6 +16,9 @@ class DinoOwner:
     id_: int = None                     #OwningPlayerID
     target_team: int = None             #TargetingTeam
 
+    # Properties read by the constructor
+    PROPERTY_NAMES = ("TribeName", "TamingTeamID", "TamerString", "OwningPlayerName", "ImprinterName", "ImprinterPlayerUniqueNetId", "OwningPlayerID", "TargetingTeam")
+
     def __init__(self, obj: ArkGameObject = None):
         if obj is None:
             return
@@ -33,25 +36,22 @@ class DinoOwner:
     #     if self.original_placer_id is not None
 
     def set_in_binary(self, binary: ArkBinaryParser):
+        # Keeps the property positions aligned when the strings below change length
+        binary.track_positions(self.object)
         if self.imprinter_unique_id is not None:
             binary.replace_string(self.object.find_property("ImprinterPlayerUniqueNetId"), self.imprinter_unique_id)
-            self.object = ArkGameObject(uuid='', blueprint='', binary_reader=binary) # align after potential move of positions
         if self.id_ is not None:
             binary.replace_u32(self.object.find_property("OwningPlayerID"), self.id_)
         if self.tribe is not None:
             binary.replace_string(self.object.find_property("TribeName"), self.tribe)
-            self.object = ArkGameObject(uuid='', blueprint='', binary_reader=binary) # align after potential move of positions
         if self.tamer_tribe_id is not None:
             binary.replace_u32(self.object.find_property("TamingTeamID"), self.tamer_tribe_id)
         if self.tamer_string is not None:
             binary.replace_string(self.object.find_property("TamerString"), self.tamer_string)
-            self.object = ArkGameObject(uuid='', blueprint='', binary_reader=binary) # align after potential move of positions
         if self.player is not None:
             binary.replace_string(self.object.find_property("OwningPlayerName"), self.player)
-            self.object = ArkGameObject(uuid='', blueprint='', binary_reader=binary) # align after potential move of positions
         if self.imprinter is not None:
             binary.replace_string(self.object.find_property("ImprinterName"), self.imprinter)
-            self.object = ArkGameObject(uuid='', blueprint='', binary_reader=binary) # align after potential move of positions
         if self.target_team is not None:
             binary.replace_u32(self.object.find_property("TargetingTeam"), self.target_team)
 
@@ -132,6 +132,20 @@ class DinoOwner:
 
         return out + ")"
     
+    def matches(self, owner: "DinoOwner") -> bool:
+        """True if any of the owner identifiers set on this owner is the same in owner."""
+        if self.id_ is not None and self.id_ == owner.id_:
+            return True
+        elif self.player is not None and self.player == owner.player:
+            return True
+        elif self.tribe is not None and self.tribe == owner.tribe:
+            return True
+        elif self.target_team is not None and self.target_team == owner.target_team:
+            return True
+        elif self.tamer_tribe_id is not None and self.tamer_tribe_id == owner.tamer_tribe_id:
+            return True
+        return False
+
     def is_valid(self):
         return self.player is not None or \
                self.id_ is not None or \
@@ -4,6 +4,7 @@ from uuid import UUID
 from typing import Dict
 from pathlib import Path
 
+from arkparse.object_model.ark_game_object import ArkGameObject
 from arkparse.object_model.misc.__parsed_object_base import ParsedObjectBase
 from arkparse.saves.asa_save import AsaSave
 from arkparse.parsing.struct import get_uuid_reference_bytes
@@ -29,21 +30,24 @@ class Inventory(ParsedObjectBase):
             return
 
         item_arr = self.object.get_array_property_value("InventoryItems")
-        for item in item_arr:
-            item_uuid = UUID(item.value)
-            if self.save.is_in_db(item_uuid):
-                item_class = self.save.get_class_of_uuid(item_uuid)
-                self.item_classes[item_uuid] = item_class
+        item_uuids = [UUID(item.value) for item in item_arr]
+        # One batched lookup instead of a query per item, items missing from the save are left out
+        classes = self.save.get_classes_of_uuids(item_uuids)
+        for item_uuid in item_uuids:
+            if item_uuid in classes:
+                self.item_classes[item_uuid] = classes[item_uuid]
 
     @property
     def items(self) -> Dict[UUID, InventoryItem]:
         if len(self._items) != len(self.item_classes):
             self._items = {}
             item_arr = self.object.get_array_property_value("InventoryItems")
+            # Parse all items in one batch and wrap the parsed objects
+            objects = self.save.get_game_objects_by_ids(list(self.item_classes.keys()))
             for item in item_arr:
                 item_uuid = UUID(item.value)
                 if item_uuid not in self._items.keys():
-                    self._items[item_uuid] = InventoryItem(item_uuid, self.save)
+                    self._items[item_uuid] = InventoryItem(item_uuid, self.save, objects.get(item_uuid))
         return self._items
 
     @property
@@ -52,17 +56,18 @@ class Inventory(ParsedObjectBase):
     
     def get_items_of_class(self, class_name: str) -> Dict[UUID, InventoryItem]:
         result = {}
-        for item_uuid, item_class in self.item_classes.items():
-            if item_class == class_name:
-                result[item_uuid] = self.get_item(item_uuid)
+        matching = [item_uuid for item_uuid, item_class in self.item_classes.items() if item_class == class_name]
+        objects = self.save.get_game_objects_by_ids([item_uuid for item_uuid in matching if item_uuid not in self._items])
+        for item_uuid in matching:
+            result[item_uuid] = self.get_item(item_uuid, objects.get(item_uuid))
         return result
     
-    def get_item(self, uuid: UUID) -> InventoryItem:
+    def get_item(self, uuid: UUID, obj: ArkGameObject = None) -> InventoryItem:
         if uuid in self.item_classes.keys():
             if uuid in self._items.keys():
                 return self._items[uuid]
             else:
-                item = InventoryItem(uuid, self.save)
+                item = InventoryItem(uuid, self.save, obj)
                 self._items[uuid] = item
                 return item
 
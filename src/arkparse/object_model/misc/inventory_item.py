@@ -39,8 +39,8 @@ class InventoryItem(ParsedObjectBase):
         else:
             ArkSaveLogger.warning_log("InventoryItem object is None, cannot initialize properties")
 
-    def __init__(self, uuid: UUID = None, save: AsaSave = None):
-        super().__init__(uuid, save=save)
+    def __init__(self, uuid: UUID = None, save: AsaSave = None, obj: ArkGameObject = None):
+        super().__init__(uuid, save=save, obj=obj)
 
     def __str__(self):
         return f"InventoryItem(item={self.object.blueprint.split('/')[-1].split('.')[0]}, quantity={self.quantity})"
@@ -15,6 +15,9 @@ class ObjectOwner:
     id_: int = None                     #OwningPlayerID
     tribe_id: int = None                #TargetingTeam
 
+    # Properties read by the constructor
+    PROPERTY_NAMES = ("OriginalPlacerPlayerID", "OwnerName", "OwningPlayerName", "OwningPlayerID", "TargetingTeam")
+
     def __init__(self, properties: ArkPropertyContainer = None):
         if properties is None:
             return
@@ -36,18 +39,32 @@ class ObjectOwner:
                 return False
         return True
 
+    def matches(self, owner: "ObjectOwner") -> bool:
+        """True if any of the owner identifiers set on this owner is the same in owner."""
+        if self.id_ is not None and self.id_ == owner.id_:
+            return True
+        elif self.player_name is not None and self.player_name == owner.player_name:
+            return True
+        elif self.tribe_name is not None and self.tribe_name == owner.tribe_name:
+            return True
+        elif self.tribe_id is not None and self.tribe_id == owner.tribe_id:
+            return True
+        elif self.original_placer_id is not None and self.original_placer_id == owner.original_placer_id:
+            return True
+        return False
+
     def set_in_binary(self, binary: ArkBinaryParser):
         ArkSaveLogger.set_file(binary, "debug.bin")
         
         if binary is not None:
+            # Keeps the property positions aligned when the strings below change length
+            binary.track_positions(self.properties)
             if self.original_placer_id is not None:
                 binary.replace_u32(self.properties.find_property("OriginalPlacerPlayerID"), self.original_placer_id)
             if self.tribe_name is not None:
                 binary.replace_string(self.properties.find_property("OwnerName"), self.tribe_name)
-                self.properties = ArkGameObject(uuid='', blueprint='', binary_reader=binary) # align after potential move of positions
             if self.player_name is not None:
                 binary.replace_string(self.properties.find_property("OwningPlayerName"), self.player_name)
-                self.properties = ArkGameObject(uuid='', blueprint='', binary_reader=binary) # align after potential move of positions
             if self.id_ is not None:
                 binary.replace_u32(self.properties.find_property("OwningPlayerID"), self.id_)
             if self.tribe_id is not None:
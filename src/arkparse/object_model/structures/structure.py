@@ -108,17 +108,7 @@ class Structure(ParsedObjectBase):
         save.remove_obj_from_db(self.object.uuid)
 
     def is_owned_by(self, owner: ObjectOwner):
-        if self.owner.id_ is not None and self.owner.id_ == owner.id_:
-            return True
-        elif self.owner.player_name is not None and self.owner.player_name == owner.player_name:
-            return True
-        elif self.owner.tribe_name is not None and self.owner.tribe_name == owner.tribe_name:
-            return True
-        elif self.owner.tribe_id is not None and self.owner.tribe_id == owner.tribe_id:
-            return True
-        elif self.owner.original_placer_id is not None and self.owner.original_placer_id == owner.original_placer_id:
-            return True
-        return False
+        return self.owner.matches(owner)
     
     # def set_owner(self, owner: ObjectOwner, save: AsaSave):
     #     self.owner = owner
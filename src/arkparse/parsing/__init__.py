@@ -4,3 +4,5 @@ from .game_object_reader_configuration import GameObjectReaderConfiguration
 
 from .ark_property_container import ArkPropertyContainer
 from .struct.actor_transform import ActorTransform
+
+from .ark_property_serializer import ArkPropertySerializer
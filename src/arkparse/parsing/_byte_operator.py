@@ -1,20 +1,191 @@
+from bisect import bisect_right
+from typing import List, Optional, Tuple, TYPE_CHECKING
 
+from ._base_value_parser import BaseValueParser
 
+if TYPE_CHECKING:
+    from arkparse.parsing.ark_property_container import ArkPropertyContainer
 
 
+class _EditedBuffer:
+    """byte_buffer of a parser with pending edits, joined into contiguous bytes on first access.
+
+    Only has a __get__, so while the parser holds a contiguous buffer as instance attribute
+    reading byte_buffer is a plain attribute lookup. Edits move the buffer into a piece table
+    (see ByteOperator) and remove the instance attribute, the next read joins the pieces once.
+    """
+    def __get__(self, instance: "ByteOperator", owner=None):
+        if instance is None:
+            return self
+        return instance.flush_edits()
 
-from ._base_value_parser import BaseValueParser
 
 class ByteOperator(BaseValueParser):
+    byte_buffer = _EditedBuffer()
+
+    # Piece table of the edits made since the buffer was last contiguous, with the end offset of every piece
+    _pieces: Optional[List[bytes]] = None
+    _piece_ends: Optional[List[int]] = None
+    # Containers whose property positions follow the edits, see track_positions
+    _tracked: Optional[List["ArkPropertyContainer"]] = None
+
+    # Same size replacements since track_patches, see patches
+    _patches: Optional[List[Tuple[int, bytes]]] = None
+    _patch_tail: Optional[bytes] = None
+    patch_base = None
+
     def __init__(self, data: bytes, save_context=None):
         super().__init__(data, save_context)
 
+    def flush_edits(self) -> bytes:
+        """Join the pending edits into a contiguous buffer, done once on the first read after editing."""
+        buffer = self.__dict__.get("byte_buffer")
+        if buffer is not None:
+            return buffer
+        buffer = b"".join(self._pieces) if self._pieces is not None else b""
+        if self._patch_tail is None and self._patches is not None:
+            self._patch_tail = buffer
+        self._pieces = None
+        self._piece_ends = None
+        self.__dict__["byte_buffer"] = buffer
+        return buffer
+
+    @property
+    def has_pending_edits(self) -> bool:
+        return "byte_buffer" not in self.__dict__
+
+    def size(self) -> int:
+        buffer = self.__dict__.get("byte_buffer")
+        if buffer is not None:
+            return len(buffer)
+        return self._piece_ends[-1] if self._piece_ends else 0
+
+    def has_more(self) -> bool:
+        return self.position < self.size()
+
+    def _get_pieces(self) -> Tuple[List[bytes], List[int]]:
+        buffer = self.__dict__.pop("byte_buffer", None)
+        if buffer is not None:
+            # The contiguous buffer is the current content, also when it was assigned directly
+            if buffer is not self._patch_tail:
+                self._patches = None
+            self._patch_tail = None
+            view = memoryview(buffer)
+            self._pieces = [view] if len(view) > 0 else []
+            self._piece_ends = [len(view)] if len(view) > 0 else []
+        return self._pieces, self._piece_ends
+
+    def _split_at(self, position: int) -> int:
+        """Index of the piece starting at position, splitting the piece that contains it."""
+        pieces, ends = self._pieces, self._piece_ends
+        index = bisect_right(ends, position)
+        if index == len(pieces):
+            return index
+        start = ends[index] - len(pieces[index])
+        if start == position:
+            return index
+        piece = pieces[index]
+        pieces[index:index + 1] = [piece[:position - start], piece[position - start:]]
+        ends.insert(index, position)
+        return index + 1
+
+    def _splice(self, position: int, nr_to_remove: int, new_bytes: bytes):
+        """Replace nr_to_remove bytes at position with new_bytes in the piece table, the rest of the buffer is not copied."""
+        total = self.size()
+        position = min(max(position, 0), total)
+        end = min(position + nr_to_remove, total)
+        delta = len(new_bytes) - (end - position)
+        if delta != 0 and self._tracked is not None:
+            # Skipped and lazy properties are decoded before their positions move, while the
+            # buffer they may be read from (possibly this one) is still unedited
+            edit_position = self.position
+            for container in self._tracked:
+                container.complete_decoding()
+            self.position = edit_position
+
+        pieces, ends = self._get_pieces()
+
+        first = self._split_at(position)
+        last = self._split_at(end)
+        pieces[first:last] = [new_bytes] if len(new_bytes) > 0 else []
+        offset = ends[first - 1] if first > 0 else 0
+        del ends[first:]
+        for piece in pieces[first:]:
+            offset += len(piece)
+            ends.append(offset)
+
+        if delta != 0 and self._tracked is not None:
+            for container in self._tracked:
+                container.shift_positions(end, delta)
+
+    def peek(self, position: int, count: int) -> bytes:
+        """Read count bytes at position without joining pending edits or moving the position."""
+        buffer = self.__dict__.get("byte_buffer")
+        if buffer is not None:
+            return bytes(buffer[position:position + count])
+        pieces, ends = self._pieces, self._piece_ends
+        result = []
+        index = bisect_right(ends, position)
+        while count > 0 and index < len(pieces):
+            start = ends[index] - len(pieces[index])
+            chunk = pieces[index][position - start:position - start + count]
+            result.append(bytes(chunk))
+            position += len(chunk)
+            count -= len(chunk)
+            index += 1
+        return b"".join(result)
+
+    def track_positions(self, container: "ArkPropertyContainer"):
+        """Keep the property positions of container valid while bytes are inserted or removed before them.
+
+        container has to match the buffer as it is now, e.g. be parsed from it. Containers are
+        fully decoded before their positions are first moved. The positions are moved in place,
+        so container should not be shared with readers of the unedited data, e.g. a save's cache.
+        """
+        if self._tracked is None:
+            self._tracked = []
+        if not any(tracked is container for tracked in self._tracked):
+            self._tracked.append(container)
+
+    def untrack_positions(self, container: "ArkPropertyContainer"):
+        if self._tracked is not None:
+            self._tracked = [tracked for tracked in self._tracked if tracked is not container]
+
+    def track_patches(self, base=None):
+        """Start recording the same size replacements made to the buffer from here on.
+
+        base identifies the version of the stored data the buffer currently matches,
+        e.g. the object revision of a save (see SaveConnection.patch_game_obj).
+        """
+        self._patches = []
+        self._patch_tail = self.flush_edits()
+        self.patch_base = base
+
+    @property
+    def patches(self) -> Optional[List[Tuple[int, bytes]]]:
+        """The (position, bytes) pairs written since track_patches, in order.
+
+        None when not tracking, or when the buffer was resized or assigned to directly since,
+        in which case the whole buffer has to be written.
+        """
+        if self._patches is None:
+            return None
+        buffer = self.__dict__.get("byte_buffer")
+        if buffer is not None and buffer is not self._patch_tail:
+            return None
+        return self._patches
+
     def replace_bytes(self, new_bytes: bytes, position: int = None, nr_to_replace: int = None, inc_position: bool = True):
         if position is not None:
             self.position = position
         if nr_to_replace is None:
             nr_to_replace = len(new_bytes)
-        self.byte_buffer = self.byte_buffer[:self.position] + new_bytes + self.byte_buffer[self.position + nr_to_replace:]
+        in_place = self.patches is not None and nr_to_replace == len(new_bytes) and self.position + nr_to_replace <= self.size()
+        self._splice(self.position, nr_to_replace, new_bytes)
+        if in_place:
+            self._patches.append((self.position, bytes(new_bytes)))
+        else:
+            self._patches = None
 
         if inc_position:
             self.position += + len(new_bytes)
@@ -22,11 +193,12 @@ class ByteOperator(BaseValueParser):
     def insert_bytes(self, new_bytes: bytes, position: int = None, inc_position: bool = True):
         if position is not None:
             self.position = position
-        self.byte_buffer = self.byte_buffer[:self.position] + new_bytes + self.byte_buffer[self.position:]
+        self._patches = None
+        self._splice(self.position, 0, new_bytes)
 
         if inc_position:
             self.position += len(new_bytes)
-    
+
     def snip_bytes(self, length: int):
-        self.byte_buffer = self.byte_buffer[:self.position] + self.byte_buffer[self.position + length:]
-        
\ No newline at end of file
+        self._patches = None
+        self._splice(self.position, length, b"")
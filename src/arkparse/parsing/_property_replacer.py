@@ -15,7 +15,12 @@ class PropertyReplacer(PropertyInsertor):
     def __check_property_alignment(self, property: "ArkProperty") -> int:
         if property.position != 0:
             return property.name_position # can't check alignment if the property is not the fist occurence
-        
+
+        # Positions of tracked properties follow the edits (see track_positions), check the name in place before scanning
+        name_id = int.from_bytes(self.peek(property.name_position, 4), byteorder="little")
+        if self.save_context is not None and self.save_context.names.get(name_id) == property.name:
+            return property.name_position
+
         actual_index = self.set_property_position(property.name)
         shift = actual_index - property.name_position
         if shift != 0:
@@ -60,18 +65,19 @@ class PropertyReplacer(PropertyInsertor):
         new_length = len(value) + 1
         new_length_byte = (new_length + 4).to_bytes(1, byteorder="little")
 
-        self.position = property.value_position - 5
-        self.read_int() # full length
-        self.validate_byte(0)
-        current_string = self.read_string()
-        current_nr_of_bytes = len(current_string) + 4
+        # Read the current length without joining pending edits
+        if self.peek(property.value_position - 1, 1) != b"\x00":
+            raise ValueError(f"Unexpected byte before string value of {property.name} at {property.value_position - 1}")
+        current_length = int.from_bytes(self.peek(property.value_position, 4), byteorder="little", signed=True)
+        # length and characters including the terminator, UTF-16 strings have a negative length
+        current_nr_of_bytes = (current_length if current_length >= 0 else -current_length * 2) + 4
 
         # replace total length
         self.replace_bytes(new_length_byte, nr_to_replace=1, position=property.value_position - 5)
 
         # replace string
         lengthu32 = new_length.to_bytes(4, byteorder="little")
-        self.replace_bytes(lengthu32 + value.encode("utf-8"), nr_to_replace=current_nr_of_bytes, position=property.value_position)
+        self.replace_bytes(lengthu32 + value.encode("utf-8") + b"\x00", nr_to_replace=current_nr_of_bytes, position=property.value_position)
 
         self.set_position(original_position)
         # print(f"Replaced string {current_string} (length={current_nr_of_bytes}) at {property_position} with {value} at {string_pos}")
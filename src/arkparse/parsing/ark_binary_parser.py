@@ -5,7 +5,7 @@ from uuid import UUID
 from io import BytesIO
 import zlib
 
-from arkparse.parsing.struct.actor_transform import ActorTransform
+from arkparse.parsing.struct.actor_transform_table import ActorTransformPositions, ActorTransformTable
 from arkparse.logging import ArkSaveLogger
 from ._property_parser import PropertyParser
 from ._property_replacer import PropertyReplacer
@@ -305,19 +305,10 @@ class ArkBinaryParser(PropertyParser, PropertyReplacer):
             raise ValueError(f"Unknown value type {key_type_name} at position {position}")
         return key_type
 
-    def read_actor_transforms(self) -> tuple[Dict[UUID, ActorTransform], Dict[UUID, int]]:
-        actor_transforms: Dict[UUID, ActorTransform] = {}
-        actor_transform_positions: Dict[UUID, int] = {}
-        termination_uuid = UUID("00000000-0000-0000-0000-000000000000")
-        position = self.get_position()
-        uuid = self.read_uuid()
-
-        while uuid != termination_uuid:
-            actor_transforms[uuid] = ActorTransform(self)
-            actor_transform_positions[uuid] = position
-            uuid = self.read_uuid()
-
-        return actor_transforms, actor_transform_positions
+    def read_actor_transforms(self) -> tuple[ActorTransformTable, ActorTransformPositions]:
+        table = ActorTransformTable.from_buffer(self.byte_buffer, self.get_position())
+        self.set_position(table.start_position + table.array.nbytes + 16)
+        return table, table.positions
     
     def replace_name_ids(self, name_ids: Dict[int, str], save: "AsaSave" = None):
         # Update the template name encodings to the actal save name encodings
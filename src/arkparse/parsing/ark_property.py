@@ -1,6 +1,7 @@
 from __future__ import annotations
 from dataclasses import dataclass, field
-from typing import Any, Callable, Dict, List, Optional, Tuple, TypeVar, TYPE_CHECKING
+import struct
+from typing import Any, Callable, Collection, Dict, List, Optional, Tuple, TypeVar, Union, TYPE_CHECKING
 from contextlib import contextmanager
 
 from arkparse.logging import ArkSaveLogger
@@ -139,11 +140,16 @@ _SIMPLE_SPECS: Dict[ArkValueType, _Spec] = {
 
 _LOGGABLE_COMPLEX = {ArkValueType.Struct, ArkValueType.Array, ArkValueType.Map, ArkValueType.Set}
 
+# Property tag flags that add data between the tag and the value (see skip_property)
+_TAG_HAS_ARRAY_INDEX = 0x01
+_TAG_HAS_GUID = 0x02
+_TAG_HAS_EXTENSIONS = 0x04
+
 
 # -------------------------------------------------------------------------------------------------
 # Dataclass
 # -------------------------------------------------------------------------------------------------
-@dataclass
+@dataclass(slots=True)
 class ArkProperty:
     name: str
     type: str
@@ -154,7 +160,9 @@ class ArkProperty:
     nr_of_bytes: int = field(default=0, init=False)
     name_position: int = field(default=0, init=False)
     value_position: int = field(default=0, init=False)
-    bytes: Optional[bytes] = field(default=None, init=False, repr=False)
+    end_position: int = field(default=0, init=False)
+    # Object blob the property was read from, shared by all its properties (see byte_span)
+    _buffer: Optional[Union[bytes, bytearray]] = field(default=None, init=False, repr=False, compare=False)
 
     def __init__(self, name: str, type: str, position: int, unknown_byte: int, value: T):
         # Keep ctor to match the original signature/behavior
@@ -166,7 +174,22 @@ class ArkProperty:
         self.nr_of_bytes = 0
         self.name_position = 0
         self.value_position = 0
-        self.bytes = None
+        self.end_position = 0
+        self._buffer = None
+
+    @property
+    def byte_span(self) -> Optional[memoryview]:
+        """Serialized bytes of the property as a view into the object blob, nothing is copied."""
+        if self._buffer is None:
+            return None
+        return memoryview(self._buffer)[self.name_position:self.end_position]
+
+    @property
+    def bytes(self) -> Optional[bytes]:
+        """Serialized bytes of the property, copied out of the object blob on access."""
+        if self._buffer is None:
+            return None
+        return bytes(self._buffer[self.name_position:self.end_position])
 
     def to_json_obj(self):
         return { "name": self.name, "type": self.type, "value": self.value.__str__() }
@@ -238,10 +261,61 @@ class ArkProperty:
             prop.nr_of_bytes = data_size
             prop.name_position = name_position
             prop.value_position = value_position
-            prop.bytes = byte_buffer.byte_buffer[name_position:byte_buffer.get_position()]
+            prop.end_position = byte_buffer.get_position()
+            prop._buffer = byte_buffer.byte_buffer
 
         return prop
 
+    @staticmethod
+    def skip_property(byte_buffer: "ArkBinaryParser", keep: Collection[str]) -> Optional[Tuple[str, str]]:
+        """Skip the property at the current position if its name is not in keep, using its serialized size.
+
+        Returns the name and type name of the skipped property. When the property has to be decoded (kept, None marker,
+        or a header that can't be skipped safely) the position is left untouched and None is returned.
+        """
+        if not byte_buffer.save_context.has_name_table():
+            return None
+
+        start = byte_buffer.get_position()
+        try:
+            key = byte_buffer.read_name(default="")
+            if key in ("", "None") or key in keep:
+                byte_buffer.set_position(start)
+                return None
+
+            # Property type tree: name + number of inner types, e.g. ArrayProperty(1) -> StructProperty(1) -> ...
+            pending = 1
+            type_name = None
+            while pending > 0:
+                name = byte_buffer.read_name(default="")
+                if name == "":
+                    raise ValueError("Unknown property type name")
+                if type_name is None:
+                    type_name = name
+                pending += byte_buffer.read_uint32() - 1
+
+            data_size = byte_buffer.read_int()
+            flags = byte_buffer.read_unsigned_byte()
+            if type_name != "BoolProperty":  # bool values live in the flags byte
+                if flags & _TAG_HAS_EXTENSIONS:
+                    raise ValueError("Property extensions can't be skipped")
+                if flags & _TAG_HAS_ARRAY_INDEX:
+                    byte_buffer.skip_bytes(4)
+                if flags & _TAG_HAS_GUID:
+                    byte_buffer.skip_bytes(16)
+                end = byte_buffer.get_position() + data_size
+                if data_size < 0 or end > byte_buffer.size():
+                    raise ValueError("Property size out of bounds")
+                byte_buffer.set_position(end)
+
+            # Only trust the size if it lands on the next property (or the None marker)
+            if byte_buffer.peek_name() == "":
+                raise ValueError("Property size does not end on a property name")
+            return key, type_name
+        except (ValueError, IndexError, struct.error):
+            byte_buffer.set_position(start)
+            return None
+
     # ---------------------------------------------------------------------------------------------
     # Simple/primitive readers
     # ---------------------------------------------------------------------------------------------
@@ -1,4 +1,4 @@
-from typing import List, Optional, Type, TypeVar, Dict, TYPE_CHECKING
+from typing import Collection, Iterable, List, Optional, Set, Type, TypeVar, Dict, TYPE_CHECKING
 from dataclasses import dataclass, field
 
 # Import ArkProperty only for type checking to avoid circular import
@@ -10,11 +10,31 @@ from arkparse.logging import ArkSaveLogger
 
 T = TypeVar('T')
 PRINT_DEPTH = 0
+# Property types whose value can hold other properties
+_NESTED_PROPERTY_TYPES = frozenset(("StructProperty", "ArrayProperty", "MapProperty"))
 
 def set_print_depth(depth: int) -> None:
     global PRINT_DEPTH
     PRINT_DEPTH = depth
 
+def _shift_value_positions(value, from_position: int, delta: int) -> None:
+    if isinstance(value, ArkPropertyContainer):
+        value.shift_positions(from_position, delta)
+    elif isinstance(value, list):
+        for item in value:
+            _shift_value_positions(item, from_position, delta)
+    elif getattr(value, "end_position", 0) > 0:
+        # Properties without an end position (e.g. simple map entries) were never positioned
+        if value.name_position >= from_position:
+            value.name_position += delta
+        if value.value_position >= from_position:
+            value.value_position += delta
+        if value.end_position >= from_position:
+            value.end_position += delta
+            # The blob the property was read from no longer matches its bytes
+            value._buffer = None
+        _shift_value_positions(value.value, from_position, delta)
+
 @dataclass
 class ArkPropertyContainer:
     properties: List['ArkProperty'] = field(default_factory=list)
@@ -22,6 +42,12 @@ class ArkPropertyContainer:
     _prop_index: Optional[Dict[str, List['ArkProperty']]] = field(default=None, repr=False)
     # List of properties that have nested containers (avoids isinstance checks)
     _nested_containers: Optional[List['ArkProperty']] = field(default=None, repr=False)
+    # Properties skipped by a decode_only projection (name -> start positions), decoded on demand from _source
+    _skipped: Optional[Dict[str, List[int]]] = field(default=None, repr=False)
+    # Names of skipped properties that can hold nested properties
+    _skipped_nested: Optional[Set[str]] = field(default=None, repr=False)
+    _source: Optional["ArkBinaryParser"] = field(default=None, repr=False)
+    _property_class: Optional[Type['ArkProperty']] = field(default=None, repr=False)
 
     def _build_index(self) -> None:
         """Build property name index for fast lookups (only if >= 5 properties)."""
@@ -36,13 +62,31 @@ class ArkPropertyContainer:
                 if isinstance(prop.value, ArkPropertyContainer):
                     self._nested_containers.append(prop)
 
-    def read_properties(self, byte_buffer: "ArkBinaryParser", propertyClass: Type['ArkProperty'], next_object_index: int) -> None:
+    @property
+    def partially_decoded(self) -> bool:
+        """True if some properties were skipped by a decode_only projection and not decoded yet."""
+        return self._skipped is not None
+
+    def read_properties(self, byte_buffer: "ArkBinaryParser", propertyClass: Type['ArkProperty'], next_object_index: int, decode_only: Optional[Collection[str]] = None) -> None:
         last_property_position = byte_buffer.get_position()
         ArkSaveLogger.reset_struct_path()
         # ArkSaveLogger.open_hex_view(True)
+        skip_property = getattr(propertyClass, "skip_property", None) if decode_only is not None else None
         try:
             while byte_buffer.has_more() and byte_buffer.get_position() < next_object_index:
                 last_property_position = byte_buffer.get_position()
+                if skip_property is not None:
+                    skipped = skip_property(byte_buffer, decode_only)
+                    if skipped is not None:
+                        skipped_name, type_name = skipped
+                        if self._skipped is None:
+                            self._skipped = {}
+                            self._skipped_nested = set()
+                        self._skipped.setdefault(skipped_name, []).append(last_property_position)
+                        if type_name in _NESTED_PROPERTY_TYPES:
+                            self._skipped_nested.add(skipped_name)
+                        continue
+
                 ark_property = propertyClass.read_property(byte_buffer)
                 
                 if ark_property is None:
@@ -59,11 +103,49 @@ class ArkPropertyContainer:
             # byte_buffer.find_names(type=2)
             raise e
         
+        if self._skipped is not None:
+            self._source = byte_buffer
+            self._property_class = propertyClass
+
         # Build index after reading all properties
         self._build_index()
         ArkSaveLogger.parser_log("Finished reading object properties")
 
+    def complete_decoding(self) -> None:
+        """Decode the properties skipped by a decode_only projection, keeping the original property order."""
+        if self._skipped is None:
+            return
+        self._decode_skipped(list(self._skipped))
+
+    def _decode_skipped(self, names: Iterable[str]) -> None:
+        """Decode the skipped properties with the given names, the others stay skipped."""
+        byte_buffer = self._source
+        original_position = byte_buffer.get_position()
+        decoded = []
+        for name in names:
+            for position in self._skipped.pop(name, ()):
+                byte_buffer.set_position(position)
+                ark_property = self._property_class.read_property(byte_buffer)
+                if ark_property is not None:
+                    decoded.append(ark_property)
+            self._skipped_nested.discard(name)
+        byte_buffer.set_position(original_position)
+
+        self.properties = sorted(self.properties + decoded, key=lambda prop: prop.name_position)
+        if len(self._skipped) == 0:
+            self._skipped = None
+            self._skipped_nested = None
+            self._source = None
+            self._property_class = None
+        self._build_index()
+
+    def shift_positions(self, from_position: int, delta: int) -> None:
+        """Move the binary positions at or after from_position by delta, after bytes were inserted or removed before them."""
+        for prop in self.properties:
+            _shift_value_positions(prop, from_position, delta)
+
     def print_properties(self):
+        self.complete_decoding()
         for property in self.properties:
             if isinstance(property.value, ArkPropertyContainer):
                 property: ArkPropertyContainer
@@ -87,12 +169,25 @@ class ArkPropertyContainer:
                 ArkSaveLogger.info_log(f"Property ({property.type}) ({property.position}): {property.name} = {property.value}")
 
     def has_property(self, name: str) -> bool:
+        if self._skipped is not None and name in self._skipped:
+            return True
         # Use index if available (post-read_properties), otherwise linear search
         if self._prop_index is not None:
             return name in self._prop_index
         return any(property.name == name for property in self.properties)
 
     def find_property(self, name: str, position: int = None) -> Optional['ArkProperty[T]']:
+        found = self._find_property(name, position)
+        if found is None and self._skipped is not None and name in self._skipped:
+            self._decode_skipped((name,))
+            found = self._find_property(name, position)
+        if found is None and self._skipped is not None and len(self._skipped_nested) > 0:
+            # The property may be nested in a skipped struct, array or map, simple ones can't hold it
+            self._decode_skipped(list(self._skipped_nested))
+            found = self._find_property(name, position)
+        return found
+
+    def _find_property(self, name: str, position: int = None) -> Optional['ArkProperty[T]']:
         # Fast path: use index if available
         if self._prop_index is not None:
             if name in self._prop_index:
@@ -119,6 +214,7 @@ class ArkPropertyContainer:
         return None
     
     def find_all_properties_of_name(self, name: str) -> List['ArkProperty[T]']:
+        self.complete_decoding()
         # Use index if available
         if self._prop_index is not None:
             props = list(self._prop_index.get(name, []))
@@ -141,6 +237,7 @@ class ArkPropertyContainer:
         return props
 
     def find_property_by_position(self, name: str, position: int) -> Optional['ArkProperty[T]']:
+        self.complete_decoding()
         # Use index if available
         if self._prop_index is not None and name in self._prop_index:
             for prop in self._prop_index[name]:
@@ -155,6 +252,7 @@ class ArkPropertyContainer:
         return None
     
     def get_properties_before(self, name: str) -> List[str]:
+        self.complete_decoding()
         properties = []
         for property in self.properties:
             if property.name == name:
@@ -163,6 +261,7 @@ class ArkPropertyContainer:
         return properties
     
     def get_properties_after(self, name: str) -> List[str]:
+        self.complete_decoding()
         properties = []
         found = False
         for property in self.properties:
@@ -185,6 +284,7 @@ class ArkPropertyContainer:
         return value if isinstance(value, list) else default
 
     def get_properties(self) -> List['ArkProperty[T]']:
+        self.complete_decoding()
         return [f"{property.name}({property.type})" for property in self.properties]
 
     def get_properties_by_position(self, name: str, clazz: Type[T]) -> Dict[int, T]:
@@ -192,6 +292,7 @@ class ArkPropertyContainer:
     
     @property
     def property_names(self) -> set[str]:
+        self.complete_decoding()
         props = set()
         for prop in self.properties:
             props.add(prop.name)
@@ -201,12 +302,14 @@ class ArkPropertyContainer:
         return props
 
     def to_json_obj(self):
+        self.complete_decoding()
         all_properties = []
         for ark_property in self.properties:
             all_properties.append(ark_property.to_json_obj())
         return { "properties": all_properties }
 
     def to_string(self, parent_indent: str = "", depth: int = 0) -> str:
+        self.complete_decoding()
         props_str = ""
 
         if PRINT_DEPTH > 0 and depth > PRINT_DEPTH:
@@ -0,0 +1,446 @@
+import struct
+from typing import Any, Dict, List, Optional, Tuple, Union, TYPE_CHECKING
+from uuid import UUID
+
+from arkparse.enums.ark_enum import ArkEnumValue
+from arkparse.logging import ArkSaveLogger
+from arkparse.saves.save_context import SaveContext
+
+from .ark_property_container import ArkPropertyContainer
+from .ark_set import ArkSet
+from .ark_value_type import ArkValueType
+from .struct.object_reference import ObjectReference
+
+if TYPE_CHECKING:
+    from arkparse.object_model.ark_game_object import ArkGameObject
+    from .ark_property import ArkProperty
+
+Buffer = Union[bytes, bytearray, memoryview]
+
+# Property tag flags, see ArkProperty.skip_property
+_TAG_HAS_ARRAY_INDEX = 0x01
+_TAG_HAS_GUID = 0x02
+_TAG_HAS_EXTENSIONS = 0x04
+
+_FIXED_FORMATS: Dict[ArkValueType, struct.Struct] = {
+    ArkValueType.Int: struct.Struct('<i'),
+    ArkValueType.UInt32: struct.Struct('<I'),
+    ArkValueType.Int64: struct.Struct('<q'),
+    ArkValueType.UInt64: struct.Struct('<Q'),
+    ArkValueType.Int16: struct.Struct('<h'),
+    ArkValueType.UInt16: struct.Struct('<H'),
+    ArkValueType.Int8: struct.Struct('<B'),
+    ArkValueType.Byte: struct.Struct('<B'),
+    ArkValueType.Float: struct.Struct('<f'),
+    ArkValueType.Double: struct.Struct('<d'),
+}
+
+
+_INT_KEY_TYPES = (ArkValueType.Int, ArkValueType.UInt32, ArkValueType.Int64, ArkValueType.UInt64,
+                  ArkValueType.Int16, ArkValueType.UInt16, ArkValueType.Int8, ArkValueType.Byte)
+
+
+class NotEncodableError(ValueError):
+    """Raised for values the serializer has no encoding for."""
+
+
+class _PropertyTag:
+    """Layout of a serialized property tag, read from the original bytes of the property."""
+    __slots__ = ("type_tree", "size_offset", "data_start", "data_end")
+
+    def __init__(self, type_tree: List[Tuple[str, int]], size_offset: int, data_start: int, data_end: int):
+        # Type nodes in prefix order with their number of inner types, e.g. MapProperty(2) -> NameProperty(0) -> IntProperty(0)
+        self.type_tree = type_tree
+        self.size_offset = size_offset
+        self.data_start = data_start
+        self.data_end = data_end
+
+    @property
+    def type_names(self) -> List[str]:
+        return [name for name, _ in self.type_tree]
+
+    def inner_types(self) -> List[str]:
+        """Names of the inner types of the property type, e.g. the key and value type of a map."""
+        names = []
+        index = 1
+        for _ in range(self.type_tree[0][1]):
+            names.append(self.type_tree[index][0])
+            pending = 1
+            while pending > 0:
+                pending += self.type_tree[index][1] - 1
+                index += 1
+        return names
+
+
+class ArkPropertySerializer:
+    """Encode ArkProperty and ArkPropertyContainer trees back into the binary format of a save.
+
+    Values are encoded from their current Python value, so properties can be changed in place
+    (e.g. prop.value = 10.0, or editing the properties of a struct) and the object written once:
+
+        serializer = ArkPropertySerializer(save.save_context)
+        obj.find_property("MaxHealth").value = 2000.0
+        binary = save.get_parser_for_game_object(obj.uuid)
+        save.modify_game_obj(obj.uuid, serializer.encode_object(obj, binary.byte_buffer))
+
+    For wrapped objects, ParsedObjectBase.store_properties does the same.
+
+    Properties that were read from a buffer keep their original tag (type tree, flags and array
+    index) and only get their value and size re-encoded. When an encoding would differ from the
+    original bytes while the original still decodes to the same value, e.g. for name numbers the
+    parser does not keep, the original bytes are used. Values without an encoder (struct types
+    without a to_bytes, maps with object keys) are only written when unchanged, changing them
+    raises NotEncodableError.
+    """
+
+    def __init__(self, save_context: SaveContext):
+        self.save_context = save_context
+        self._name_ids: Optional[Dict[str, int]] = None
+        self._decoder = None
+
+    # ---------------------------------------------------------------------------------------------
+    # Public API
+    # ---------------------------------------------------------------------------------------------
+    def encode_object(self, obj: "ArkGameObject", buffer: Buffer) -> bytes:
+        """Binary of a game object with its properties encoded from their values.
+
+        buffer is the binary obj was parsed from (or whose positions it tracks), the header,
+        the bytes between properties and the trailer are copied from it.
+        """
+        obj.complete_decoding()
+        positioned = _positioned(obj.properties)
+        if len(positioned) == 0:
+            return bytes(buffer)
+
+        parts = []
+        previous_end = 0
+        for prop in obj.properties:
+            if prop.end_position > 0:
+                parts.append(bytes(buffer[previous_end:prop.name_position]))
+                previous_end = prop.end_position
+            # Properties added after reading follow the property before them
+            parts.append(self.encode_property(prop, buffer))
+        parts.append(bytes(buffer[previous_end:]))
+        return b"".join(parts)
+
+    def encode_properties(self, container: ArkPropertyContainer, buffer: Optional[Buffer] = None) -> bytes:
+        """The properties of container followed by the None marker that ends a property list."""
+        return b"".join(self.encode_property(prop, buffer) for prop in container.properties) + self._name("None")
+
+    def encode_property(self, prop: "ArkProperty", buffer: Optional[Buffer] = None) -> bytes:
+        """Tag and value of a property.
+
+        buffer holds the original bytes of the property at its positions, by default the blob
+        the property was read from. Properties without original bytes get a new tag, which is
+        only supported for simple value types.
+        """
+        buffer = buffer if buffer is not None else prop._buffer
+        original = None
+        if buffer is not None and prop.end_position > prop.name_position:
+            original = bytes(buffer[prop.name_position:prop.end_position])
+
+        try:
+            encoded = self._encode_property(prop, buffer) if original is not None else self._encode_new_property(prop)
+        except NotEncodableError:
+            # Unchanged values are written as they were, changed ones can't be written at all
+            if original is None or not self._decodes_to_value(prop, buffer):
+                raise
+            return original
+
+        if original is not None and encoded != original and self._decodes_to_value(prop, buffer):
+            # Lossy encoding of an unchanged value
+            return original
+        return encoded
+
+    def encode_value(self, value_type: ArkValueType, value: Any) -> bytes:
+        """Serialized value of a simple value type, as stored after the property tag and in arrays."""
+        if value_type in _FIXED_FORMATS:
+            return _FIXED_FORMATS[value_type].pack(value)
+        if value_type == ArkValueType.Boolean:
+            return b"\x01" if value else b"\x00"
+        if value_type == ArkValueType.String:
+            return self._string(value)
+        if value_type == ArkValueType.Name:
+            return self._name(value)
+        if value_type == ArkValueType.Object:
+            return self._object_reference(value)
+        if value_type == ArkValueType.SoftObject:
+            return b"".join(self._name(name) for name in value) + b"\x00\x00\x00\x00"
+        if value_type == ArkValueType.Enum and isinstance(value, ArkEnumValue):
+            return self._name(f"{value.enum_name}::{value.enum_value}")
+        raise NotEncodableError(f"No encoding for {value_type} values")
+
+    # ---------------------------------------------------------------------------------------------
+    # Properties
+    # ---------------------------------------------------------------------------------------------
+    def _encode_property(self, prop: "ArkProperty", buffer: Buffer) -> bytes:
+        tag = self._read_tag(buffer, prop.name_position)
+        if tag is None or tag.data_end != prop.end_position:
+            raise NotEncodableError(f"Unexpected tag layout for {prop.name}")
+
+        head = bytearray(buffer[prop.name_position:tag.data_start])
+        type_name = tag.type_names[0]
+        if type_name == "BoolProperty":
+            # The value is stored in the flags byte, there is no data
+            return bytes(head) + (b"\x01" if prop.value else b"\x00")
+
+        data = self._encode_data(prop, tag, buffer)
+        struct.pack_into('<i', head, tag.size_offset - prop.name_position, len(data))
+        return bytes(head) + data
+
+    def _encode_data(self, prop: "ArkProperty", tag: _PropertyTag, buffer: Buffer) -> bytes:
+        type_name = tag.type_names[0]
+        if type_name == "StructProperty":
+            return self._encode_struct(prop.value, tag.data_start, tag.data_end, buffer)
+        if type_name == "ArrayProperty":
+            return self._encode_array(prop, tag, buffer)
+        if type_name == "MapProperty":
+            return self._encode_map(prop, tag, buffer)
+        if type_name == "SetProperty":
+            return self._encode_set(prop)
+        if type_name in ("ByteProperty", "EnumProperty") and isinstance(prop.value, ArkEnumValue):
+            return self.encode_value(ArkValueType.Enum, prop.value)
+
+        value_type = ArkValueType.from_name(type_name)
+        if value_type is None:
+            raise NotEncodableError(f"Unknown property type {type_name}")
+        return self.encode_value(value_type, prop.value)
+
+    def _encode_new_property(self, prop: "ArkProperty") -> bytes:
+        value_type = prop.type if isinstance(prop.type, ArkValueType) else ArkValueType.__members__.get(prop.type)
+        if value_type is None or value_type in (ArkValueType.Struct, ArkValueType.Array, ArkValueType.Map, ArkValueType.Set):
+            raise NotEncodableError(f"New {prop.type} properties can't be encoded, only simple types")
+
+        if value_type == ArkValueType.Enum:
+            raise NotEncodableError("New enum properties can't be encoded, the enum type is unknown")
+        head = self._name(prop.name) + self._name(value_type.type_name) + struct.pack('<I', 0)
+        if value_type == ArkValueType.Boolean:
+            return head + struct.pack('<i', 0) + (b"\x01" if prop.value else b"\x00")
+
+        data = self.encode_value(value_type, prop.value)
+        if prop.position != 0:
+            return head + struct.pack('<iBi', len(data), _TAG_HAS_ARRAY_INDEX, prop.position) + data
+        return head + struct.pack('<iB', len(data), 0) + data
+
+    # ---------------------------------------------------------------------------------------------
+    # Structs and arrays
+    # ---------------------------------------------------------------------------------------------
+    def _encode_struct(self, value: Any, data_start: int, data_end: int, buffer: Buffer) -> bytes:
+        if isinstance(value, ArkPropertyContainer):
+            return self._encode_struct_properties(value, data_start, data_end, buffer)
+        to_bytes = getattr(value, "to_bytes", None)
+        if to_bytes is not None:
+            return to_bytes()
+        raise NotEncodableError(f"No encoding for {type(value).__name__} structs")
+
+    def _encode_struct_properties(self, container: ArkPropertyContainer, data_start: int, data_end: int, buffer: Buffer) -> bytes:
+        positioned = _positioned(container.properties)
+        if len(positioned) == 0:
+            if len(container.properties) > 0:
+                raise NotEncodableError("Properties added to an empty struct can't be encoded")
+            return bytes(buffer[data_start:data_end])
+        # Keep whatever preceded the first property and the original terminator (None marker, padding)
+        parts = [bytes(buffer[data_start:positioned[0].name_position])]
+        for prop in container.properties:
+            parts.append(self.encode_property(prop, buffer))
+        parts.append(self._terminator(buffer, positioned[-1].end_position, data_end))
+        return b"".join(parts)
+
+    def _terminator(self, buffer: Buffer, start: int, end: int) -> bytes:
+        """None marker ending a property list at start, with the 4 zero bytes that may follow it before end."""
+        length = 12 if start + 12 <= end and bytes(buffer[start + 8:start + 12]) == b"\x00\x00\x00\x00" else 8
+        return bytes(buffer[start:start + length])
+
+    def _encode_array(self, prop: "ArkProperty", tag: _PropertyTag, buffer: Buffer) -> bytes:
+        element_type_name = tag.type_names[1] if len(tag.type_names) > 1 else None
+        values = prop.value
+        if not isinstance(values, list):
+            raise NotEncodableError(f"Array {prop.name} was not read as a list")
+
+        if element_type_name != "StructProperty":
+            element_type = ArkValueType.from_name(element_type_name) if element_type_name is not None else None
+            if element_type is None:
+                raise NotEncodableError(f"Unknown array element type {element_type_name}")
+            return struct.pack('<I', len(values)) + b"".join(self.encode_value(element_type, value) for value in values)
+
+        parts = [struct.pack('<I', len(values))]
+        for index, value in enumerate(values):
+            if isinstance(value, ArkPropertyContainer):
+                positioned = _positioned(value.properties)
+                if len(positioned) == 0:
+                    raise NotEncodableError(f"Struct without original bytes in array {prop.name}")
+                # Each element ends with a None marker, padded like the original
+                last_end = positioned[-1].end_position
+                next_start = tag.data_end
+                following = _positioned(values[index + 1].properties) if index + 1 < len(values) and isinstance(values[index + 1], ArkPropertyContainer) else []
+                if len(following) > 0:
+                    next_start = following[0].name_position
+                parts.append(b"".join(self.encode_property(element, buffer) for element in value.properties))
+                parts.append(self._terminator(buffer, last_end, next_start))
+            else:
+                parts.append(self._encode_struct(value, 0, 0, buffer))
+        return b"".join(parts)
+
+    # ---------------------------------------------------------------------------------------------
+    # Maps and sets
+    # ---------------------------------------------------------------------------------------------
+    def _encode_set(self, prop: "ArkProperty") -> bytes:
+        if not isinstance(prop.value, ArkSet):
+            raise NotEncodableError(f"Set {prop.name} was not read as an ArkSet")
+        value_type = prop.value.value_type
+        values = list(prop.value.values)
+        # Number of removed elements (always 0 in saves), then the elements
+        return struct.pack('<Ii', 0, len(values)) + b"".join(self.encode_value(value_type, value) for value in values)
+
+    def _encode_map(self, prop: "ArkProperty", tag: _PropertyTag, buffer: Buffer) -> bytes:
+        if not isinstance(prop.value, ArkPropertyContainer):
+            raise NotEncodableError(f"Map {prop.name} was not read as a property container")
+        key_type_name, value_type_name = tag.inner_types()
+        key_type = ArkValueType.from_name(key_type_name)
+        value_type = ArkValueType.from_name(value_type_name)
+        if key_type is None or value_type is None:
+            raise NotEncodableError(f"Unknown map types {key_type_name} -> {value_type_name}")
+
+        entries = prop.value.properties
+        # Number of removed entries (always 0 in saves), then the entries
+        parts = [struct.pack('<Ii', 0, len(entries))]
+        if value_type != ArkValueType.Struct:
+            for entry in entries:
+                parts.append(self._encode_map_key(key_type, entry.name))
+                parts.append(self.encode_value(value_type, entry.value))
+            return b"".join(parts)
+
+        # Struct values are property lists, each ending with a None marker padded like the original
+        default_terminator = self._name("None")
+        for container in (entry.value for entry in entries):
+            positioned = _positioned(container.properties) if isinstance(container, ArkPropertyContainer) else []
+            if len(positioned) > 0:
+                default_terminator = self._terminator(buffer, positioned[-1].end_position, tag.data_end)
+                break
+        for entry in entries:
+            container = entry.value
+            if not isinstance(container, ArkPropertyContainer):
+                raise NotEncodableError(f"Struct value of map {prop.name} was not read as a property container")
+            if key_type == ArkValueType.Byte:
+                # Enum keys are stored as the name of the enum value
+                parts.append(self._name(str(entry.name)))
+            else:
+                parts.append(self._encode_map_key(key_type, entry.name))
+            parts.extend(self.encode_property(value, buffer) for value in container.properties)
+            positioned = _positioned(container.properties)
+            parts.append(self._terminator(buffer, positioned[-1].end_position, tag.data_end) if len(positioned) > 0 else default_terminator)
+        return b"".join(parts)
+
+    def _encode_map_key(self, key_type: ArkValueType, key: Any) -> bytes:
+        """Map keys of simple entries are read as the str() of the key, convert them back to the key type."""
+        if isinstance(key, str):
+            if key_type in _INT_KEY_TYPES:
+                key = int(key)
+            elif key_type in (ArkValueType.Float, ArkValueType.Double):
+                key = float(key)
+            elif key_type == ArkValueType.Boolean:
+                key = key == "True"
+            elif key_type not in (ArkValueType.Name, ArkValueType.String):
+                raise NotEncodableError(f"Map keys of type {key_type} can't be encoded from their name")
+        return self.encode_value(key_type, key)
+
+    # ---------------------------------------------------------------------------------------------
+    # Helpers
+    # ---------------------------------------------------------------------------------------------
+    def _read_tag(self, buffer: Buffer, position: int) -> Optional[_PropertyTag]:
+        try:
+            offset = position + 8  # property name
+            type_tree = []
+            pending = 1
+            while pending > 0:
+                name_id, = struct.unpack_from('<I', buffer, offset)
+                inner_count, = struct.unpack_from('<I', buffer, offset + 8)
+                type_tree.append((self.save_context.get_name(name_id), inner_count))
+                pending += inner_count - 1
+                offset += 12
+            size_offset = offset
+            data_size, flags = struct.unpack_from('<iB', buffer, offset)
+            data_start = offset + 5
+        except struct.error:
+            return None
+
+        if type_tree[0][0] == "BoolProperty":
+            return _PropertyTag(type_tree, size_offset, data_start - 1, data_start)
+        if flags & _TAG_HAS_EXTENSIONS:
+            return None
+        if flags & _TAG_HAS_ARRAY_INDEX:
+            data_start += 4
+        if flags & _TAG_HAS_GUID:
+            data_start += 16
+        return _PropertyTag(type_tree, size_offset, data_start, data_start + data_size)
+
+    def _decodes_to_value(self, prop: "ArkProperty", buffer: Buffer) -> bool:
+        """True if the original bytes of prop still decode to its current value."""
+        from .ark_binary_parser import ArkBinaryParser
+        from .ark_property import ArkProperty
+
+        if self._decoder is None or self._decoder[0] is not buffer:
+            self._decoder = (buffer, ArkBinaryParser(bytes(buffer), self.save_context))
+        parser = self._decoder[1]
+        parser.set_position(prop.name_position)
+        try:
+            original = ArkProperty.read_property(parser)
+        except Exception as e:
+            ArkSaveLogger.parser_log(f"Could not decode original bytes of {prop.name}: {e}")
+            return False
+        return original is not None and _values_equal(original.value, prop.value)
+
+    def _get_name_id(self, name: str) -> int:
+        name_id = self._name_ids.get(name) if self._name_ids is not None else None
+        if name_id is None:
+            # Names can be added to the save context after the lookup was built
+            self._name_ids = {}
+            if self.save_context.constant_name_table:
+                self._name_ids.update({value: key for key, value in self.save_context.constant_name_table.items()})
+            self._name_ids.update({value: key for key, value in self.save_context.names.items()})
+            name_id = self._name_ids.get(name)
+        if name_id is None:
+            raise NotEncodableError(f"Name {name} is not in the name table")
+        return name_id
+
+    def _name(self, name: str) -> bytes:
+        return struct.pack('<Ii', self._get_name_id(name), 0)
+
+    @staticmethod
+    def _string(value: Optional[str]) -> bytes:
+        if value is None:
+            return struct.pack('<i', 0)
+        if value.isascii():
+            return struct.pack('<i', len(value) + 1) + value.encode("ascii") + b"\x00"
+        encoded = value.encode("utf_16_le")
+        return struct.pack('<i', -(len(encoded) // 2 + 1)) + encoded + b"\x00\x00"
+
+    def _object_reference(self, value: ObjectReference) -> bytes:
+        if not isinstance(value, ObjectReference) or not self.save_context.has_name_table():
+            raise NotEncodableError("Object references can only be encoded with a name table")
+        if value.type == ObjectReference.TYPE_UUID:
+            return struct.pack('<h', ObjectReference.TYPE_UUID) + UUID(str(value.value)).bytes
+        if value.type == ObjectReference.TYPE_PATH:
+            return struct.pack('<h', ObjectReference.TYPE_PATH) + self._name(value.value)
+        if value.type == ObjectReference.TYPE_ID:
+            return struct.pack('<hi', ObjectReference.TYPE_ID, value.value)
+        raise NotEncodableError(f"No encoding for object references of type {value.type}")
+
+
+def _positioned(properties: List["ArkProperty"]) -> List["ArkProperty"]:
+    """Properties that were read from a buffer, as opposed to added afterwards."""
+    return [prop for prop in properties if prop.end_position > 0]
+
+
+def _values_equal(a: Any, b: Any) -> bool:
+    """Compare decoded values, ignoring the positions of nested properties."""
+    if isinstance(a, ArkPropertyContainer) and isinstance(b, ArkPropertyContainer):
+        return len(a.properties) == len(b.properties) and all(
+            x.name == y.name and _values_equal(x.value, y.value) for x, y in zip(a.properties, b.properties))
+    if isinstance(a, list) and isinstance(b, list):
+        return len(a) == len(b) and all(_values_equal(x, y) for x, y in zip(a, b))
+    if isinstance(a, ArkEnumValue) and isinstance(b, ArkEnumValue):
+        return (a.enum_name, a.enum_value) == (b.enum_name, b.enum_value)
+    if isinstance(a, float) and isinstance(b, float) and a != a and b != b:
+        return True  # NaN
+    return a == b
@@ -1,5 +1,5 @@
 from dataclasses import dataclass, field
-from typing import List, Optional, Callable
+from typing import Collection, List, Optional, Callable
 from uuid import UUID
     
 
@@ -9,3 +9,9 @@ class GameObjectReaderConfiguration:
     uuid_filter: Optional[Callable[[UUID], bool]] = None
     blueprint_name_filter: Optional[Callable[[Optional[str]], bool]] = None
     property_names: List[str] = field(default_factory=list)
+    # When set, only these top-level properties are decoded, the others are skipped by size and
+    # decoded on demand (see ArkPropertyContainer.partially_decoded)
+    decode_only: Optional[Collection[str]] = None
+    # When set, objects only read their header (blueprint, names, location) and decode their
+    # properties on first access. Errors in the properties are raised on that access instead.
+    lazy_properties: bool = False
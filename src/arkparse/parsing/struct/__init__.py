@@ -1,5 +1,6 @@
 """Gather misc game object imports"""
 from .actor_transform import ActorTransform, MapCoords, MapCoordinateParameters
+from .actor_transform_table import ActorTransformTable, ActorTransformBlob
 from .ark_color import ArkColor
 from .ark_item_net_id import ArkItemNetId
 from .ark_linear_color import ArkLinearColor
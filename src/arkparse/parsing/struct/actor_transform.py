@@ -1,5 +1,5 @@
 from dataclasses import dataclass, field
-from typing import TYPE_CHECKING, Optional, List
+from typing import TYPE_CHECKING, Dict, Iterable, Optional, List, Tuple, Union
 
 import struct
 import re
@@ -159,6 +159,15 @@ class MapCoordinateParameters:
                 )
             ]
 
+    @classmethod
+    def for_map(cls, map: ArkMap) -> "MapCoordinateParameters":
+        """Shared parameters for the map, created once per map. Treat the result as read-only."""
+        parameters = _MAP_PARAMETERS.get(map)
+        if parameters is None:
+            parameters = cls(map)
+            _MAP_PARAMETERS[map] = parameters
+        return parameters
+
     def __resolve_sub_map_name(self, sub_map_name: Optional[str | SubMap]) -> Optional[str]:
         return _resolve_sub_map_name(sub_map_name)
 
@@ -206,6 +215,74 @@ class MapCoordinateParameters:
 
         return ArkVector(x=x, y=y, z=0)
 
+    def _get_map_data_indices(self, xs: np.ndarray, ys: np.ndarray, zs: Optional[np.ndarray]) -> np.ndarray:
+        """Vectorized _get_map_data_by_coords, returns the index in map_data for each point."""
+        indices = np.zeros(len(xs), dtype=np.intp)
+        if zs is None or len(self.map_data) == 1:
+            return indices
+        unresolved = np.ones(len(xs), dtype=bool)
+        for i, data in enumerate(self.map_data):
+            origin = data.origin
+            inside = unresolved & (origin.min_x <= xs) & (xs <= origin.max_x) \
+                & (origin.min_y <= ys) & (ys <= origin.max_y) \
+                & (origin.min_z <= zs) & (zs <= origin.max_z)
+            indices[inside] = i
+            unresolved &= ~inside
+        return indices
+
+    def _origin_columns(self, indices: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """min_x, min_y, max_x, max_y of the origin of map_data[index], per point."""
+        origins = np.array([(d.origin.min_x, d.origin.min_y, d.origin.max_x, d.origin.max_y) for d in self.map_data], dtype=np.float64)
+        per_point = origins[indices]
+        return per_point[:, 0], per_point[:, 1], per_point[:, 2], per_point[:, 3]
+
+    def transform_to_many(self, xs, ys, zs=None) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Vectorized transform_to over arrays of world coordinates.
+
+        Returns the lat and long arrays, and an object array with the sub map name of each point.
+        Without zs all points use the first sub map, like transform_to without a z coordinate.
+        """
+        xs = np.asarray(xs, dtype=np.float64)
+        ys = np.asarray(ys, dtype=np.float64)
+        zs = None if zs is None else np.asarray(zs, dtype=np.float64)
+        indices = self._get_map_data_indices(xs, ys, zs)
+        min_x, min_y, max_x, max_y = self._origin_columns(indices)
+
+        lat_ratio = (ys - max_y) / (min_y - max_y)
+        lo_ratio = (xs - max_x) / (min_x - max_x)
+        lats = MapCoordinateParameters.lerp(100.0, 0.0, lat_ratio)
+        los = MapCoordinateParameters.lerp(100.0, 0.0, lo_ratio)
+        sub_map_names = np.array([d.sub_map_name for d in self.map_data], dtype=object)[indices]
+
+        return lats, los, sub_map_names
+
+    def transform_from_many(self, lats, los, sub_map_names: Union[None, str, SubMap, Iterable[Optional[str | SubMap]]] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """Vectorized transform_from, returns the x and y arrays.
+
+        sub_map_names is either one sub map for all points or one per point.
+        """
+        lats = np.asarray(lats, dtype=np.float64)
+        los = np.asarray(los, dtype=np.float64)
+        if sub_map_names is None or isinstance(sub_map_names, (str, SubMap)):
+            map_data = self._get_map_data_by_sub_name(self.__resolve_sub_map_name(sub_map_names))
+            indices = np.full(len(lats), self.map_data.index(map_data), dtype=np.intp)
+        else:
+            by_name = {}
+            indices = np.empty(len(lats), dtype=np.intp)
+            for i, name in enumerate(sub_map_names):
+                if name not in by_name:
+                    map_data = self._get_map_data_by_sub_name(self.__resolve_sub_map_name(name))
+                    by_name[name] = self.map_data.index(map_data)
+                indices[i] = by_name[name]
+        min_x, min_y, max_x, max_y = self._origin_columns(indices)
+
+        lat_ratio = MapCoordinateParameters.inv_lerp(100.0, 0.0, lats)
+        lo_ratio = MapCoordinateParameters.inv_lerp(100.0, 0.0, los)
+        ys = lat_ratio * (min_y - max_y) + max_y
+        xs = lo_ratio * (min_x - max_x) + max_x
+
+        return xs, ys
+
     @staticmethod
     def lerp(a: float, b: float, t: float) -> float:
         """Linear interpolate on the scale given by a to b, using t as the point on that scale."""
@@ -230,6 +307,8 @@ class MapCoordinateParameters:
 
         return latitude_scale, latitude_shift, longitude_scale, longitude_shift
 
+_MAP_PARAMETERS: Dict[ArkMap, MapCoordinateParameters] = {}
+
 class MapCoords:
     lat : float
     long : float
@@ -271,7 +350,7 @@ class MapCoords:
         self.long = round(self.long, digits)
 
     def as_actor_transform(self, map) -> "ActorTransform":
-        return ActorTransform(vector=MapCoordinateParameters(map).transform_from(self.lat, self.long, self.sub_map_name))
+        return ActorTransform(vector=MapCoordinateParameters.for_map(map).transform_from(self.lat, self.long, self.sub_map_name))
 
 @dataclass
 class ActorTransform:
@@ -341,7 +420,7 @@ class ActorTransform:
         return f"({self.x:.2f}, {self.y:.2f}, {self.z:.2f}) ({self.pitch:.2f}, {self.yaw:.2f}, {self.roll:.2f})"
 
     def as_map_coords(self, map) -> MapCoords:
-        lat, long, sub_map_name = MapCoordinateParameters(map).transform_to(self.x, self.y, self.z)
+        lat, long, sub_map_name = MapCoordinateParameters.for_map(map).transform_to(self.x, self.y, self.z)
         return MapCoords(lat, long, self.in_cryopod, sub_map_name)
     
     def is_within_distance(self, location: "ActorTransform", distance: float = None, foundations: int = None, tolerance: int = 10) -> bool:
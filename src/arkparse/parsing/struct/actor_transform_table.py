@@ -0,0 +1,269 @@
+from itertools import chain
+from typing import Dict, Iterator, MutableMapping, Optional, Set, Tuple
+from uuid import UUID
+
+import numpy as np
+
+from arkparse.parsing._base_value_parser import _fast_uuid_from_bytes
+from .actor_transform import ActorTransform
+
+# On-disk layout of one ActorTransforms entry: uuid followed by 7 doubles
+ACTOR_TRANSFORM_DTYPE = np.dtype([
+    ("uuid", "V16"),
+    ("x", "<f8"),
+    ("y", "<f8"),
+    ("z", "<f8"),
+    ("pitch", "<f8"),
+    ("roll", "<f8"),
+    ("yaw", "<f8"),
+    ("quaternion", "<f8"),
+])
+
+
+class ActorTransformTable(MutableMapping[UUID, ActorTransform]):
+    """Columnar table of the ActorTransforms blob, usable as the UUID -> ActorTransform dict it replaces.
+
+    The transforms are kept in a numpy structured array that is read straight from the blob.
+    ActorTransform objects are only created (and then cached) when a uuid is looked up, bulk
+    consumers can use array/locations and row_of to work on the columns directly.
+
+    Transforms assigned or deleted after reading are kept next to the array: they show up in
+    lookups and iteration, but not in array/locations.
+    """
+
+    def __init__(self, rows: np.ndarray, start_position: int = 0):
+        self._rows = rows
+        self.start_position = start_position
+        self._row_index: Optional[Dict[bytes, int]] = None
+        self._views: Dict[UUID, ActorTransform] = {}
+        self._added: Dict[UUID, ActorTransform] = {}
+        self._removed: Set[UUID] = set()
+        self._positions: Optional[ActorTransformPositions] = None
+
+    @classmethod
+    def from_buffer(cls, buffer: bytes, position: int) -> "ActorTransformTable":
+        """Read the entries starting at position, up to the all-zero terminating uuid."""
+        count = max(0, (len(buffer) - position) // ACTOR_TRANSFORM_DTYPE.itemsize)
+        rows = np.frombuffer(buffer, dtype=ACTOR_TRANSFORM_DTYPE, count=count, offset=position)
+        uuid_words = np.ascontiguousarray(rows["uuid"]).view("<u8").reshape(-1, 2)
+        terminators = np.flatnonzero((uuid_words[:, 0] == 0) & (uuid_words[:, 1] == 0))
+        if len(terminators):
+            rows = rows[:terminators[0]]
+        return cls(rows, position)
+
+    @property
+    def array(self) -> np.ndarray:
+        """The structured array of all transforms read from the save (see ACTOR_TRANSFORM_DTYPE)."""
+        return self._rows
+
+    @property
+    def locations(self) -> np.ndarray:
+        """(n, 3) array of x, y, z, in row order."""
+        return np.column_stack((self._rows["x"], self._rows["y"], self._rows["z"]))
+
+    @property
+    def positions(self) -> "ActorTransformPositions":
+        """Byte position of each entry in the ActorTransforms blob, the same mapping on every access."""
+        if self._positions is None:
+            self._positions = ActorTransformPositions(self)
+        return self._positions
+
+    def _get_row_index(self) -> Dict[bytes, int]:
+        if self._row_index is None:
+            raw = self._rows["uuid"].tobytes()
+            self._row_index = {raw[i:i + 16]: row for row, i in enumerate(range(0, len(raw), 16))}
+        return self._row_index
+
+    def columns(self) -> Tuple[bytes, np.ndarray, np.ndarray, np.ndarray]:
+        """Packed 16 byte uuids and the x, y, z columns of all current transforms, assigned ones included."""
+        rows = self._rows
+        if self._added or self._removed:
+            index = self._get_row_index()
+            dropped = [index[uuid_.bytes] for uuid_ in chain(self._removed, self._added) if uuid_.bytes in index]
+            rows = np.delete(rows, dropped)
+        added = list(self._added.items())
+        uuids = rows["uuid"].tobytes() + b"".join(uuid_.bytes for uuid_, _ in added)
+        return (uuids,
+                np.concatenate((rows["x"], np.array([t.x for _, t in added], dtype=np.float64))),
+                np.concatenate((rows["y"], np.array([t.y for _, t in added], dtype=np.float64))),
+                np.concatenate((rows["z"], np.array([t.z for _, t in added], dtype=np.float64))))
+
+    def row_of(self, uuid_: UUID) -> Optional[int]:
+        """Row of uuid in array, None when it was not read from the save (or was removed)."""
+        if uuid_ in self._removed or uuid_ in self._added:
+            return None
+        return self._get_row_index().get(uuid_.bytes)
+
+    def uuid_at(self, row: int) -> UUID:
+        return _fast_uuid_from_bytes(self._rows["uuid"][row].tobytes())
+
+    def _view(self, uuid_: UUID, row: int) -> ActorTransform:
+        view = self._views.get(uuid_)
+        if view is None:
+            entry = self._rows[row]
+            view = ActorTransform()
+            view.x = float(entry["x"])
+            view.y = float(entry["y"])
+            view.z = float(entry["z"])
+            view.pitch = float(entry["pitch"])
+            view.roll = float(entry["roll"])
+            view.yaw = float(entry["yaw"])
+            view._quaternion = float(entry["quaternion"])
+            self._views[uuid_] = view
+        return view
+
+    def get(self, uuid_: UUID, default: Optional[ActorTransform] = None) -> Optional[ActorTransform]:
+        if not isinstance(uuid_, UUID):
+            return default
+        added = self._added.get(uuid_)
+        if added is not None:
+            return added
+        row = self.row_of(uuid_)
+        if row is None:
+            return default
+        return self._view(uuid_, row)
+
+    def __getitem__(self, uuid_: UUID) -> ActorTransform:
+        transform = self.get(uuid_)
+        if transform is None:
+            raise KeyError(uuid_)
+        return transform
+
+    def __contains__(self, uuid_: object) -> bool:
+        # No view is created for membership tests
+        if not isinstance(uuid_, UUID):
+            return False
+        return uuid_ in self._added or self.row_of(uuid_) is not None
+
+    def __setitem__(self, uuid_: UUID, transform: ActorTransform):
+        self._removed.discard(uuid_)
+        self._views.pop(uuid_, None)
+        self._added[uuid_] = transform
+
+    def __delitem__(self, uuid_: UUID):
+        if uuid_ not in self:
+            raise KeyError(uuid_)
+        self._added.pop(uuid_, None)
+        self._views.pop(uuid_, None)
+        if uuid_.bytes in self._get_row_index():
+            self._removed.add(uuid_)
+
+    def __len__(self) -> int:
+        replaced = sum(1 for uuid_ in self._added if uuid_.bytes in self._get_row_index())
+        return len(self._rows) - len(self._removed) - replaced + len(self._added)
+
+    def __iter__(self) -> Iterator[UUID]:
+        raw = self._rows["uuid"].tobytes()
+        for i in range(0, len(raw), 16):
+            uuid_ = _fast_uuid_from_bytes(raw[i:i + 16])
+            if uuid_ not in self._removed and uuid_ not in self._added:
+                yield uuid_
+        yield from list(self._added.keys())
+
+
+class ActorTransformPositions(MutableMapping[UUID, int]):
+    """UUID -> byte position of the entry in the ActorTransforms blob, computed from the table rows."""
+
+    def __init__(self, table: ActorTransformTable):
+        self._table = table
+        self._overrides: Dict[UUID, Optional[int]] = {}
+
+    def get(self, uuid_: UUID, default: Optional[int] = None) -> Optional[int]:
+        if uuid_ in self._overrides:
+            position = self._overrides[uuid_]
+            return default if position is None else position
+        row = self._table._get_row_index().get(uuid_.bytes) if isinstance(uuid_, UUID) else None
+        if row is None:
+            return default
+        return self._table.start_position + row * ACTOR_TRANSFORM_DTYPE.itemsize
+
+    def __getitem__(self, uuid_: UUID) -> int:
+        position = self.get(uuid_)
+        if position is None:
+            raise KeyError(uuid_)
+        return position
+
+    def __contains__(self, uuid_: object) -> bool:
+        return self.get(uuid_) is not None
+
+    def __setitem__(self, uuid_: UUID, position: int):
+        self._overrides[uuid_] = position
+
+    def __delitem__(self, uuid_: UUID):
+        if uuid_ not in self:
+            raise KeyError(uuid_)
+        self._overrides[uuid_] = None
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+    def __iter__(self) -> Iterator[UUID]:
+        raw = self._table.array["uuid"].tobytes()
+        for i in range(0, len(raw), 16):
+            uuid_ = _fast_uuid_from_bytes(raw[i:i + 16])
+            if uuid_ not in self._overrides:
+                yield uuid_
+        yield from [uuid_ for uuid_, position in self._overrides.items() if position is not None]
+
+
+class ActorTransformBlob:
+    """Editable copy of the ActorTransforms blob with the position of every entry indexed by uuid.
+
+    Entries are changed where they are, added in front of the terminating all-zero uuid and
+    removed by moving the last entry into their slot, so an edit never searches the blob and
+    moves at most one entry besides the terminator.
+    """
+
+    def __init__(self, buffer: bytes, position: int = 0):
+        table = ActorTransformTable.from_buffer(buffer, position)
+        self._buffer = bytearray(buffer)
+        self._start = table.start_position
+        self._rows: Dict[bytes, int] = dict(table._get_row_index())
+        self._count = len(table.array)
+
+    @property
+    def _end(self) -> int:
+        """Position of the terminating uuid."""
+        return self._start + self._count * ACTOR_TRANSFORM_DTYPE.itemsize
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __contains__(self, uuid_: object) -> bool:
+        return isinstance(uuid_, UUID) and uuid_.bytes in self._rows
+
+    def position_of(self, uuid_: UUID) -> Optional[int]:
+        row = self._rows.get(uuid_.bytes)
+        return None if row is None else self._start + row * ACTOR_TRANSFORM_DTYPE.itemsize
+
+    def set(self, uuid_: UUID, binary_data: bytes) -> int:
+        """Write the transform (7 doubles) of uuid, appending an entry when it has none. Returns its position."""
+        if len(binary_data) != ACTOR_TRANSFORM_DTYPE.itemsize - 16:
+            raise ValueError(f"Actor transform data should be {ACTOR_TRANSFORM_DTYPE.itemsize - 16} bytes, got {len(binary_data)}")
+        position = self.position_of(uuid_)
+        if position is None:
+            position = self._end
+            self._buffer[position:position] = uuid_.bytes + binary_data
+            self._rows[uuid_.bytes] = self._count
+            self._count += 1
+        else:
+            self._buffer[position + 16:position + ACTOR_TRANSFORM_DTYPE.itemsize] = binary_data
+        return position
+
+    def remove(self, uuid_: UUID) -> Optional[UUID]:
+        """Remove the entry of uuid, returns the uuid of the entry moved into its slot (if any)."""
+        row = self._rows.pop(uuid_.bytes)
+        size = ACTOR_TRANSFORM_DTYPE.itemsize
+        self._count -= 1
+        last = self._start + self._count * size
+        moved = None
+        if row != self._count:
+            position = self._start + row * size
+            self._buffer[position:position + size] = self._buffer[last:last + size]
+            moved = _fast_uuid_from_bytes(bytes(self._buffer[position:position + 16]))
+            self._rows[moved.bytes] = row
+        del self._buffer[last:last + size]
+        return moved
+
+    def to_bytes(self) -> bytes:
+        return bytes(self._buffer)
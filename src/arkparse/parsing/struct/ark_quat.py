@@ -5,7 +5,7 @@ from arkparse.logging import ArkSaveLogger
 if TYPE_CHECKING:
     from arkparse.parsing import ArkBinaryParser
 
-@dataclass
+@dataclass(slots=True)
 class ArkQuat:
     x: float
     y: float
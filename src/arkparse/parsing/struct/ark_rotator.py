@@ -4,7 +4,7 @@ from typing import TYPE_CHECKING
 if TYPE_CHECKING:
     from arkparse.parsing import ArkBinaryParser
 
-@dataclass
+@dataclass(slots=True)
 class ArkRotator:
     pitch: float
     yaw: float
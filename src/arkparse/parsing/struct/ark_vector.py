@@ -8,7 +8,7 @@ from arkparse.utils.json_utils import DefaultJsonEncoder
 if TYPE_CHECKING:
     from arkparse.parsing import ArkBinaryParser
 
-@dataclass
+@dataclass(slots=True)
 class ArkVector:
     x: float = field(default=0.0)
     y: float = field(default=0.0)
@@ -6,7 +6,7 @@ from arkparse.logging import ArkSaveLogger
 if TYPE_CHECKING:
     from arkparse.parsing import ArkBinaryParser
 
-@dataclass
+@dataclass(slots=True)
 class ObjectReference:
     TYPE_UUID = 0
     TYPE_PATH = 1
@@ -22,6 +22,7 @@ class ObjectReference:
 
     def __init__(self, reader: "ArkBinaryParser" = None):
         if reader is None:
+            self.type = ObjectReference.TYPE_UNKNOWN
             self.value = None
             return
         
@@ -0,0 +1,34 @@
+"""Worker side of the process pool parsing backend (see SaveConnection.use_process_pool).
+
+Each worker process receives the save context once through the pool initializer and then
+parses chunks of (uuid, class name, blob) items into picklable ArkGameObjects.
+"""
+from typing import Collection, List, Optional, Tuple
+from uuid import UUID
+
+from arkparse.logging.ark_save_logger import mark_as_worker_thread
+from arkparse.object_model.ark_game_object import ArkGameObject
+from arkparse.parsing import ArkBinaryParser
+from arkparse.saves.save_context import SaveContext
+
+_worker_context: Optional[SaveContext] = None
+
+
+def init_worker(save_context: SaveContext):
+    global _worker_context
+    mark_as_worker_thread()
+    _worker_context = save_context
+
+
+def parse_chunk(chunk: List[Tuple[UUID, str, bytes]], decode_only: Optional[Collection[str]] = None) -> List[Tuple[UUID, Optional[ArkGameObject]]]:
+    """Parse a chunk of objects, objects that fail to parse are returned as None."""
+    results = []
+    for obj_uuid, class_name, binary_data in chunk:
+        try:
+            obj = ArkGameObject(obj_uuid, class_name, ArkBinaryParser(binary_data, _worker_context), decode_only=decode_only)
+            # The parser of partially decoded objects stays behind, the caller attaches its own
+            obj._source = None
+        except Exception:
+            obj = None
+        results.append((obj_uuid, obj))
+    return results
@@ -1,6 +1,7 @@
 import math
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Dict, Optional, Collection
+from typing import Dict, Iterable, List, Mapping, Optional, Collection, Iterator, Sequence, Tuple
 import uuid
 
 from arkparse.logging import ArkSaveLogger
@@ -10,17 +11,23 @@ from arkparse.parsing.ark_binary_parser import ArkBinaryParser
 from arkparse.object_model.misc.__parsed_object_base import ParsedObjectBase
 from arkparse.enums import ArkMap
 from arkparse.object_model.ark_game_object import ArkGameObject
+from arkparse.parsing.struct.actor_transform import ActorTransform
+from arkparse.parsing.struct.object_reference import ObjectReference
 from .save_connection import SaveConnection
 from .save_context import SaveContext
+from .parsed_object_cache import CacheStats, ParsedObjectCache
+from .spatial_index import SpatialIndex
+from .ownership_index import OwnershipIndex
+from .structure_graph import StructureGraph
 
 class AsaSave:
     # Populate manually if constructor parameter use_connection is False
     
 
-    def __init__(self, path: Path = None, contents: bytes = None, read_only: bool = False, use_connection: bool = True, map: ArkMap = None):
+    def __init__(self, path: Path = None, contents: bytes = None, read_only: bool = False, use_connection: bool = True, map: ArkMap = None, copy_on_write: bool = False, in_memory: bool = True, lazy: bool = False, use_index: bool = False):
 
         self.save_context = SaveContext()
-        self.parsed_objects: Dict[uuid.UUID, ArkGameObject] = {}
+        self.parsed_objects: ParsedObjectCache = ParsedObjectCache()
         self._map = map
 
         # Populate manually if constructor parameter use_connection is False
@@ -30,13 +37,17 @@ class AsaSave:
         self.game_obj_binaries: Optional['Dict[uuid.UUID, Optional[bytes]]'] = None
         self.all_classes: Optional['list[str]'] = None
         self.containers: Optional[Dict[uuid.UUID, ArkGameObject]] = None
+        self._spatial_index: Optional[SpatialIndex] = None
+        self._spatial_index_source: Optional[Tuple[Mapping[uuid.UUID, ActorTransform], int, int]] = None
+        self._ownership_index: Optional[Tuple[int, OwnershipIndex]] = None
+        self._structure_graph: Optional[Tuple[int, StructureGraph]] = None
 
         self.profile_data_in_db = False
         self.save_dir = path.parent if path is not None else None
         self.save_connection = None
         if use_connection:
-            self.save_connection = SaveConnection(save_context=self.save_context, path=path, contents=contents, read_only=read_only)
-            self.initialize()
+            self.save_connection = SaveConnection(save_context=self.save_context, path=path, contents=contents, read_only=read_only, copy_on_write=copy_on_write, in_memory=in_memory, use_index=use_index)
+            self.initialize(lazy)
 
     def __del__(self):
         self.close()
@@ -50,10 +61,49 @@ class AsaSave:
             raise ValueError("Map not set for save")
         return self._map
 
+    @property
+    def fingerprint(self) -> int:
+        """Changes whenever game objects are added, modified or removed through this save, for caching data derived from them."""
+        if self.save_connection is not None:
+            return self.save_connection.revision
+        return len(self.parsed_objects)
+
+    @property
+    def object_cache(self) -> ParsedObjectCache:
+        """The cache holding the parsed game objects of this save."""
+        if self.save_connection is not None:
+            return self.save_connection.parsed_objects
+        return self.parsed_objects
+
+    def set_object_cache(self, cache: ParsedObjectCache):
+        if self.save_connection is not None:
+            self.save_connection.set_object_cache(cache)
+        else:
+            cache.copy_pins_from(self.parsed_objects)
+            cache.update(self.parsed_objects)
+            self.parsed_objects = cache
+
+    def set_object_cache_budget(self, max_entries: Optional[int] = None, max_bytes: Optional[int] = None):
+        """Limit the parsed object cache to max_entries objects and/or roughly max_bytes, evicting the least recently used."""
+        self.object_cache.set_budget(max_entries, max_bytes)
+
+    @property
+    def cache_stats(self) -> CacheStats:
+        return self.object_cache.stats
+
+    def pin_object(self, obj_uuid: uuid.UUID, owner: object):
+        """Keep the parsed object cached while owner (typically a ParsedObjectBase wrapper) is alive."""
+        self.object_cache.pin(obj_uuid, owner)
+
     def set_max_workers(self, max_workers: int):
         if self.save_connection is not None:
             self.save_connection.set_max_workers(max_workers)
 
+    def use_process_pool(self, max_workers: Optional[int] = None, chunk_size: int = 256):
+        """Parse game objects in worker processes, see SaveConnection.use_process_pool."""
+        if self.save_connection is not None:
+            self.save_connection.use_process_pool(max_workers, chunk_size)
+
     def get_bytes(self) -> Optional[bytes]:
         if self.save_connection is not None:
             return self.save_connection.get_bytes()
@@ -65,10 +115,16 @@ class AsaSave:
             return self.save_connection.faulty_objects
         return 0
 
-    def initialize(self):
-        self.read_actor_locations()
+    def initialize(self, lazy: bool = False):
+        if lazy:
+            # Actor transforms and game time are only read when first accessed through the save context
+            self.save_context.set_actor_transform_loader(self._read_actor_transforms)
+            self.save_context.set_game_time_loader(self._read_game_time_params)
+        else:
+            self.read_actor_locations()
         self.profile_data_in_db = self.profile_data_in_saves()
-        self._get_game_time_params()
+        if not lazy:
+            self._get_game_time_params()
 
     def profile_data_in_saves(self) -> bool:
         parser: ArkBinaryParser = self.get_custom_value("GameModeCustomBytes")
@@ -80,7 +136,14 @@ class AsaSave:
     def get_class_of_uuid(self, obj_uuid: uuid.UUID) -> Optional[str]:
         return self.save_connection.get_class_of_uuid(obj_uuid)
 
+    def get_classes_of_uuids(self, obj_uuids: Collection[uuid.UUID]) -> Dict[uuid.UUID, str]:
+        """Class names of several objects in one lookup, objects that are not in the save are left out."""
+        return self.save_connection.get_classes_of_uuids(obj_uuids)
+
     def _get_game_time_params(self):
+        self.save_context.current_time, self.save_context.current_day = self._read_game_time_params()
+
+    def _read_game_time_params(self) -> Tuple[float, int]:
         config: GameObjectReaderConfiguration = GameObjectReaderConfiguration()
         config.blueprint_name_filter = lambda name: name is not None and "daycycle" in name.lower()
 
@@ -96,10 +159,8 @@ class AsaSave:
                 current_time = obj.get_property_value("CurrentTime", 0)
                 break
 
-        self.save_context.current_time = current_time
-        self.save_context.current_day = current_day
-
-        ArkSaveLogger.save_log(f"Current time: {self.save_context.current_time}, current day: {self.save_context.current_day}")
+        ArkSaveLogger.save_log(f"Current time: {current_time}, current day: {current_day}")
+        return current_time, current_day
 
     def get_game_time_readable_string(self):
         current_hours = str(max(0, math.floor(self.save_context.current_time / 3600)))
@@ -114,19 +175,41 @@ class AsaSave:
             current_seconds = f"0{current_seconds}"
         return f"Day {self.save_context.current_day}, {current_hours}:{current_minutes}:{current_seconds}"
     
+    def get_ownership_index(self) -> OwnershipIndex:
+        """Item -> inventory -> owning actor lookups, built in one pass and rebuilt when the save fingerprint changes."""
+        fingerprint = self.fingerprint
+        if self._ownership_index is None or self._ownership_index[0] != fingerprint:
+            ArkSaveLogger.save_log("Building ownership index")
+            config = GameObjectReaderConfiguration(decode_only=OwnershipIndex.PROPERTY_NAMES)
+            config.property_names = list(OwnershipIndex.PROPERTY_NAMES)
+            index = OwnershipIndex()
+            objects = self.iter_game_objects(config) if self.save_connection is not None else self.parsed_objects.items()
+            for obj_uuid, obj in objects:
+                index.add(obj_uuid, obj)
+            self._ownership_index = (fingerprint, index)
+        return self._ownership_index[1]
+
+    def get_structure_graph(self) -> StructureGraph:
+        """Links between all structures in the save, built in one pass and rebuilt when the save fingerprint changes.
+
+        Only the link properties of the structure objects are decoded to build it, those partially
+        decoded objects are not added to the object cache.
+        """
+        fingerprint = self.fingerprint
+        if self._structure_graph is None or self._structure_graph[0] != fingerprint:
+            from arkparse.api.structure_api import StructureApi
+            ArkSaveLogger.save_log("Building structure graph")
+            objects = StructureApi(self).get_all_objects(decode_only=("bIsEngram",) + StructureGraph.EDGE_PROPERTIES, cache=False)
+            graph = StructureGraph.from_objects(objects)
+            ArkSaveLogger.save_log(f"Structure graph has {len(graph)} structures in {len(graph.components())} groups")
+            self._structure_graph = (fingerprint, graph)
+        return self._structure_graph[1]
+
     def get_container_of_inventory(self, inv_uuid: uuid.UUID) -> ArkGameObject:
-        if self.containers is None:
-            ArkSaveLogger.save_log("Fetching all containers with MyInventoryComponent property")
-            config = GameObjectReaderConfiguration()
-            config.property_names = ["MyInventoryComponent"]
-            self.containers = self.get_game_objects(config)
-            ArkSaveLogger.save_log(f"Found {len(self.containers)} containers with MyInventoryComponent property")
-
-        for _, container in self.containers.items():
-            # print(container.get_short_name())
-            if container.get_property_value("MyInventoryComponent") is not None and uuid.UUID(container.get_property_value("MyInventoryComponent").value) == inv_uuid:
-                return container
-        return None
+        container_uuid = self.get_ownership_index().get_container_of_inventory(inv_uuid)
+        if container_uuid is None:
+            return None
+        return self.get_game_object_by_id(container_uuid)
 
     def read_actor_locations(self):
         actor_transforms = self.get_custom_value("ActorTransforms")
@@ -137,12 +220,37 @@ class AsaSave:
             self.save_context.actor_transform_positions = atp
         # print(f"Length of actor transforms: {len(self.save_context.actor_transforms)}")
 
+    def _read_actor_transforms(self) -> Tuple[Mapping[uuid.UUID, ActorTransform], Mapping[uuid.UUID, int]]:
+        actor_transforms = self.get_custom_value("ActorTransforms")
+        ArkSaveLogger.save_log("Actor transforms table retrieved (lazy)")
+        if actor_transforms:
+            return actor_transforms.read_actor_transforms()
+        return {}, {}
+
+    def get_game_object_count(self) -> int:
+        if self.game_obj_binaries is not None:
+            return len(self.game_obj_binaries)
+        if self.save_connection is not None:
+            return self.save_connection.get_game_object_count()
+        return 0
+
     def get_actor_transform(self, uuid: uuid.UUID):
         if uuid in self.save_context.actor_transforms:
             return self.save_context.actor_transforms[uuid]
         ArkSaveLogger.error_log(f"Actor transform for {uuid} not found")
         return None
 
+    def get_spatial_index(self) -> SpatialIndex:
+        """Grid index over the actor transforms, rebuilt when transforms were added, moved or removed since the last call."""
+        transforms = self.save_context.actor_transforms
+        revision = self.save_connection.actor_transform_revision if self.save_connection is not None else 0
+        source = (transforms, len(transforms), revision)
+        cached = self._spatial_index_source
+        if self._spatial_index is None or cached[0] is not transforms or cached[1:] != source[1:]:
+            self._spatial_index = SpatialIndex.from_actor_transforms(transforms)
+            self._spatial_index_source = source
+        return self._spatial_index
+
     def find_in_header(self, byte_sequence: bytes) -> Optional[int]:
         header_data = self.get_custom_value("SaveHeader")
         if not header_data:
@@ -184,7 +292,7 @@ class AsaSave:
             self.save_connection.replace_value_in_custom_tables(search, replace)
 
     def get_obj_uuids(self) -> Collection[uuid.UUID]:
-        return self.get_obj_uuids()
+        return self.save_connection.get_obj_uuids()
     
     def print_tables_and_sizes(self):
         if self.save_connection is not None:
@@ -204,6 +312,21 @@ class AsaSave:
     def add_to_db(self, obj: ParsedObjectBase):
         self.add_obj_to_db(obj.object.uuid, obj.binary.byte_buffer)
         
+    @contextmanager
+    def batch(self):
+        """Write everything changed inside the with block in a single transaction, see SaveConnection.batch.
+
+            with save.batch():
+                for structure in structures.values():
+                    structure.set_max_health(10000)
+                    structure.update_binary()
+        """
+        if self.save_connection is None:
+            yield self
+            return
+        with self.save_connection.batch():
+            yield self
+
     def add_obj_to_db(self, obj_uuid: uuid.UUID, obj_data: bytes):
         if self.save_connection is not None:
             self.save_connection.add_obj_to_db(obj_uuid, obj_data)
@@ -212,6 +335,17 @@ class AsaSave:
         if self.save_connection is not None:
             self.save_connection.modify_game_obj(obj_uuid, obj_data)
 
+    def patch_game_obj(self, obj_uuid: uuid.UUID, patches: Sequence[Tuple[int, bytes]], base_revision: Optional[int]) -> bool:
+        """Write fixed size changes into the stored binary of an object in place, see SaveConnection.patch_game_obj."""
+        if self.save_connection is not None:
+            return self.save_connection.patch_game_obj(obj_uuid, patches, base_revision)
+        return False
+
+    def get_object_revision(self, obj_uuid: uuid.UUID) -> Optional[int]:
+        if self.save_connection is not None:
+            return self.save_connection.object_revision(obj_uuid)
+        return None
+
     def remove_obj_from_db(self, obj_uuid: uuid.UUID):
         if self.save_connection is not None:
             self.save_connection.remove_obj_from_db(obj_uuid)
@@ -228,6 +362,10 @@ class AsaSave:
         if self.save_connection is not None:
             self.save_connection.modify_actor_transform(uuid, binary_data)
 
+    def remove_actor_transform(self, uuid: uuid.UUID):
+        if self.save_connection is not None:
+            self.save_connection.remove_actor_transform(uuid)
+
     def store_db(self, path: Path):
         if self.save_connection is not None:
             self.save_connection.store_db(path)
@@ -239,6 +377,8 @@ class AsaSave:
 
     def reset_caching(self):
         self.parsed_objects.clear()
+        self._ownership_index = None
+        self._structure_graph = None
         if self.save_connection is not None:
             self.save_connection.reset_caching()
 
@@ -249,7 +389,22 @@ class AsaSave:
             if self.save_connection is not None:
                 return self.save_connection.get_game_objects(reader_config)
             return {}
-    
+
+    def get_game_objects_multi(self, reader_configs: Sequence[GameObjectReaderConfiguration], cache: bool = True) -> List[Dict[uuid.UUID, 'ArkGameObject']]:
+        """The objects matching each of the reader configurations, read with a single scan, see SaveConnection.get_game_objects_multi."""
+        if self.parsed_objects is not None and len(self.parsed_objects) > 0:
+            return [self.parsed_objects for _ in reader_configs]
+        else:
+            if self.save_connection is not None:
+                return self.save_connection.get_game_objects_multi(reader_configs, cache)
+            return [{} for _ in reader_configs]
+
+    def iter_game_objects(self, reader_config: GameObjectReaderConfiguration = GameObjectReaderConfiguration(),
+                          batch_size: int = 1000, cache: bool = False) -> Iterator[Tuple[uuid.UUID, 'ArkGameObject']]:
+        """Stream (uuid, object) pairs in batches without keeping the whole save in memory, see SaveConnection.iter_game_objects."""
+        if self.save_connection is not None:
+            yield from self.save_connection.iter_game_objects(reader_config, batch_size, cache)
+
     def get_all_present_classes(self):
         if self.all_classes is not None:
             return self.all_classes
@@ -259,8 +414,9 @@ class AsaSave:
             return None
 
     def get_game_object_by_id(self, obj_uuid: uuid.UUID, reparse: bool = False) -> Optional['ArkGameObject']:
-        if obj_uuid in self.parsed_objects and not reparse:
-            return self.parsed_objects[obj_uuid]
+        cached = self.parsed_objects.get(obj_uuid) if not reparse else None
+        if cached is not None:
+            return cached
         else:
             if self.game_obj_binaries is not None and obj_uuid in self.game_obj_binaries:
                 bin = self.game_obj_binaries[obj_uuid]
@@ -274,6 +430,36 @@ class AsaSave:
                     return self.save_connection.get_game_object_by_id(obj_uuid, reparse)
                 return None
 
+    def get_game_objects_by_ids(self, obj_uuids: Collection[uuid.UUID], reparse: bool = False) -> Dict[uuid.UUID, 'ArkGameObject']:
+        """Parse several objects with one batch of queries, objects that are not in the save are left out."""
+        if self.save_connection is not None and self.game_obj_binaries is None:
+            return self.save_connection.get_game_objects_by_ids(obj_uuids, reparse)
+        game_objects = {}
+        for obj_uuid in obj_uuids:
+            if self.is_in_db(obj_uuid):
+                obj = self.get_game_object_by_id(obj_uuid, reparse)
+                if obj is not None:
+                    game_objects[obj_uuid] = obj
+        return game_objects
+
+    def prefetch_references(self, objects: Iterable['ArkGameObject'], property_names: Iterable[str]) -> Dict[uuid.UUID, 'ArkGameObject']:
+        """Parse the objects referenced by the property_names of objects in one batch.
+
+        Wrappers created for the objects afterwards find their referenced objects (status
+        components, AI controllers, inventories...) in the object cache instead of querying
+        them one by one.
+        """
+        property_names = tuple(property_names)
+        referenced = []
+        for obj in objects:
+            for name in property_names:
+                reference = obj.get_property_value(name)
+                if isinstance(reference, ObjectReference) and reference.type == ObjectReference.TYPE_UUID and reference.value is not None:
+                    referenced.append(uuid.UUID(reference.value))
+        if not referenced:
+            return {}
+        return self.get_game_objects_by_ids(referenced)
+
     def get_custom_value(self, key: str) -> Optional['ArkBinaryParser']:
         if "GameModeCustomBytes" in key and self.custom_value_GameModeCustomBytes is not None:
             return self.custom_value_GameModeCustomBytes
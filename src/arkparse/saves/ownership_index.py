@@ -0,0 +1,58 @@
+from typing import Dict, List, Mapping, Optional
+from uuid import UUID
+
+from arkparse.object_model.ark_game_object import ArkGameObject
+from arkparse.parsing.struct.object_reference import ObjectReference
+
+
+def _reference_uuid(reference: Optional[ObjectReference]) -> Optional[UUID]:
+    if reference is None or reference.type != ObjectReference.TYPE_UUID or reference.value is None:
+        return None
+    return UUID(reference.value)
+
+
+class OwnershipIndex:
+    """Reverse lookups from items to their inventory and from inventories to the actor that owns them.
+
+    Built in one pass from the MyInventoryComponent (actor -> inventory), InventoryItems
+    (inventory -> items) and OwnerInventory (item -> inventory) references of the objects.
+    """
+
+    PROPERTY_NAMES = ("MyInventoryComponent", "InventoryItems", "OwnerInventory")
+
+    def __init__(self):
+        self._container_of_inventory: Dict[UUID, UUID] = {}
+        self._inventory_of_item: Dict[UUID, UUID] = {}
+
+    @classmethod
+    def from_objects(cls, objects: Mapping[UUID, ArkGameObject]) -> "OwnershipIndex":
+        index = cls()
+        for uuid_, obj in objects.items():
+            index.add(uuid_, obj)
+        return index
+
+    def add(self, uuid_: UUID, obj: ArkGameObject):
+        inventory = _reference_uuid(obj.get_property_value("MyInventoryComponent"))
+        if inventory is not None:
+            self._container_of_inventory[inventory] = uuid_
+
+        items: List[ObjectReference] = obj.get_array_property_value("InventoryItems", [])
+        for item in items:
+            item_uuid = _reference_uuid(item)
+            if item_uuid is not None:
+                self._inventory_of_item[item_uuid] = uuid_
+
+        owner_inventory = _reference_uuid(obj.get_property_value("OwnerInventory"))
+        if owner_inventory is not None:
+            self._inventory_of_item.setdefault(uuid_, owner_inventory)
+
+    def get_container_of_inventory(self, inv_uuid: UUID) -> Optional[UUID]:
+        """Uuid of the actor (structure, dino, player) whose MyInventoryComponent is the inventory."""
+        return self._container_of_inventory.get(inv_uuid)
+
+    def get_inventory_of_item(self, item_uuid: UUID) -> Optional[UUID]:
+        return self._inventory_of_item.get(item_uuid)
+
+    def get_container_of_item(self, item_uuid: UUID) -> Optional[UUID]:
+        inventory = self._inventory_of_item.get(item_uuid)
+        return self._container_of_inventory.get(inventory) if inventory is not None else None
@@ -0,0 +1,178 @@
+import threading
+import weakref
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterator, List, MutableMapping, Optional, TYPE_CHECKING
+from uuid import UUID
+
+if TYPE_CHECKING:
+    from arkparse.object_model.ark_game_object import ArkGameObject
+
+_OBJECT_OVERHEAD = 1024
+_PROPERTY_OVERHEAD = 256
+
+
+def estimate_object_size(obj: "ArkGameObject") -> int:
+    """Rough in-memory size of a parsed object, based on the serialized size of its properties."""
+    undecoded_size = getattr(obj, "undecoded_size", 0)
+    if undecoded_size:
+        # Lazily parsed object, only the blob is kept until its properties are accessed
+        return _OBJECT_OVERHEAD + undecoded_size
+    properties = getattr(obj, "properties", None) or []
+    return _OBJECT_OVERHEAD + sum(_PROPERTY_OVERHEAD + prop.nr_of_bytes for prop in properties)
+
+
+@dataclass
+class CacheStats:
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+
+
+class ParsedObjectCache(MutableMapping[UUID, "ArkGameObject"]):
+    """Dict-like cache of parsed game objects with an optional entry and/or byte budget.
+
+    Without a budget it behaves like the plain dict it replaces. Once a budget is exceeded,
+    the least recently used objects are evicted, except for pinned ones: objects that are
+    currently wrapped by a live ParsedObjectBase (see pin). Subclasses can change the
+    eviction order by overriding _eviction_candidates.
+
+    Lookups through get() and [] count towards stats, plain membership tests do not.
+    """
+
+    def __init__(self, max_entries: Optional[int] = None, max_bytes: Optional[int] = None,
+                 size_of: Callable[[Any], int] = estimate_object_size):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.size_of = size_of
+        self.stats = CacheStats()
+
+        self._entries: "OrderedDict[UUID, ArkGameObject]" = OrderedDict()
+        self._sizes: Dict[UUID, int] = {}
+        self._total_bytes = 0
+        self._pins: Dict[UUID, List[weakref.ref]] = {}
+        self._lock = threading.RLock()
+
+    @property
+    def total_bytes(self) -> int:
+        return self._total_bytes
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __iter__(self) -> Iterator[UUID]:
+        return iter(list(self._entries.keys()))
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._entries
+
+    def __getitem__(self, key: UUID) -> "ArkGameObject":
+        with self._lock:
+            obj = self._entries.get(key)
+            if obj is None:
+                self.stats.misses += 1
+                raise KeyError(key)
+            self._entries.move_to_end(key)
+            self.stats.hits += 1
+            return obj
+
+    def get(self, key: UUID, default: Optional["ArkGameObject"] = None) -> Optional["ArkGameObject"]:
+        with self._lock:
+            obj = self._entries.get(key)
+            if obj is None:
+                self.stats.misses += 1
+                return default
+            self._entries.move_to_end(key)
+            self.stats.hits += 1
+            return obj
+
+    def __setitem__(self, key: UUID, obj: "ArkGameObject"):
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = obj
+            if self.max_bytes is not None:
+                size = self.size_of(obj)
+                self._sizes[key] = size
+                self._total_bytes += size
+            self._enforce_budget()
+
+    def __delitem__(self, key: UUID):
+        with self._lock:
+            if key not in self._entries:
+                raise KeyError(key)
+            self._remove(key)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._sizes.clear()
+            self._total_bytes = 0
+
+    def _remove(self, key: UUID):
+        del self._entries[key]
+        self._total_bytes -= self._sizes.pop(key, 0)
+
+    def copy_pins_from(self, other: "ParsedObjectCache"):
+        with self._lock:
+            for key, owners in other._pins.items():
+                for ref in owners:
+                    owner = ref()
+                    if owner is not None:
+                        self.pin(key, owner)
+
+    def pin(self, key: UUID, owner: object):
+        """Keep key in the cache for as long as owner is alive."""
+        # Owners are tracked by identity, wrapper dataclasses are not hashable
+        with self._lock:
+            owners = self._pins.setdefault(key, [])
+            if not any(ref() is owner for ref in owners):
+                owners.append(weakref.ref(owner))
+
+    def unpin(self, key: UUID, owner: object):
+        with self._lock:
+            owners = self._pins.get(key)
+            if owners is not None:
+                owners[:] = [ref for ref in owners if ref() is not owner]
+
+    def is_pinned(self, key: UUID) -> bool:
+        owners = self._pins.get(key)
+        if owners is None:
+            return False
+        owners[:] = [ref for ref in owners if ref() is not None]
+        if len(owners) == 0:
+            del self._pins[key]
+            return False
+        return True
+
+    def set_budget(self, max_entries: Optional[int] = None, max_bytes: Optional[int] = None):
+        with self._lock:
+            if max_bytes is not None and self.max_bytes is None:
+                self._sizes = {key: self.size_of(obj) for key, obj in self._entries.items()}
+                self._total_bytes = sum(self._sizes.values())
+            self.max_entries = max_entries
+            self.max_bytes = max_bytes
+            if max_bytes is None:
+                self._sizes.clear()
+                self._total_bytes = 0
+            self._enforce_budget()
+
+    def _over_budget(self) -> bool:
+        if self.max_entries is not None and len(self._entries) > self.max_entries:
+            return True
+        return self.max_bytes is not None and self._total_bytes > self.max_bytes
+
+    def _eviction_candidates(self) -> Iterator[UUID]:
+        """Keys in the order they should be evicted, least recently used first."""
+        return iter(list(self._entries.keys()))
+
+    def _enforce_budget(self):
+        if not self._over_budget():
+            return
+        for key in self._eviction_candidates():
+            if not self._over_budget():
+                break
+            if self.is_pinned(key):
+                continue
+            self._remove(key)
+            self.stats.evictions += 1
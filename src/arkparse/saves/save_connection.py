@@ -1,19 +1,29 @@
+import os
+import shutil
 import sqlite3
 import sys
 import uuid
 from uuid import UUID, SafeUUID
 from pathlib import Path
-from typing import Collection, Optional, Dict, List, Tuple
-from concurrent.futures import ThreadPoolExecutor
+from typing import Collection, Optional, Dict, Iterator, List, Sequence, Set, Tuple
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 import threading
+from functools import partial
+from contextlib import contextmanager
+from itertools import groupby
 
 from arkparse.logging import ArkSaveLogger
 from arkparse.logging.ark_save_logger import mark_as_worker_thread
 from arkparse.object_model.ark_game_object import ArkGameObject
 from arkparse.parsing import ArkBinaryParser, GameObjectReaderConfiguration
 from arkparse.parsing._fast_shim import contains_any_pattern
+from arkparse.parsing.struct.actor_transform import ActorTransform
+from arkparse.parsing.struct.actor_transform_table import ACTOR_TRANSFORM_DTYPE, ActorTransformBlob
 from arkparse.saves.header_location import HeaderLocation
+from arkparse.saves import _process_parsing
 from arkparse.saves.save_context import SaveContext
+from arkparse.saves.save_index import SaveIndex
+from arkparse.saves.parsed_object_cache import ParsedObjectCache
 from arkparse.utils import TEMP_FILES_DIR
 
 
@@ -35,11 +45,18 @@ def _is_parallel_enabled() -> bool:
 
 _PARALLEL_ENABLED = _is_parallel_enabled()
 
+# sqlite3.Connection.deserialize/serialize are only available from Python 3.11 on
+_IN_MEMORY_SUPPORTED = hasattr(sqlite3.Connection, 'deserialize')
+_BLOB_IO_SUPPORTED = hasattr(sqlite3.Connection, 'blobopen')
 
-def _parse_single_object(obj_uuid: UUID, class_name: str, binary_data: bytes, save_context: SaveContext) -> Optional[ArkGameObject]:
+# Stay below SQLITE_MAX_VARIABLE_NUMBER of older SQLite builds (999)
+_SQL_IN_CHUNK_SIZE = 900
+
+
+def _parse_single_object(obj_uuid: UUID, class_name: str, binary_data: bytes, save_context: SaveContext, decode_only: Optional[Collection[str]] = None, lazy: bool = False) -> Optional[ArkGameObject]:
     """Parse a single game object. Thread-safe for use in parallel parsing."""
     byte_buffer = ArkBinaryParser(binary_data, save_context)
-    return SaveConnection.parse_as_predefined_object(obj_uuid, class_name, byte_buffer)
+    return SaveConnection.parse_as_predefined_object(obj_uuid, class_name, byte_buffer, decode_only, lazy)
 
 class SaveConnection:
 
@@ -51,39 +68,258 @@ class SaveConnection:
     faulty_objects = 0
     failed_parses: Dict[str, int] = {}
 
-    def __init__(self, save_context: SaveContext, path: Path = None, contents: bytes = None, read_only: bool = False):
+    def __init__(self, save_context: SaveContext, path: Path = None, contents: bytes = None, read_only: bool = False, copy_on_write: bool = False, in_memory: bool = True, use_index: bool = False):
         # Thread lock for database operations
         self._db_lock = threading.Lock()
         self._max_workers = 3  # Default max workers for parallel parsing
 
-        # create temp copy of file
-        temp_save_path = TEMP_FILES_DIR / (str(uuid.uuid4()) + ".ark")
-        self.parsed_objects: Dict[uuid.UUID, ArkGameObject] = {}
+        # Opt-in process pool backend, see use_process_pool
+        self._process_workers = 0
+        self._process_chunk_size = 256
+        self._process_pool: Optional[ProcessPoolExecutor] = None
+        self._process_pool_name_count = 0
+
+        self.connection = None
+        self.sqlite_db = None
+        self.read_only = read_only
+        self.parsed_objects: ParsedObjectCache = ParsedObjectCache()
         self._class_cache: Dict[uuid.UUID, str] = {}
 
-        if path is not None:
-            with open(path, 'rb') as file:
+        # When set, the connection is attached directly to the original save file
+        # and a working copy is only made on the first write (see _ensure_writable)
+        self._source_path: Optional[Path] = None
+        self._in_memory = False
+
+        # Persistent game table index, only available for saves opened from a path (see _get_index)
+        self._index: Optional[SaveIndex] = None
+        self._index_path: Optional[Path] = SaveIndex.default_path(path) if use_index and path is not None else None
+        self._index_key: Optional[str] = None
+        self._has_writes = False
+        # Incremented on every change to the game table, see revision
+        self._revision = 0
+        # Revision of the last write per object, see object_revision
+        self._object_revisions: Dict[uuid.UUID, int] = {}
+
+        # Writes queued by an open batch, plus the object and custom values they write (see batch)
+        self._batch_depth = 0
+        self._write_queue: List[Tuple[str, tuple]] = []
+        self._pending_objects: Dict[uuid.UUID, Optional[bytes]] = {}
+        self._pending_custom: Dict[str, bytes] = {}
+        # Revision and custom keys written since the outermost batch started, to undo them when it fails
+        self._batch_revision = 0
+        self._batch_custom_keys: Set[str] = set()
+        # Editable ActorTransforms blob, kept between edits so entries are found by uuid (see add_actor_transforms)
+        self._actor_transform_blob: Optional[ActorTransformBlob] = None
+        self._actor_transforms_dirty = False
+        # Incremented on every actor transform write, see actor_transform_revision
+        self._actor_transform_revision = 0
+
+        if path is None and contents is not None and in_memory and _IN_MEMORY_SUPPORTED:
+            # Load the save straight into an in-memory database, nothing touches the disk
+            self._in_memory = True
+            conn_str = "file::memory:"
+        elif path is not None and copy_on_write:
+            # Not opened as immutable, the save may still be written by a running server
+            self._source_path = Path(path)
+            conn_str = f"{self._source_path.resolve().as_uri()}?mode=ro"
+        elif path is not None or contents is not None:
+            # create temp copy of file
+            temp_save_path = TEMP_FILES_DIR / (str(uuid.uuid4()) + ".ark")
+            if path is not None:
+                with open(path, 'rb') as file:
+                    with open(temp_save_path, 'wb') as temp_file:
+                        temp_file.write(file.read())
+            else:
                 with open(temp_save_path, 'wb') as temp_file:
-                    temp_file.write(file.read())
-        elif contents is not None:
-            with open(temp_save_path, 'wb') as temp_file:
-                temp_file.write(contents)
+                    temp_file.write(contents)
+            self.sqlite_db = temp_save_path
+            conn_str = f"file:{temp_save_path}?mode={'ro' if read_only else 'rw'}"
         else:
             raise ValueError("Either path or contents must be provided")
 
         self.save_dir = path.parent if path is not None else None
-        self.sqlite_db = temp_save_path
 
         self.save_context = save_context
 
-        conn_str = f"file:{temp_save_path}?mode={'ro' if read_only else 'rw'}"
         # check_same_thread=False allows connection to be used from multiple threads
         # This is safe for read operations in parallel parsing
         self.connection = sqlite3.connect(conn_str, uri=True, check_same_thread=False)
+        if self._in_memory:
+            self.connection.deserialize(contents)
+            if read_only:
+                self.connection.execute("PRAGMA query_only = ON")
 
         self.list_all_items_in_db()
         self.read_header()
 
+        if self._index_path is not None:
+            self._index_key = SaveIndex.compute_key(path, self.get_custom_value("SaveHeader").byte_buffer)
+
+    @property
+    def revision(self) -> int:
+        """Number of changes made to the game table through this connection."""
+        return self._revision
+
+    @property
+    def actor_transform_revision(self) -> int:
+        """Number of actor transform writes (adds, moves and removals) made through this connection."""
+        return self._actor_transform_revision
+
+    def object_revision(self, obj_uuid: uuid.UUID) -> int:
+        """Revision of the last write to an object through this connection, 0 if it was never written."""
+        return self._object_revisions.get(obj_uuid, 0)
+
+    @contextmanager
+    def batch(self):
+        """Group the writes made inside the with block into a single transaction.
+
+        Object and custom table writes are queued, reads of those objects and custom values
+        see the queued data. When the outermost batch exits, the queue is applied with one
+        executemany per run of same kind writes and committed once. Queries that scan the
+        tables apply the queue first. Written objects are dropped from the object cache
+        instead of being reparsed right away, they are parsed again on their next access.
+
+        When the with block raises, nothing of the batch is written: the queue is dropped and
+        the transaction rolled back (see _discard_writes). Nested batches are part of the
+        outermost one and are only rolled back with it.
+        """
+        if self._batch_depth == 0:
+            self._batch_revision = self._revision
+            self._batch_custom_keys.clear()
+        self._batch_depth += 1
+        try:
+            yield self
+        except BaseException:
+            self._batch_depth -= 1
+            if self._batch_depth == 0:
+                self._discard_writes()
+            raise
+        self._batch_depth -= 1
+        if self._batch_depth == 0:
+            try:
+                self._flush_writes()
+                self.connection.commit()
+            except BaseException:
+                self._discard_writes()
+                raise
+
+    @property
+    def in_batch(self) -> bool:
+        return self._batch_depth > 0
+
+    def _write(self, query: str, params: tuple):
+        if self._batch_depth > 0:
+            self._write_queue.append((query, params))
+        else:
+            with self.connection as conn:
+                conn.execute(query, params)
+                conn.commit()
+
+    def _flush_writes(self):
+        """Apply the writes queued by a batch, without committing them."""
+        if self._actor_transforms_dirty:
+            # All transform edits of the batch are written as one blob
+            self._pending_custom["ActorTransforms"] = self._actor_transform_blob.to_bytes()
+            self._actor_transforms_dirty = False
+        if not self._write_queue and not self._pending_custom:
+            return
+        queue, self._write_queue = self._write_queue, []
+        with self._db_lock:
+            for query, writes in groupby(queue, key=lambda write: write[0]):
+                self.connection.executemany(query, [params for _, params in writes])
+            if self._pending_custom:
+                self.connection.executemany("UPDATE custom SET value = ? WHERE key = ?",
+                                            [(value, key) for key, value in self._pending_custom.items()])
+        self._pending_objects.clear()
+        self._pending_custom.clear()
+
+    def _discard_writes(self):
+        """Drop the writes of a failed batch, roll back what was already applied of it and
+        reload the state derived from the rolled back data."""
+        self._write_queue.clear()
+        self._pending_objects.clear()
+        self._pending_custom.clear()
+        with self._db_lock:
+            if self.connection.in_transaction:
+                # Also undoes blob writes of patch_game_obj and queue flushes made during the batch
+                self.connection.rollback()
+
+        if "ActorTransforms" in self._batch_custom_keys:
+            self._actor_transform_blob = None
+            self._actor_transforms_dirty = False
+            self._actor_transform_revision += 1
+            if self.save_context.actor_transforms_loaded:
+                self.read_actor_locations()
+        if "SaveHeader" in self._batch_custom_keys:
+            # Forget the names added during the batch
+            self.read_header()
+        self._batch_custom_keys.clear()
+
+        written = [obj_uuid for obj_uuid, revision in self._object_revisions.items() if revision > self._batch_revision]
+        if len(written) == 0:
+            return
+        # A new revision, so patches based on the rolled back data are not applied to the restored rows
+        self._revision += 1
+        binaries = self.get_game_obj_binaries(written)
+        for obj_uuid in written:
+            self._object_revisions[obj_uuid] = self._revision
+            self._class_cache.pop(obj_uuid, None)
+            self.parsed_objects.pop(obj_uuid, None)
+            if self._index is not None:
+                if obj_uuid in binaries:
+                    self._index.update(obj_uuid, binaries[obj_uuid], self.save_context)
+                else:
+                    self._index.remove(obj_uuid)
+
+    def _commit_writes(self):
+        """Apply and commit the writes of an open batch, before the database is copied."""
+        self._flush_writes()
+        if self.connection.in_transaction:
+            self.connection.commit()
+
+    def _write_custom_value(self, key: str, value: bytes):
+        if self._batch_depth > 0:
+            # Only the last value of a custom key is written
+            self._pending_custom[key] = value
+            self._batch_custom_keys.add(key)
+        else:
+            with self.connection as conn:
+                conn.execute("UPDATE custom SET value = ? WHERE key = ?", (value, key))
+                conn.commit()
+
+    @property
+    def is_attached_to_source(self) -> bool:
+        """True while the connection still reads the original save file instead of a working copy."""
+        return self._source_path is not None
+
+    def _ensure_writable(self):
+        """Switch from the original save file to a private working copy before the first write.
+
+        Connections opened with read_only=True are left untouched, writes on them fail as before.
+        """
+        # From here on the database no longer matches the file the index is keyed on
+        self._has_writes = True
+        if self._source_path is None or self.read_only:
+            return
+
+        with self._db_lock:
+            if self._source_path is None:
+                return
+            temp_save_path = TEMP_FILES_DIR / (str(uuid.uuid4()) + ".ark")
+            ArkSaveLogger.save_log(f"First write to save, creating working copy at {temp_save_path}")
+            shutil.copyfile(self._source_path, temp_save_path)
+
+            self.connection.close()
+            self.connection = sqlite3.connect(f"file:{temp_save_path}?mode=rw", uri=True, check_same_thread=False)
+            self.sqlite_db = temp_save_path
+            self._source_path = None
+
+    def set_object_cache(self, cache: ParsedObjectCache):
+        """Replace the parsed object cache, e.g. with a budgeted ParsedObjectCache or a subclass with another eviction policy."""
+        cache.copy_pins_from(self.parsed_objects)
+        cache.update(self.parsed_objects)
+        self.parsed_objects = cache
+
     def set_max_workers(self, max_workers: int):
         """Set maximum workers for parallel parsing. Only applicable if GIL is disabled."""
         if not _PARALLEL_ENABLED:
@@ -91,6 +327,33 @@ class SaveConnection:
             return
         self._max_workers = max_workers
 
+    def use_process_pool(self, max_workers: Optional[int] = None, chunk_size: int = 256):
+        """Parse objects in a pool of worker processes, which also scales on regular (GIL) Python builds.
+
+        The save context is shipped to each worker once, workers parse chunks of chunk_size objects.
+        Pass max_workers=0 to go back to in-process parsing.
+        """
+        self._shutdown_process_pool()
+        self._process_workers = max_workers if max_workers is not None else (os.cpu_count() or 1)
+        self._process_chunk_size = max(1, chunk_size)
+
+    def _get_process_pool(self) -> ProcessPoolExecutor:
+        # Workers hold a copy of the name table, restart them when names were added since
+        if self._process_pool is not None and self._process_pool_name_count != len(self.save_context.names):
+            self._shutdown_process_pool()
+        if self._process_pool is None:
+            ArkSaveLogger.save_log(f"Starting process pool with {self._process_workers} workers")
+            self._process_pool = ProcessPoolExecutor(max_workers=self._process_workers,
+                                                     initializer=_process_parsing.init_worker,
+                                                     initargs=(self.save_context.worker_copy(),))
+            self._process_pool_name_count = len(self.save_context.names)
+        return self._process_pool
+
+    def _shutdown_process_pool(self):
+        if self._process_pool is not None:
+            self._process_pool.shutdown(wait=True, cancel_futures=True)
+            self._process_pool = None
+
     def __del__(self):
         self.close()
 
@@ -101,7 +364,19 @@ class SaveConnection:
             except PermissionError:
                 pass  # File still locked by SQLite, will be cleaned up later
 
+    @property
+    def is_in_memory(self) -> bool:
+        """True if the save was deserialized into an in-memory database instead of a temp file."""
+        return self._in_memory
+
     def get_bytes(self) -> Optional[bytes]:
+        self._commit_writes()
+        if self._in_memory:
+            with self._db_lock:
+                return self.connection.serialize()
+        if self._source_path is not None:
+            with open(self._source_path, 'rb') as file:
+                return file.read()
         if self.sqlite_db is not None and self.sqlite_db.exists():
             with open(self.sqlite_db, 'rb') as file:
                 return file.read()
@@ -163,7 +438,33 @@ class SaveConnection:
             self.save_context.actor_transform_positions = atp
         # print(f"Length of actor transforms: {len(self.save_context.actor_transforms)}")
 
+    def _get_index(self) -> Optional[SaveIndex]:
+        """Load the persistent index of this save, building it on first use.
+
+        Returns None when the index is disabled or the save was not opened from a path.
+        """
+        if self._index is not None or self._index_path is None:
+            return self._index
+
+        index = SaveIndex.load(self._index_path, self._index_key)
+        if index is None:
+            ArkSaveLogger.save_log("Building save index...")
+            self._flush_writes()
+            with self._db_lock:
+                cursor = self.connection.cursor()
+                cursor.execute("SELECT key, value FROM game")
+                index = SaveIndex.build(cursor, self.save_context, self._index_key)
+            if not self._has_writes:
+                try:
+                    index.store(self._index_path)
+                except OSError as e:
+                    ArkSaveLogger.warning_log(f"Could not store save index: {e}")
+        self._index = index
+        return index
+
     def close(self):
+        if getattr(self, "_process_pool", None) is not None:
+            self._shutdown_process_pool()
         if self.connection:
             self.connection.close()
             self.connection = None
@@ -171,8 +472,13 @@ class SaveConnection:
     def cache_all_classes(self):
         """Bulk pre-cache UUID -> class_name for all objects in DB.
         Call before parallel parsing to avoid SQLite lock contention."""
+        self._flush_writes()
         if self._class_cache:
             return
+        index = self._get_index()
+        if index is not None:
+            self._class_cache.update(index.classes())
+            return
         query = "SELECT key, value FROM game"
         with self._db_lock:
             cursor = self.connection.cursor()
@@ -190,30 +496,66 @@ class SaveConnection:
     def get_class_of_uuid(self, obj_uuid: uuid.UUID) -> Optional[str]:
         if obj_uuid in self._class_cache:
             return self._class_cache[obj_uuid]
+        if self._index is not None:
+            class_name = self._index.class_of(obj_uuid)
+            if class_name is not None:
+                self._class_cache[obj_uuid] = class_name
+                return class_name
         bin = self.get_game_obj_binary(obj_uuid)
         reader = ArkBinaryParser(bin, self.save_context)
         class_name, *_ = ArkGameObject.read_name(obj_uuid, reader)
         self._class_cache[obj_uuid] = class_name
         return class_name
 
+    def get_classes_of_uuids(self, obj_uuids: Collection[uuid.UUID]) -> Dict[uuid.UUID, str]:
+        """Class names of several objects, objects that are not in the database are left out.
+
+        Served from the class cache and the save index where possible, the rest is read with
+        chunked IN queries and only their name headers are parsed.
+        """
+        result: Dict[uuid.UUID, str] = {}
+        missing: List[uuid.UUID] = []
+        for obj_uuid in obj_uuids:
+            if obj_uuid in result:
+                continue
+            class_name = self._class_cache.get(obj_uuid)
+            if class_name is None and self._index is not None:
+                class_name = self._index.class_of(obj_uuid)
+                if class_name is not None:
+                    self._class_cache[obj_uuid] = class_name
+            if class_name is not None:
+                result[obj_uuid] = class_name
+            else:
+                missing.append(obj_uuid)
+
+        if missing:
+            for obj_uuid, binary in self.get_game_obj_binaries(missing).items():
+                reader = ArkBinaryParser(binary, self.save_context)
+                class_name, *_ = ArkGameObject.read_name(obj_uuid, reader)
+                self._class_cache[obj_uuid] = class_name
+                result[obj_uuid] = class_name
+        return result
+
     def list_all_items_in_db(self):
-        query = "SELECT key, value FROM game"
-        with self.connection as conn:
-            cursor = conn.execute(query)
-            name = cursor.description
-            rowCount = 0
-            for row in cursor:
-                rowCount += 1
-            ArkSaveLogger.save_log(f"Found {rowCount} items in game table")
+        ArkSaveLogger.save_log(f"Found {self.get_game_object_count()} items in game table")
 
         # get custom values
-        query = "SELECT key, value FROM custom"
+        query = "SELECT key FROM custom"
         with self.connection as conn:
             cursor = conn.execute(query)
             for row in cursor:
                 ArkSaveLogger.save_log(f"Custom key: {row[0]}")
 
+    def get_game_object_count(self) -> int:
+        self._flush_writes()
+        query = "SELECT COUNT(*) FROM game"
+        with self._db_lock:
+            cursor = self.connection.cursor()
+            cursor.execute(query)
+            return cursor.fetchone()[0]
+
     def add_name_to_name_table(self, name: str, id: Optional[int] = None):
+        self._ensure_writable()
         header_data = self.get_custom_value("SaveHeader")
         self.name_count += 1
         header_data.set_position(self.name_offset)
@@ -225,14 +567,12 @@ class SaveConnection:
         self.last_name_end = header_data.position
 
         # store new name table
-        query = "UPDATE custom SET value = ? WHERE key = 'SaveHeader'"
-        with self.connection as conn:
-            conn.execute(query, (header_data.byte_buffer,))
-            conn.commit()
+        self._write_custom_value("SaveHeader", header_data.byte_buffer)
 
         return new_id
 
     def find_value_in_game_table_objects(self, value: bytes):
+        self._flush_writes()
         query = "SELECT key, value FROM game"
         cursor = self.connection.cursor()
         cursor.execute(query)
@@ -248,6 +588,7 @@ class SaveConnection:
                     print(f"Object: {obj.blueprint} ({obj.uuid})")
 
     def find_value_in_custom_tables(self, value: bytes):
+        self._flush_writes()
         query = "SELECT key, value FROM custom"
         cursor = self.connection.cursor()
         cursor.execute(query)
@@ -259,6 +600,8 @@ class SaveConnection:
                 print(f"Found at {row[0]}, index: {r}")
 
     def replace_value_in_custom_tables(self, search: bytes, replace: bytes):
+        self._flush_writes()
+        self._ensure_writable()
         query = "SELECT key, value FROM custom"
         cursor = self.connection.cursor()
         cursor.execute(query)
@@ -277,12 +620,14 @@ class SaveConnection:
                     conn.commit()
 
     def get_obj_uuids(self) -> Collection[uuid.UUID]:
+        self._flush_writes()
         query = "SELECT key FROM game"
         cursor = self.connection.cursor()
         cursor.execute(query)
         return [SaveConnection.byte_array_to_uuid(row[0]) for row in cursor]
 
     def print_tables_and_sizes(self):
+        self._flush_writes()
         query = "SELECT name FROM sqlite_master WHERE type='table'"
         cursor = self.connection.cursor()
         cursor.execute(query)
@@ -294,6 +639,7 @@ class SaveConnection:
             print(f"Table {table_name} has {count} rows")
 
     def print_custom_table_sizes(self):
+        self._flush_writes()
         query = "SELECT key, LENGTH(value) FROM custom"
         cursor = self.connection.cursor()
         cursor.execute(query)
@@ -301,82 +647,195 @@ class SaveConnection:
             print(f"Key: {row[0]}, size: {row[1]}")
 
     def add_obj_to_db(self, obj_uuid: uuid.UUID, obj_data: bytes):
+        self._ensure_writable()
         query = "INSERT INTO game (key, value) VALUES (?, ?)"
-        with self.connection as conn:
-            conn.execute(query, (SaveConnection.uuid_to_byte_array(obj_uuid), obj_data))
-            conn.commit()
+        self._write(query, (SaveConnection.uuid_to_byte_array(obj_uuid), obj_data))
+        self._revision += 1
+        self._object_revisions[obj_uuid] = self._revision
 
-        self.get_game_object_by_id(obj_uuid, reparse=True)
+        if self._index is not None:
+            self._index.update(obj_uuid, obj_data, self.save_context)
+        self._object_written(obj_uuid, obj_data)
 
     def modify_game_obj(self, obj_uuid: uuid.UUID, obj_data: bytes):
+        self._ensure_writable()
         query = "UPDATE game SET value = ? WHERE key = ?"
-        with self.connection as conn:
-            conn.execute(query, (obj_data, SaveConnection.uuid_to_byte_array(obj_uuid)))
-            conn.commit()
+        self._write(query, (obj_data, SaveConnection.uuid_to_byte_array(obj_uuid)))
+        self._revision += 1
+        self._object_revisions[obj_uuid] = self._revision
+
+        if self._index is not None:
+            self._index.update(obj_uuid, obj_data, self.save_context)
+        self._object_written(obj_uuid, obj_data)
+
+    def patch_game_obj(self, obj_uuid: uuid.UUID, patches: Sequence[Tuple[int, bytes]], base_revision: Optional[int]) -> bool:
+        """Write fixed size changes straight into the stored binary of an object.
+
+        patches are (offset, bytes) pairs against the binary as stored at base_revision (see
+        object_revision and ByteOperator.patches). They are written with incremental blob I/O,
+        the rest of the row is neither read nor rewritten. The object is dropped from the object
+        cache and parsed again on its next access.
+
+        Returns False without writing anything when the object was written since base_revision,
+        is not in the database, or the patches don't fit it; the caller then has to write the
+        whole binary with modify_game_obj.
+        """
+        if base_revision is None or base_revision != self.object_revision(obj_uuid):
+            return False
+        if len(patches) == 0:
+            return True
+
+        if obj_uuid in self._pending_objects or not _BLOB_IO_SUPPORTED:
+            # Queued by a batch (or no blob I/O), patch the binary and queue it as a whole
+            obj_data = self._pending_objects.get(obj_uuid) if obj_uuid in self._pending_objects else self.get_game_obj_binary(obj_uuid)
+            if obj_data is None or any(offset + len(data) > len(obj_data) for offset, data in patches):
+                return False
+            patched = bytearray(obj_data)
+            for offset, data in patches:
+                patched[offset:offset + len(data)] = data
+            self.modify_game_obj(obj_uuid, bytes(patched))
+            return True
 
-        self.get_game_object_by_id(obj_uuid, reparse=True)
+        self._ensure_writable()
+        with self._db_lock:
+            cursor = self.connection.cursor()
+            cursor.execute("SELECT rowid, LENGTH(value) FROM game WHERE key = ?", (SaveConnection.uuid_to_byte_array(obj_uuid),))
+            row = cursor.fetchone()
+            if row is None or any(offset + len(data) > row[1] for offset, data in patches):
+                return False
+            if self._batch_depth > 0 and not self.connection.in_transaction:
+                # Blob writes don't open a transaction themselves, keep them in the batch's
+                self.connection.execute("BEGIN")
+            obj_data = None
+            with self.connection.blobopen("game", "value", row[0]) as blob:
+                for offset, data in patches:
+                    blob.seek(offset)
+                    blob.write(data)
+                if self._index is not None:
+                    blob.seek(0)
+                    obj_data = blob.read()
+            if self._batch_depth == 0 and self.connection.in_transaction:
+                self.connection.commit()
+        self._revision += 1
+        self._object_revisions[obj_uuid] = self._revision
+
+        # A patch can replace a name id, e.g. the class id (see ArkGameObject.change_class)
+        if self._index is not None:
+            self._index.update(obj_uuid, obj_data, self.save_context)
+        self._class_cache.pop(obj_uuid, None)
+        self.parsed_objects.pop(obj_uuid, None)
+        return True
+
+    def _object_written(self, obj_uuid: uuid.UUID, obj_data: bytes):
+        if self._batch_depth > 0:
+            # Reparsed on the next access instead of after every write
+            self._pending_objects[obj_uuid] = obj_data
+            self.parsed_objects.pop(obj_uuid, None)
+        else:
+            self.get_game_object_by_id(obj_uuid, reparse=True)
 
     def remove_obj_from_db(self, obj_uuid: uuid.UUID):
+        self._ensure_writable()
         try:
             query = "DELETE FROM game WHERE key = ?"
-            with self.connection as conn:
-                conn.execute(query, (SaveConnection.uuid_to_byte_array(obj_uuid),))
-                conn.commit()
+            self._write(query, (SaveConnection.uuid_to_byte_array(obj_uuid),))
+            if self._batch_depth > 0:
+                self._pending_objects[obj_uuid] = None
         except Exception as e:
             ArkSaveLogger.error_log(f"Error removing object {obj_uuid} from database: {e}")
+        self._revision += 1
+        self._object_revisions[obj_uuid] = self._revision
+
+        if self._index is not None:
+            self._index.remove(obj_uuid)
 
         if obj_uuid in self.parsed_objects:
             self.parsed_objects.pop(obj_uuid)
 
-    def add_actor_transform(self, uuid: uuid.UUID, binary_data: bytes, no_store: bool = False):
-        actor_transforms = self.get_custom_value("ActorTransforms")
+    def _get_actor_transform_blob(self) -> Optional[ActorTransformBlob]:
+        if self._actor_transform_blob is None:
+            actor_transforms = self.get_custom_value("ActorTransforms")
+            if actor_transforms:
+                self._actor_transform_blob = ActorTransformBlob(actor_transforms.byte_buffer, actor_transforms.get_position())
+        return self._actor_transform_blob
+
+    def _store_actor_transforms(self):
+        self._actor_transform_revision += 1
+        if self._batch_depth > 0:
+            # Written once, when the batch is flushed
+            self._actor_transforms_dirty = True
+            self._batch_custom_keys.add("ActorTransforms")
+        else:
+            self._write_custom_value("ActorTransforms", self._actor_transform_blob.to_bytes())
 
-        # print(f"Adding actor transform {uuid}")
+    def _set_context_actor_transform(self, uuid: uuid.UUID, binary_data: bytes, position: int):
+        """Apply a written transform to the transforms of the save context, so they don't have to be read again."""
+        if not self.save_context.actor_transforms_loaded:
+            # Read from the edited blob when first needed
+            return
+        transforms = self.save_context.actor_transforms
+        new_transform = ActorTransform(ArkBinaryParser(binary_data, self.save_context))
+        transform = transforms.get(uuid)
+        if transform is None:
+            transform = new_transform
+        else:
+            # Update the existing object, parsed objects may hold it as their location
+            transform.__dict__.update(new_transform.__dict__)
+        transforms[uuid] = transform
+        self.save_context.actor_transform_positions[uuid] = position
 
-        if actor_transforms:
-            actor_transforms.set_position(actor_transforms.size() - 16)
-            actor_transforms.insert_bytes(SaveConnection.uuid_to_byte_array(uuid))
-            actor_transforms.set_position(actor_transforms.size() - 16)
-            actor_transforms.insert_bytes(binary_data)
-            # print(f"New size: {actor_transforms.size()}")
+    def add_actor_transform(self, uuid: uuid.UUID, binary_data: bytes, no_store: bool = False):
+        self._ensure_writable()
+        actor_transforms = self._get_actor_transform_blob()
 
-            query = "UPDATE custom SET value = ? WHERE key = 'ActorTransforms'"
-            with self.connection as conn:
-                conn.execute(query, (actor_transforms.byte_buffer,))
-                conn.commit()
+        if actor_transforms is not None:
+            position = actor_transforms.set(uuid, binary_data)
+            self._set_context_actor_transform(uuid, binary_data, position)
+            self._store_actor_transforms()
 
     def add_actor_transforms(self, new_actor_transforms: bytes):
-        actor_transforms = self.get_custom_value("ActorTransforms")
-        if actor_transforms:
-            actor_transforms.set_position(actor_transforms.size() - 16)
-            actor_transforms.insert_bytes(new_actor_transforms)
-
-            query = "UPDATE custom SET value = ? WHERE key = 'ActorTransforms'"
-            with self.connection as conn:
-                conn.execute(query, (actor_transforms.byte_buffer,))
-                conn.commit()
+        """Add (or overwrite) the entries of a run of uuid + transform entries as stored in the blob."""
+        self._ensure_writable()
+        actor_transforms = self._get_actor_transform_blob()
+        if actor_transforms is not None:
+            entry_size = ACTOR_TRANSFORM_DTYPE.itemsize
+            for offset in range(0, len(new_actor_transforms) - entry_size + 1, entry_size):
+                uuid_ = _fast_uuid_from_bytes(new_actor_transforms[offset:offset + 16])
+                binary_data = new_actor_transforms[offset + 16:offset + entry_size]
+                position = actor_transforms.set(uuid_, binary_data)
+                self._set_context_actor_transform(uuid_, binary_data, position)
+            self._store_actor_transforms()
 
     def modify_actor_transform(self, uuid: uuid.UUID, binary_data: bytes):
-        actor_transforms = self.get_custom_value("ActorTransforms")
+        self._ensure_writable()
+        actor_transforms = self._get_actor_transform_blob()
 
-        if actor_transforms:
-            byte_sequence = SaveConnection.uuid_to_byte_array(uuid)
+        if actor_transforms is not None:
             ArkSaveLogger.save_log(f"Modifying actor transform for {uuid} ...")
-            positions = actor_transforms.find_byte_sequence(byte_sequence, adjust_offset=0)
-            ArkSaveLogger.save_log(f"Found positions: {positions}")
-            if len(positions) > 1:
-                ArkSaveLogger.warning_log(f"Multiple actor transforms found for {uuid}, modifying the first one.")
-            if len(positions) == 0:
+            if uuid not in actor_transforms:
                 ArkSaveLogger.error_log(f"No actor transform found for {uuid}, cannot modify.")
                 return
-            actor_transforms.set_position(positions[0])
-            actor_transforms.replace_bytes(byte_sequence + binary_data)
+            position = actor_transforms.set(uuid, binary_data)
+            self._set_context_actor_transform(uuid, binary_data, position)
+            self._store_actor_transforms()
 
-            query = "UPDATE custom SET value = ? WHERE key = 'ActorTransforms'"
-            with self.connection as conn:
-                conn.execute(query, (actor_transforms.byte_buffer,))
+    def remove_actor_transform(self, uuid: uuid.UUID):
+        self._ensure_writable()
+        actor_transforms = self._get_actor_transform_blob()
+
+        if actor_transforms is None or uuid not in actor_transforms:
+            ArkSaveLogger.error_log(f"No actor transform found for {uuid}, cannot remove.")
+            return
+        moved = actor_transforms.remove(uuid)
+        if self.save_context.actor_transforms_loaded:
+            self.save_context.actor_transforms.pop(uuid, None)
+            self.save_context.actor_transform_positions.pop(uuid, None)
+            if moved is not None:
+                self.save_context.actor_transform_positions[moved] = actor_transforms.position_of(moved)
+        self._store_actor_transforms()
 
     def store_db(self, path: Path):
+        self._commit_writes()
         path.parent.mkdir(parents=True, exist_ok=True)
         new_conn = sqlite3.connect(path)
         try:
@@ -387,6 +846,7 @@ class SaveConnection:
         print(f"Database successfully backed up to {path}")
 
     def get_save_binary_size(self) -> int:
+        self._flush_writes()
         query = "SELECT SUM(LENGTH(value)) FROM game"
         cursor = self.connection.cursor()
         cursor.execute(query)
@@ -396,6 +856,10 @@ class SaveConnection:
         return 0
 
     def get_all_present_classes(self):
+        self._flush_writes()
+        index = self._get_index()
+        if index is not None:
+            return index.present_classes()
         query = "SELECT value FROM game"
         classes = []
         with self.connection as conn:
@@ -411,6 +875,10 @@ class SaveConnection:
         return classes
 
     def get_custom_value(self, key: str) -> Optional['ArkBinaryParser']:
+        if key == "ActorTransforms" and self._actor_transforms_dirty:
+            return ArkBinaryParser(self._actor_transform_blob.to_bytes(), self.save_context)
+        if key in self._pending_custom:
+            return ArkBinaryParser(self._pending_custom[key], self.save_context)
         query = f"SELECT value FROM custom WHERE key = ? LIMIT 1"
         cursor = self.connection.cursor()
         cursor.execute(query, (key,))
@@ -420,6 +888,10 @@ class SaveConnection:
         return None
 
     def get_game_obj_binary(self, obj_uuid: uuid.UUID) -> Optional[bytes]:
+        if obj_uuid in self._pending_objects:
+            if self._pending_objects[obj_uuid] is None:
+                raise ValueError(f"Object with UUID {obj_uuid} not found in database")
+            return self._pending_objects[obj_uuid]
         query = "SELECT value FROM game WHERE key = ?"
         with self._db_lock:
             cursor = self.connection.cursor()
@@ -430,13 +902,38 @@ class SaveConnection:
 
         return row[0]
 
+    def get_game_obj_binaries(self, obj_uuids: Collection[uuid.UUID]) -> Dict[uuid.UUID, bytes]:
+        """Fetch the binaries of several objects with chunked IN queries, missing objects are left out."""
+        result = {}
+        if self._pending_objects:
+            for obj_uuid in obj_uuids:
+                if self._pending_objects.get(obj_uuid) is not None:
+                    result[obj_uuid] = self._pending_objects[obj_uuid]
+            obj_uuids = [obj_uuid for obj_uuid in obj_uuids if obj_uuid not in self._pending_objects]
+        keys = [SaveConnection.uuid_to_byte_array(obj_uuid) for obj_uuid in obj_uuids]
+        for start in range(0, len(keys), _SQL_IN_CHUNK_SIZE):
+            chunk = keys[start:start + _SQL_IN_CHUNK_SIZE]
+            query = f"SELECT key, value FROM game WHERE key IN ({','.join('?' * len(chunk))})"
+            with self._db_lock:
+                cursor = self.connection.cursor()
+                cursor.execute(query, chunk)
+                rows = cursor.fetchall()
+            for key_bytes, value_bytes in rows:
+                result[self.byte_array_to_uuid(key_bytes)] = value_bytes
+        return result
+
     def get_parser_for_game_object(self, obj_uuid: uuid.UUID) -> Optional[ArkBinaryParser]:
         binary = self.get_game_obj_binary(obj_uuid)
         if binary is None:
             return None
-        return ArkBinaryParser(binary, self.save_context)
+        parser = ArkBinaryParser(binary, self.save_context)
+        # The parser matches the stored binary, its fixed size edits can be written with patch_game_obj
+        parser.track_patches(self.object_revision(obj_uuid))
+        return parser
 
     def is_in_db(self, obj_uuid: uuid.UUID) -> bool:
+        if obj_uuid in self._pending_objects:
+            return self._pending_objects[obj_uuid] is not None
         # Check caches first to avoid SQLite lock contention
         if obj_uuid in self.parsed_objects:
             return True
@@ -450,8 +947,10 @@ class SaveConnection:
         return result
 
     def get_game_object_by_id(self, obj_uuid: uuid.UUID, reparse: bool = False) -> Optional['ArkGameObject']:
-        if obj_uuid in self.parsed_objects and not reparse:
-            return self.parsed_objects[obj_uuid]
+        if not reparse:
+            cached = self.parsed_objects.get(obj_uuid)
+            if cached is not None:
+                return cached
         bin = self.get_game_obj_binary(obj_uuid)
         reader = ArkBinaryParser(bin, self.save_context)
 
@@ -464,67 +963,262 @@ class SaveConnection:
 
         return obj
 
-    def get_game_objects(self, reader_config: GameObjectReaderConfiguration = GameObjectReaderConfiguration()) -> Dict[uuid.UUID, 'ArkGameObject']:
-        query = "SELECT key, value FROM game"
+    def get_game_objects_by_ids(self, obj_uuids: Collection[uuid.UUID], reparse: bool = False) -> Dict[uuid.UUID, 'ArkGameObject']:
+        """Parse several objects at once, objects that are not in the database are left out.
+
+        Cached objects are reused unless reparse is set, the others are read with chunked IN
+        queries and parsed like get_game_objects does (worker threads or processes when enabled).
+        """
         game_objects = {}
-        objects = []
-        prop_ids = []
+        to_fetch = []
+        for obj_uuid in dict.fromkeys(obj_uuids):
+            cached = None if reparse else self.parsed_objects.get(obj_uuid)
+            if cached is not None:
+                game_objects[obj_uuid] = cached
+            else:
+                to_fetch.append(obj_uuid)
+        if not to_fetch:
+            return game_objects
+
+        items_to_parse: List[Tuple[UUID, str, bytes]] = []
+        for obj_uuid, binary_data in self.get_game_obj_binaries(to_fetch).items():
+            class_name, *_ = ArkGameObject.read_name(obj_uuid, ArkBinaryParser(binary_data, self.save_context))
+            self._class_cache[obj_uuid] = class_name
+            items_to_parse.append((obj_uuid, class_name, binary_data))
+
+        self._parse_collected_objects(items_to_parse, game_objects)
+        self._report_faulty_objects()
+        return game_objects
 
+    def _get_property_patterns(self, reader_config: GameObjectReaderConfiguration) -> Tuple[List[int], List[bytes]]:
+        """Name ids of the configured property names, plus the byte patterns used to prefilter blobs on them."""
+        prop_name_ids = []
+        prop_ids = []
         for prop in reader_config.property_names:
             id_ = self.save_context.get_name_id(prop)
             if id_ is not None:
+                prop_name_ids.append(id_)
                 prop_ids.append(id_.to_bytes(4, byteorder="little") + b'\x00\x00\x00\x00')
+        return prop_name_ids, prop_ids
+
+    def _skip_failed_class(self, class_name: str) -> bool:
+        if SaveConnection.failed_parses.get(class_name, 0) >= 5:
+            if SaveConnection.failed_parses[class_name] == 5:
+                ArkSaveLogger.warning_log(f"Skipping parsing of class {class_name} due to previous errors")
+            SaveConnection.failed_parses[class_name] += 1
+            self.faulty_objects += 1
+            return True
+        return False
+
+    def _get_cached_match(self, obj_uuid: UUID, reader_config: GameObjectReaderConfiguration, prop_ids: List[bytes]) -> Optional[ArkGameObject]:
+        """Return the already parsed object if it has any of the configured properties."""
+        obj = self.parsed_objects[obj_uuid]
+        if len(prop_ids) == 0:
+            return obj
+        for prop in reader_config.property_names:
+            if obj.has_property(prop):
+                return obj
+        return None
+
+    def _report_faulty_objects(self):
+        if self.faulty_objects > 0:
+            ArkSaveLogger.set_log_level(ArkSaveLogger.LogTypes.ERROR, True)
+            ArkSaveLogger.error_log(f"{self.faulty_objects} objects could not be parsed, if possible, please report this to the developers.")
+            ArkSaveLogger.set_log_level(ArkSaveLogger.LogTypes.ERROR, False)
+
+    def get_game_objects(self, reader_config: GameObjectReaderConfiguration = GameObjectReaderConfiguration()) -> Dict[uuid.UUID, 'ArkGameObject']:
+        return self.get_game_objects_multi([reader_config])[0]
+
+    def get_game_objects_multi(self, reader_configs: Sequence[GameObjectReaderConfiguration], cache: bool = True) -> List[Dict[uuid.UUID, 'ArkGameObject']]:
+        """Run several reader configurations with a single scan of the game table.
+
+        Every blob is read and classified once against all configurations and parsed at most
+        once, the result holds the objects matching each configuration in the same order.
+        An object several configurations match is only partially decoded when all of them ask
+        for that (with the union of their decode_only names), and lazily decoded when all of
+        them are lazy. Newly parsed objects are only added to parsed_objects when cache is True.
+        """
+        self._flush_writes()
+        query = "SELECT key, value FROM game"
+        results: List[Dict[uuid.UUID, ArkGameObject]] = [{} for _ in reader_configs]
+        prop_ids = [self._get_property_patterns(config) for config in reader_configs]
 
         ArkSaveLogger.enter_struct("GameObjects")
 
         # Collect items from SQLite (single-threaded due to SQLite constraints)
         items_to_parse: List[Tuple[UUID, str, bytes]] = []
-        
-        with self.connection as conn:   
-            cursor = conn.execute(query)
-            for row in cursor:
-                obj_uuid = self.byte_array_to_uuid(row[0])
-                binary_data = row[1]
-                self.save_context.all_uuids.append(obj_uuid)
-                
-                if reader_config.uuid_filter and not reader_config.uuid_filter(obj_uuid):
+        # Indices of the configurations that each collected object is parsed for
+        targets: Dict[UUID, List[int]] = {}
+
+        def add_cached(obj_uuid: UUID, matched: List[int]):
+            for i in matched:
+                cached = self._get_cached_match(obj_uuid, reader_configs[i], prop_ids[i][1])
+                if cached is not None:
+                    results[i][obj_uuid] = cached
+
+        index = self._get_index()
+        if index is not None:
+            # Class names and property prefilter come from the index, only blobs that get parsed are read
+            self.save_context.all_uuids.extend(index.uuids())
+            classes: Dict[UUID, str] = {}
+            # Configurations each object matched, with whether its blob has their properties
+            selected: Dict[UUID, List[Tuple[int, bool]]] = {}
+            for i, config in enumerate(reader_configs):
+                for obj_uuid, class_name, found in index.select(config.uuid_filter, config.blueprint_name_filter, prop_ids[i][0]):
+                    selected.setdefault(obj_uuid, []).append((i, found))
+                    classes[obj_uuid] = class_name
+
+            for obj_uuid, matches in selected.items():
+                # Once per object however many configurations it matched, like the scan below
+                if self._skip_failed_class(classes[obj_uuid]):
                     continue
 
-                byte_buffer = ArkBinaryParser(binary_data, self.save_context)
-                class_name, *_ = ArkGameObject.read_name(obj_uuid, byte_buffer)
-
-                if reader_config.blueprint_name_filter and not reader_config.blueprint_name_filter(class_name):
+                if obj_uuid in self.parsed_objects:
+                    add_cached(obj_uuid, [i for i, _ in matches])
                     continue
 
-                if SaveConnection.failed_parses.get(class_name, 0) >= 5:
-                    if SaveConnection.failed_parses[class_name] == 5:
-                        ArkSaveLogger.warning_log(f"Skipping parsing of class {class_name} due to previous errors")
-                    SaveConnection.failed_parses[class_name] += 1
-                    self.faulty_objects += 1
-                    continue
+                matched = [i for i, found in matches if found]
+                if matched:
+                    targets[obj_uuid] = matched
 
-                if class_name not in objects:
-                    objects.append(class_name)
-                
-                if obj_uuid in self.parsed_objects:
-                    found = len(prop_ids) == 0
-                    for prop in reader_config.property_names:
-                        if self.parsed_objects[obj_uuid].has_property(prop):
-                            found = True
-                            break
-                    if found:
-                        game_objects[obj_uuid] = self.parsed_objects[obj_uuid]
-                    continue
-                
-                found = len(prop_ids) == 0 or contains_any_pattern(binary_data, prop_ids)
-                if found:
-                    items_to_parse.append((obj_uuid, class_name, binary_data))
+            binaries = self.get_game_obj_binaries(list(targets.keys()))
+            items_to_parse = [(obj_uuid, classes[obj_uuid], binaries[obj_uuid]) for obj_uuid in targets if obj_uuid in binaries]
+        else:
+            with self.connection as conn:
+                cursor = conn.execute(query)
+                for row in cursor:
+                    obj_uuid = self.byte_array_to_uuid(row[0])
+                    binary_data = row[1]
+                    self.save_context.all_uuids.append(obj_uuid)
+
+                    class_name = None
+                    matched = []
+                    for i, config in enumerate(reader_configs):
+                        if config.uuid_filter and not config.uuid_filter(obj_uuid):
+                            continue
+
+                        if class_name is None:
+                            byte_buffer = ArkBinaryParser(binary_data, self.save_context)
+                            class_name, *_ = ArkGameObject.read_name(obj_uuid, byte_buffer)
+
+                        if config.blueprint_name_filter and not config.blueprint_name_filter(class_name):
+                            continue
+                        matched.append(i)
+
+                    if not matched or self._skip_failed_class(class_name):
+                        continue
+
+                    if obj_uuid in self.parsed_objects:
+                        add_cached(obj_uuid, matched)
+                        continue
+
+                    matched = [i for i in matched if len(prop_ids[i][1]) == 0 or contains_any_pattern(binary_data, prop_ids[i][1])]
+                    if matched:
+                        items_to_parse.append((obj_uuid, class_name, binary_data))
+                        targets[obj_uuid] = matched
 
         ArkSaveLogger.exit_struct()
 
-        # Parse objects - parallel when GIL disabled, sequential otherwise
+        # Parse every object once, grouped by how much of it the configurations it matched need decoded
+        groups: Dict[Tuple[Optional[frozenset], bool], List[Tuple[UUID, str, bytes]]] = {}
+        for item in items_to_parse:
+            configs = [reader_configs[i] for i in targets[item[0]]]
+            decode_only = None
+            if all(config.decode_only is not None for config in configs):
+                decode_only = frozenset(name for config in configs for name in config.decode_only)
+            lazy = all(config.lazy_properties for config in configs)
+            groups.setdefault((decode_only, lazy), []).append(item)
+
+        game_objects: Dict[uuid.UUID, ArkGameObject] = {}
+        for (decode_only, lazy), items in groups.items():
+            self._parse_collected_objects(items, game_objects, cache, decode_only, lazy)
+
+        for obj_uuid, matched in targets.items():
+            obj = game_objects.get(obj_uuid)
+            if obj is not None:
+                for i in matched:
+                    results[i][obj_uuid] = obj
+
+        self._report_faulty_objects()
+        return results
+
+    def iter_game_objects(self, reader_config: GameObjectReaderConfiguration = GameObjectReaderConfiguration(),
+                          batch_size: int = 1000, cache: bool = False) -> Iterator[Tuple[uuid.UUID, 'ArkGameObject']]:
+        """Stream (uuid, object) pairs matching reader_config, reading and parsing batch_size rows at a time.
+
+        Unlike get_game_objects, no more than one batch of blobs and parsed objects is held at once.
+        Parsed objects are only added to parsed_objects when cache is True.
+        """
+        self._flush_writes()
+        prop_name_ids, prop_ids = self._get_property_patterns(reader_config)
+        index = self._get_index()
+
+        if index is not None:
+            candidates = [(obj_uuid, class_name) for obj_uuid, class_name, found
+                          in index.select(reader_config.uuid_filter, reader_config.blueprint_name_filter, prop_name_ids)
+                          if found or obj_uuid in self.parsed_objects]
+            for start in range(0, len(candidates), batch_size):
+                batch = candidates[start:start + batch_size]
+                game_objects = {}
+                to_fetch = []
+                for obj_uuid, class_name in batch:
+                    if self._skip_failed_class(class_name):
+                        continue
+                    if obj_uuid in self.parsed_objects:
+                        cached = self._get_cached_match(obj_uuid, reader_config, prop_ids)
+                        if cached is not None:
+                            game_objects[obj_uuid] = cached
+                        continue
+                    to_fetch.append((obj_uuid, class_name))
+                binaries = self.get_game_obj_binaries([obj_uuid for obj_uuid, _ in to_fetch])
+                items_to_parse = [(obj_uuid, class_name, binaries[obj_uuid]) for obj_uuid, class_name in to_fetch if obj_uuid in binaries]
+                yield from self._parse_collected_objects(items_to_parse, game_objects, cache, reader_config.decode_only, reader_config.lazy_properties).items()
+        else:
+            cursor = self.connection.cursor()
+            with self._db_lock:
+                cursor.execute("SELECT key, value FROM game")
+            try:
+                while True:
+                    with self._db_lock:
+                        rows = cursor.fetchmany(batch_size)
+                    if not rows:
+                        break
+
+                    game_objects = {}
+                    items_to_parse = []
+                    for key_bytes, binary_data in rows:
+                        obj_uuid = self.byte_array_to_uuid(key_bytes)
+                        if reader_config.uuid_filter and not reader_config.uuid_filter(obj_uuid):
+                            continue
+
+                        class_name, *_ = ArkGameObject.read_name(obj_uuid, ArkBinaryParser(binary_data, self.save_context))
+                        if reader_config.blueprint_name_filter and not reader_config.blueprint_name_filter(class_name):
+                            continue
+                        if self._skip_failed_class(class_name):
+                            continue
+
+                        if obj_uuid in self.parsed_objects:
+                            cached = self._get_cached_match(obj_uuid, reader_config, prop_ids)
+                            if cached is not None:
+                                game_objects[obj_uuid] = cached
+                            continue
+
+                        if len(prop_ids) == 0 or contains_any_pattern(binary_data, prop_ids):
+                            items_to_parse.append((obj_uuid, class_name, binary_data))
+
+                    yield from self._parse_collected_objects(items_to_parse, game_objects, cache, reader_config.decode_only, reader_config.lazy_properties).items()
+            finally:
+                cursor.close()
+
+        self._report_faulty_objects()
+
+    def _parse_collected_objects(self, items_to_parse: List[Tuple[UUID, str, bytes]], game_objects: Dict[uuid.UUID, 'ArkGameObject'], cache: bool = True, decode_only: Optional[Collection[str]] = None, lazy: bool = False) -> Dict[uuid.UUID, 'ArkGameObject']:
+        # Parse objects - in worker processes when enabled, parallel when GIL disabled, sequential otherwise
+        # Lazily parsed objects only read their header, which is not worth sending to worker processes
         if items_to_parse:
-            if _PARALLEL_ENABLED and self._max_workers > 1:
+            if self._process_workers > 0 and not lazy and len(items_to_parse) > self._process_chunk_size:
+                self._parse_in_process_pool(items_to_parse, game_objects, cache, decode_only)
+            elif _PARALLEL_ENABLED and self._max_workers > 1:
                 # Parallel parsing with _max_workers (optimal for free-threaded Python)
                 ArkSaveLogger.save_log(f"Parsing {len(items_to_parse)} objects with {self._max_workers} workers...")
                 ctx = self.save_context
@@ -536,7 +1230,7 @@ class SaveConnection:
                         mark_as_worker_thread()
                         _worker_initialized.done = True
                     obj_uuid, class_name, binary_data = item
-                    obj = _parse_single_object(obj_uuid, class_name, binary_data, ctx)
+                    obj = _parse_single_object(obj_uuid, class_name, binary_data, ctx, decode_only, lazy)
                     return obj_uuid, obj
                 
                 with ThreadPoolExecutor(max_workers=self._max_workers) as executor:
@@ -545,7 +1239,8 @@ class SaveConnection:
                 for obj_uuid, obj in results:
                     if obj:
                         game_objects[obj_uuid] = obj
-                        self.parsed_objects[obj_uuid] = obj
+                        if cache:
+                            self.parsed_objects[obj_uuid] = obj
                         self.nr_parsed += 1
                     else:
                         self.faulty_objects += 1
@@ -553,24 +1248,44 @@ class SaveConnection:
                 # Sequential parsing (GIL enabled)
                 for obj_uuid, class_name, binary_data in items_to_parse:
                     byte_buffer = ArkBinaryParser(binary_data, self.save_context)
-                    ark_game_object = self.parse_as_predefined_object(obj_uuid, class_name, byte_buffer)
+                    ark_game_object = self.parse_as_predefined_object(obj_uuid, class_name, byte_buffer, decode_only, lazy)
                     
                     if ark_game_object:
                         game_objects[obj_uuid] = ark_game_object
-                        self.parsed_objects[obj_uuid] = ark_game_object
+                        if cache:
+                            self.parsed_objects[obj_uuid] = ark_game_object
                         self.nr_parsed += 1
                         if self.nr_parsed % 25000 == 0:
                             ArkSaveLogger.save_log(f"Nr parsed: {self.nr_parsed}")
                     else:
                         self.faulty_objects += 1
         
-        if self.faulty_objects > 0:
-            ArkSaveLogger.set_log_level(ArkSaveLogger.LogTypes.ERROR, True)
-            ArkSaveLogger.error_log(f"{self.faulty_objects} objects could not be parsed, if possible, please report this to the developers.")
-            ArkSaveLogger.set_log_level(ArkSaveLogger.LogTypes.ERROR, False)
-        
         return game_objects
 
+    def _parse_in_process_pool(self, items_to_parse: List[Tuple[UUID, str, bytes]], game_objects: Dict[uuid.UUID, 'ArkGameObject'], cache: bool, decode_only: Optional[Collection[str]] = None):
+        ArkSaveLogger.save_log(f"Parsing {len(items_to_parse)} objects with {self._process_workers} worker processes...")
+        pool = self._get_process_pool()
+        size = self._process_chunk_size
+        chunks = [items_to_parse[i:i + size] for i in range(0, len(items_to_parse), size)]
+
+        for chunk, results in zip(chunks, pool.map(partial(_process_parsing.parse_chunk, decode_only=decode_only), chunks)):
+            for (obj_uuid, class_name, binary_data), (_, obj) in zip(chunk, results):
+                if obj is None:
+                    # Reparse failures in-process so they are logged and counted like before
+                    obj = self.parse_as_predefined_object(obj_uuid, class_name, ArkBinaryParser(binary_data, self.save_context), decode_only)
+                else:
+                    obj.location = self.save_context.get_actor_transform(obj_uuid) or None
+                    if obj.partially_decoded:
+                        obj._source = ArkBinaryParser(binary_data, self.save_context)
+
+                if obj:
+                    game_objects[obj_uuid] = obj
+                    if cache:
+                        self.parsed_objects[obj_uuid] = obj
+                    self.nr_parsed += 1
+                else:
+                    self.faulty_objects += 1
+
     def reset_caching(self):
         self.parsed_objects.clear()
 
@@ -597,9 +1312,9 @@ class SaveConnection:
         return obj_uuid.bytes
 
     @staticmethod
-    def parse_as_predefined_object(obj_uuid, class_name, byte_buffer: ArkBinaryParser):
+    def parse_as_predefined_object(obj_uuid, class_name, byte_buffer: ArkBinaryParser, decode_only: Optional[Collection[str]] = None, lazy: bool = False):
         try:
-            return ArkGameObject(obj_uuid, class_name, byte_buffer)
+            return ArkGameObject(obj_uuid, class_name, byte_buffer, decode_only=decode_only, lazy=lazy)
         except Exception as e:
             reraise = False
             if "/Game/" in class_name or "/Script/" in class_name:
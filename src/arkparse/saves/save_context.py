@@ -1,8 +1,9 @@
-from typing import Dict, List, Optional, TYPE_CHECKING
+from typing import Callable, Dict, List, MutableMapping, Optional, Tuple, TYPE_CHECKING
 import uuid
 from pathlib import Path
 import random
 import json
+import threading
 
 from arkparse.parsing.struct import ActorTransform
 from .header_location import HeaderLocation
@@ -14,8 +15,8 @@ class SaveContext:
         self.constant_name_table: Optional[Dict[int, str]] = None
         self.some_other_table: Optional[Dict[int, str]] = None
         self.sections: List[HeaderLocation] = []
-        self.actor_transforms: Dict[uuid.UUID, ActorTransform] = {}
-        self.actor_transform_positions: Dict[uuid.UUID, int] = {}
+        self._actor_transforms: MutableMapping[uuid.UUID, ActorTransform] = {}
+        self._actor_transform_positions: MutableMapping[uuid.UUID, int] = {}
         self.save_version: int = 0
         self.game_time: float = 0.0
         self.map_name: str = ""
@@ -24,10 +25,118 @@ class SaveContext:
         self.all_uuids: List[uuid.UUID] = []
         self.generate_unknown: bool = False
         self._has_name_table: bool = False  # Cached flag for fast lookup
-        self.current_time = 0
-        self.current_day = 0
+        self._current_time = 0
+        self._current_day = 0
+
+        # Optional loaders for lazily initialized saves, each runs once on first access
+        self._actor_transform_loader: Optional[Callable[[], Tuple[MutableMapping[uuid.UUID, ActorTransform], MutableMapping[uuid.UUID, int]]]] = None
+        self._game_time_loader: Optional[Callable[[], Tuple[float, int]]] = None
+        self._actor_transform_lock = threading.Lock()
+        self._game_time_lock = threading.Lock()
+
+    def set_actor_transform_loader(self, loader: Callable[[], Tuple[MutableMapping[uuid.UUID, ActorTransform], MutableMapping[uuid.UUID, int]]]):
+        self._actor_transform_loader = loader
+
+    def set_game_time_loader(self, loader: Callable[[], Tuple[float, int]]):
+        self._game_time_loader = loader
+
+    def _load_actor_transforms(self):
+        if self._actor_transform_loader is None:
+            return
+        with self._actor_transform_lock:
+            loader = self._actor_transform_loader
+            if loader is not None:
+                self._actor_transforms, self._actor_transform_positions = loader()
+                self._actor_transform_loader = None
+
+    def _load_game_time(self):
+        if self._game_time_loader is None:
+            return
+        with self._game_time_lock:
+            loader = self._game_time_loader
+            if loader is not None:
+                self._current_time, self._current_day = loader()
+                self._game_time_loader = None
+
+    @property
+    def actor_transforms(self) -> MutableMapping[uuid.UUID, ActorTransform]:
+        self._load_actor_transforms()
+        return self._actor_transforms
+
+    @actor_transforms.setter
+    def actor_transforms(self, value: MutableMapping[uuid.UUID, ActorTransform]):
+        self._actor_transform_loader = None
+        self._actor_transforms = value
+
+    @property
+    def actor_transforms_loaded(self) -> bool:
+        """Whether the actor transforms were read, they are read on first access when loaded lazily."""
+        return self._actor_transform_loader is None
+
+    @property
+    def actor_transform_positions(self) -> MutableMapping[uuid.UUID, int]:
+        self._load_actor_transforms()
+        return self._actor_transform_positions
+
+    @actor_transform_positions.setter
+    def actor_transform_positions(self, value: MutableMapping[uuid.UUID, int]):
+        self._actor_transform_loader = None
+        self._actor_transform_positions = value
+
+    @property
+    def current_time(self) -> float:
+        self._load_game_time()
+        return self._current_time
+
+    @current_time.setter
+    def current_time(self, value: float):
+        self._game_time_loader = None
+        self._current_time = value
+
+    @property
+    def current_day(self) -> int:
+        self._load_game_time()
+        return self._current_day
+
+    @current_day.setter
+    def current_day(self, value: int):
+        self._game_time_loader = None
+        self._current_day = value
+
+    def worker_copy(self) -> "SaveContext":
+        """Picklable copy with everything needed to parse object blobs, for process pool workers.
+
+        Actor transforms are left out, locations are attached again when results come back.
+        """
+        ctx = SaveContext()
+        ctx.names = dict(self.names)
+        ctx.constant_name_table = self.constant_name_table
+        ctx.some_other_table = self.some_other_table
+        ctx.sections = self.sections
+        ctx.save_version = self.save_version
+        ctx.game_time = self.game_time
+        ctx.map_name = self.map_name
+        ctx.unknown_value = self.unknown_value
+        ctx.generate_unknown = self.generate_unknown
+        ctx._has_name_table = self._has_name_table
+        return ctx
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        # Locks and loaders (bound to the owning save) can't cross process boundaries
+        for key in ("_actor_transform_lock", "_game_time_lock", "_actor_transform_loader", "_game_time_loader"):
+            state.pop(key, None)
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._actor_transform_loader = None
+        self._game_time_loader = None
+        self._actor_transform_lock = threading.Lock()
+        self._game_time_lock = threading.Lock()
 
     def get_actor_transform(self, uuid_: uuid.UUID) -> Optional[ActorTransform]:
+        # With an ActorTransformTable the ActorTransform is only created here, on first lookup
         return self.actor_transforms.get(uuid_)
 
     def has_name_table(self) -> bool:
@@ -0,0 +1,271 @@
+import hashlib
+import os
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+from uuid import UUID, SafeUUID
+
+import numpy as np
+
+from arkparse.logging import ArkSaveLogger
+from arkparse.object_model.ark_game_object import ArkGameObject
+from arkparse.parsing import ArkBinaryParser
+from arkparse.saves.save_context import SaveContext
+from arkparse.utils.tm_files import INDEX_FILE_DIR
+
+
+def _fast_uuid_from_bytes(b: bytes) -> UUID:
+    u = object.__new__(UUID)
+    object.__setattr__(u, 'int', int.from_bytes(b, 'big'))
+    object.__setattr__(u, 'is_safe', SafeUUID.unknown)
+    return u
+
+
+def _referenced_name_ids(blobs: List[bytes], known_ids: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Find the name ids referenced by each blob, as (offsets, ids) with ids[offsets[i]:offsets[i + 1]] for blob i.
+
+    A name id counts as referenced when it is followed by 4 zero bytes, which is exactly
+    the pattern the property_names prefilter of get_game_objects searches for.
+    """
+    lengths = np.fromiter((len(b) for b in blobs), dtype=np.int64, count=len(blobs))
+    starts = np.zeros(len(blobs), dtype=np.int64)
+    np.cumsum(lengths[:-1], out=starts[1:])
+    ends = starts + lengths
+    buffer = b"".join(blobs)
+
+    found_blobs = []
+    found_ids = []
+    for shift in range(4):
+        count = (len(buffer) - shift) // 4
+        if count < 2:
+            continue
+        words = np.frombuffer(buffer, dtype="<u4", count=count, offset=shift)
+        candidates = np.flatnonzero(words[1:] == 0)
+        candidates = candidates[np.isin(words[candidates], known_ids)]
+        positions = shift + 4 * candidates.astype(np.int64)
+        owner = np.searchsorted(starts, positions, side="right") - 1
+        # the 8 byte pattern may not cross the boundary between two blobs
+        valid = positions + 8 <= ends[owner]
+        found_blobs.append(owner[valid])
+        found_ids.append(words[candidates[valid]])
+
+    if found_blobs:
+        combined = np.unique((np.concatenate(found_blobs).astype(np.uint64) << np.uint64(32)) | np.concatenate(found_ids).astype(np.uint64))
+    else:
+        combined = np.zeros(0, dtype=np.uint64)
+    ids = (combined & np.uint64(0xFFFFFFFF)).astype(np.uint32)
+    counts = np.bincount((combined >> np.uint64(32)).astype(np.int64), minlength=len(blobs))
+    offsets = np.zeros(len(blobs) + 1, dtype=np.int64)
+    np.cumsum(counts, out=offsets[1:])
+    return offsets, ids
+
+
+class SaveIndex:
+    """Persistent index of the game table: class name, blob length and referenced name ids per object.
+
+    The index is stored as a sidecar file in INDEX_FILE_DIR and is only reused when the
+    save file size, modification time and header hash still match the ones it was built for.
+    Changes made to the save during a session are tracked in memory and never written back.
+    """
+
+    VERSION = 1
+    BUILD_BATCH_SIZE = 2000
+
+    def __init__(self, key: str, uuid_bytes: bytes, class_names: List[str], class_indices: np.ndarray,
+                 lengths: np.ndarray, ref_offsets: np.ndarray, ref_ids: np.ndarray):
+        self.key = key
+        self._uuid_bytes = uuid_bytes
+        self._class_names = class_names
+        self._class_indices = class_indices
+        self._lengths = lengths
+        self._ref_offsets = ref_offsets
+        self._ref_ids = ref_ids
+
+        self._uuids: Optional[List[UUID]] = None
+        self._rows: Optional[Dict[UUID, int]] = None
+        self._ref_rows: Optional[np.ndarray] = None
+        self._valid = np.ones(len(lengths), dtype=bool)
+        # objects added or modified this session, None for removed objects
+        self._overrides: Dict[UUID, Optional[Tuple[str, int, frozenset]]] = {}
+
+    def __len__(self) -> int:
+        return int(self._valid.sum()) + sum(1 for v in self._overrides.values() if v is not None)
+
+    @staticmethod
+    def compute_key(save_path: Path, header: bytes) -> str:
+        stat = Path(save_path).stat()
+        return f"{stat.st_size}-{stat.st_mtime_ns}-{hashlib.sha1(header).hexdigest()}"
+
+    @staticmethod
+    def default_path(save_path: Path) -> Path:
+        path_hash = hashlib.sha1(str(Path(save_path).resolve()).encode("utf-8")).hexdigest()[:16]
+        return INDEX_FILE_DIR / f"{Path(save_path).stem}_{path_hash}.npz"
+
+    @classmethod
+    def load(cls, path: Path, key: str) -> Optional["SaveIndex"]:
+        if not path.exists():
+            return None
+        try:
+            with np.load(path, allow_pickle=False) as data:
+                if int(data["version"]) != cls.VERSION or str(data["key"]) != key:
+                    ArkSaveLogger.save_log(f"Save index at {path} is outdated")
+                    return None
+                return cls(key, data["uuids"].tobytes(), data["class_names"].tolist(), data["class_indices"],
+                           data["lengths"], data["ref_offsets"], data["ref_ids"])
+        except Exception as e:
+            ArkSaveLogger.warning_log(f"Could not read save index at {path}: {e}")
+            return None
+
+    def store(self, path: Path):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = path.with_suffix(".tmp.npz")
+        np.savez(temp_path, version=np.int64(self.VERSION), key=np.str_(self.key),
+                 uuids=np.frombuffer(self._uuid_bytes, dtype=np.uint8),
+                 class_names=np.array(self._class_names, dtype=np.str_), class_indices=self._class_indices,
+                 lengths=self._lengths, ref_offsets=self._ref_offsets, ref_ids=self._ref_ids)
+        os.replace(temp_path, path)
+        ArkSaveLogger.save_log(f"Save index stored at {path}")
+
+    @classmethod
+    def build(cls, rows: Iterable[Tuple[bytes, bytes]], save_context: SaveContext, key: str) -> "SaveIndex":
+        """Build the index from (key, value) rows of the game table."""
+        known_ids = np.array(sorted(save_context.names.keys()), dtype=np.uint32)
+        class_lookup: Dict[str, int] = {}
+        uuid_parts: List[bytes] = []
+        class_indices: List[int] = []
+        lengths: List[int] = []
+        ref_counts: List[np.ndarray] = []
+        ref_ids: List[np.ndarray] = []
+
+        def flush(blobs: List[bytes]):
+            offsets, ids = _referenced_name_ids(blobs, known_ids)
+            ref_counts.append(np.diff(offsets))
+            ref_ids.append(ids)
+            blobs.clear()
+
+        batch: List[bytes] = []
+        for key_bytes, value_bytes in rows:
+            class_name, *_ = ArkGameObject.read_name(None, ArkBinaryParser(value_bytes, save_context))
+            uuid_parts.append(key_bytes)
+            class_indices.append(class_lookup.setdefault(class_name, len(class_lookup)))
+            lengths.append(len(value_bytes))
+            batch.append(value_bytes)
+            if len(batch) >= cls.BUILD_BATCH_SIZE:
+                flush(batch)
+        if batch:
+            flush(batch)
+
+        counts = np.concatenate(ref_counts) if ref_counts else np.zeros(0, dtype=np.int64)
+        offsets = np.zeros(len(lengths) + 1, dtype=np.int64)
+        np.cumsum(counts, out=offsets[1:])
+
+        ArkSaveLogger.save_log(f"Built save index for {len(lengths)} objects")
+        return cls(key, b"".join(uuid_parts), list(class_lookup.keys()), np.array(class_indices, dtype=np.int32),
+                   np.array(lengths, dtype=np.int64), offsets,
+                   np.concatenate(ref_ids) if ref_ids else np.zeros(0, dtype=np.uint32))
+
+    def _get_uuids(self) -> List[UUID]:
+        if self._uuids is None:
+            raw = self._uuid_bytes
+            self._uuids = [_fast_uuid_from_bytes(raw[i:i + 16]) for i in range(0, len(raw), 16)]
+        return self._uuids
+
+    def _get_rows(self) -> Dict[UUID, int]:
+        if self._rows is None:
+            self._rows = {obj_uuid: row for row, obj_uuid in enumerate(self._get_uuids())}
+        return self._rows
+
+    def _rows_referencing(self, name_ids: List[int]) -> np.ndarray:
+        """Boolean mask of the indexed rows that reference any of the given name ids."""
+        mask = np.zeros(len(self._lengths), dtype=bool)
+        if not name_ids:
+            return mask
+        if self._ref_rows is None:
+            self._ref_rows = np.repeat(np.arange(len(self._lengths)), np.diff(self._ref_offsets))
+        mask[self._ref_rows[np.isin(self._ref_ids, np.array(name_ids, dtype=np.uint32))]] = True
+        return mask
+
+    def update(self, obj_uuid: UUID, binary_data: bytes, save_context: SaveContext):
+        """Record an object that was added or modified after the index was built."""
+        class_name, *_ = ArkGameObject.read_name(obj_uuid, ArkBinaryParser(binary_data, save_context))
+        known_ids = np.array(sorted(save_context.names.keys()), dtype=np.uint32)
+        _, ids = _referenced_name_ids([binary_data], known_ids)
+        self._invalidate_row(obj_uuid)
+        self._overrides[obj_uuid] = (class_name, len(binary_data), frozenset(ids.tolist()))
+
+    def remove(self, obj_uuid: UUID):
+        self._invalidate_row(obj_uuid)
+        self._overrides[obj_uuid] = None
+
+    def _invalidate_row(self, obj_uuid: UUID):
+        row = self._get_rows().get(obj_uuid)
+        if row is not None:
+            self._valid[row] = False
+
+    def class_of(self, obj_uuid: UUID) -> Optional[str]:
+        if obj_uuid in self._overrides:
+            entry = self._overrides[obj_uuid]
+            return entry[0] if entry is not None else None
+        row = self._get_rows().get(obj_uuid)
+        if row is None:
+            return None
+        return self._class_names[self._class_indices[row]]
+
+    def uuids(self) -> List[UUID]:
+        all_uuids = self._get_uuids()
+        result = [all_uuids[row] for row in np.flatnonzero(self._valid).tolist()]
+        result.extend(obj_uuid for obj_uuid, entry in self._overrides.items() if entry is not None)
+        return result
+
+    def classes(self) -> Dict[UUID, str]:
+        uuids = self._get_uuids()
+        names = self._class_names
+        result = {uuids[row]: names[idx] for row, idx in enumerate(self._class_indices.tolist()) if self._valid[row]}
+        for obj_uuid, entry in self._overrides.items():
+            if entry is not None:
+                result[obj_uuid] = entry[0]
+        return result
+
+    def present_classes(self) -> List[str]:
+        """All class names in the save, in order of first appearance."""
+        seen = np.unique(self._class_indices[self._valid])
+        classes = [self._class_names[idx] for idx in sorted(seen.tolist())]
+        for entry in self._overrides.values():
+            if entry is not None and entry[0] not in classes:
+                classes.append(entry[0])
+        return classes
+
+    def select(self, uuid_filter: Optional[Callable[[UUID], bool]] = None,
+               blueprint_name_filter: Optional[Callable[[str], bool]] = None,
+               name_ids: Optional[List[int]] = None) -> List[Tuple[UUID, str, bool]]:
+        """Return (uuid, class name, references any of name_ids) for each object passing the filters.
+
+        The blueprint filter is evaluated once per distinct class name instead of once per object.
+        When no name ids are given, every object is reported as matching.
+        """
+        mask = self._valid.copy()
+        if blueprint_name_filter:
+            allowed = np.array([bool(blueprint_name_filter(name)) for name in self._class_names], dtype=bool)
+            if len(allowed):
+                mask &= allowed[self._class_indices]
+        matches = self._rows_referencing(name_ids) if name_ids else np.ones(len(self._lengths), dtype=bool)
+
+        uuids = self._get_uuids()
+        names = self._class_names
+        result = []
+        for row in np.flatnonzero(mask).tolist():
+            obj_uuid = uuids[row]
+            if uuid_filter and not uuid_filter(obj_uuid):
+                continue
+            result.append((obj_uuid, names[self._class_indices[row]], bool(matches[row])))
+
+        wanted = frozenset(name_ids) if name_ids else None
+        for obj_uuid, entry in self._overrides.items():
+            if entry is None:
+                continue
+            class_name, _, ids = entry
+            if uuid_filter and not uuid_filter(obj_uuid):
+                continue
+            if blueprint_name_filter and not blueprint_name_filter(class_name):
+                continue
+            result.append((obj_uuid, class_name, wanted is None or not wanted.isdisjoint(ids)))
+        return result
@@ -0,0 +1,145 @@
+from typing import List, Mapping, Optional
+from uuid import UUID
+
+import numpy as np
+
+from arkparse.enums.ark_map import ArkMap
+from arkparse.parsing._base_value_parser import _fast_uuid_from_bytes
+from arkparse.parsing.struct.actor_transform import ActorTransform, MapCoords, MapCoordinateParameters
+from arkparse.parsing.struct.actor_transform_table import ActorTransformTable
+
+
+class SpatialIndex:
+    """Uniform grid over the x/y coordinates of the actor transforms, for location queries without parsing objects.
+
+    Points are bucketed into square cells of cell_size units and stored sorted by cell, so a
+    query only looks at the points in the cells overlapping its bounding box. Radius and nearest
+    neighbour queries use the 2D distance, or the 3D distance when a z coordinate is given.
+    The index is a snapshot: it does not follow transforms changed after it was built.
+    """
+
+    DEFAULT_CELL_SIZE = 5000.0
+
+    def __init__(self, uuid_bytes: bytes, xs: np.ndarray, ys: np.ndarray, zs: np.ndarray, cell_size: float = DEFAULT_CELL_SIZE):
+        self._uuid_bytes = uuid_bytes
+        self.xs = np.asarray(xs, dtype=np.float64)
+        self.ys = np.asarray(ys, dtype=np.float64)
+        self.zs = np.asarray(zs, dtype=np.float64)
+        self.cell_size = float(cell_size)
+
+        if len(self.xs):
+            self._min_x = float(self.xs.min())
+            self._min_y = float(self.ys.min())
+            self._cols = int((self.xs.max() - self._min_x) // self.cell_size) + 1
+            self._rows = int((self.ys.max() - self._min_y) // self.cell_size) + 1
+        else:
+            self._min_x = self._min_y = 0.0
+            self._cols = self._rows = 1
+        cells = self._cell_y(self.ys) * self._cols + self._cell_x(self.xs)
+        self._order = np.argsort(cells, kind="stable")
+        self._sorted_cells = cells[self._order]
+
+    @classmethod
+    def from_actor_transforms(cls, transforms: Mapping[UUID, ActorTransform], cell_size: float = DEFAULT_CELL_SIZE) -> "SpatialIndex":
+        if isinstance(transforms, ActorTransformTable):
+            return cls(*transforms.columns(), cell_size=cell_size)
+        items = list(transforms.items())
+        return cls(b"".join(uuid_.bytes for uuid_, _ in items),
+                   np.array([t.x for _, t in items], dtype=np.float64),
+                   np.array([t.y for _, t in items], dtype=np.float64),
+                   np.array([t.z for _, t in items], dtype=np.float64),
+                   cell_size=cell_size)
+
+    def __len__(self) -> int:
+        return len(self.xs)
+
+    def _cell_x(self, xs) -> np.ndarray:
+        return np.clip(((np.asarray(xs) - self._min_x) // self.cell_size).astype(np.int64), 0, self._cols - 1)
+
+    def _cell_y(self, ys) -> np.ndarray:
+        return np.clip(((np.asarray(ys) - self._min_y) // self.cell_size).astype(np.int64), 0, self._rows - 1)
+
+    def uuid_at(self, row: int) -> UUID:
+        return _fast_uuid_from_bytes(self._uuid_bytes[row * 16:row * 16 + 16])
+
+    def _uuids(self, rows: np.ndarray) -> List[UUID]:
+        return [self.uuid_at(row) for row in rows.tolist()]
+
+    def _candidate_rows(self, min_x: float, min_y: float, max_x: float, max_y: float) -> np.ndarray:
+        """Rows of all points in the grid cells overlapping the box."""
+        if len(self.xs) == 0 or max_x < min_x or max_y < min_y:
+            return np.zeros(0, dtype=np.int64)
+        col_from, col_to = (int(c) for c in self._cell_x([min_x, max_x]))
+        row_from, row_to = (int(r) for r in self._cell_y([min_y, max_y]))
+        if (col_to - col_from + 1) * (row_to - row_from + 1) >= len(self.xs):
+            # Box covers about as many cells as there are points, a plain scan is cheaper
+            return np.arange(len(self.xs))
+
+        grid_rows = np.arange(row_from, row_to + 1, dtype=np.int64) * self._cols
+        starts = np.searchsorted(self._sorted_cells, grid_rows + col_from, side="left")
+        ends = np.searchsorted(self._sorted_cells, grid_rows + col_to, side="right")
+        if not len(starts):
+            return np.zeros(0, dtype=np.int64)
+        return np.concatenate([self._order[start:end] for start, end in zip(starts.tolist(), ends.tolist())])
+
+    def _distances(self, rows: np.ndarray, x: float, y: float, z: Optional[float]) -> np.ndarray:
+        squared = (self.xs[rows] - x) ** 2 + (self.ys[rows] - y) ** 2
+        if z is not None:
+            squared += (self.zs[rows] - z) ** 2
+        return np.sqrt(squared)
+
+    def query_box_rows(self, min_x: float, min_y: float, max_x: float, max_y: float) -> np.ndarray:
+        rows = self._candidate_rows(min_x, min_y, max_x, max_y)
+        xs, ys = self.xs[rows], self.ys[rows]
+        return np.sort(rows[(xs >= min_x) & (xs <= max_x) & (ys >= min_y) & (ys <= max_y)])
+
+    def query_box(self, min_x: float, min_y: float, max_x: float, max_y: float) -> List[UUID]:
+        """Uuids of the actors with min_x <= x <= max_x and min_y <= y <= max_y."""
+        return self._uuids(self.query_box_rows(min_x, min_y, max_x, max_y))
+
+    def query_radius_rows(self, x: float, y: float, radius: float, z: Optional[float] = None) -> np.ndarray:
+        rows = self._candidate_rows(x - radius, y - radius, x + radius, y + radius)
+        return np.sort(rows[self._distances(rows, x, y, z) <= radius])
+
+    def query_radius(self, x: float, y: float, radius: float, z: Optional[float] = None) -> List[UUID]:
+        """Uuids of the actors within radius of (x, y), or of (x, y, z) when z is given."""
+        return self._uuids(self.query_radius_rows(x, y, radius, z))
+
+    def query_nearest_rows(self, x: float, y: float, k: int = 1, z: Optional[float] = None) -> np.ndarray:
+        k = min(k, len(self.xs))
+        if k <= 0:
+            return np.zeros(0, dtype=np.int64)
+        extent = max(self._cols, self._rows) * self.cell_size
+        radius = self.cell_size
+        while True:
+            # Every point within radius is a candidate, so once k of them are found those are the k nearest
+            rows = self._candidate_rows(x - radius, y - radius, x + radius, y + radius)
+            distances = self._distances(rows, x, y, z)
+            inside = distances <= radius
+            if inside.sum() >= k:
+                rows, distances = rows[inside], distances[inside]
+                break
+            if radius > 2 * extent:
+                rows = np.arange(len(self.xs))
+                distances = self._distances(rows, x, y, z)
+                break
+            radius *= 2
+        nearest = np.argsort(distances, kind="stable")[:k]
+        return rows[nearest]
+
+    def query_nearest(self, x: float, y: float, k: int = 1, z: Optional[float] = None) -> List[UUID]:
+        """Uuids of the k actors nearest to (x, y), or to (x, y, z) when z is given, nearest first."""
+        return self._uuids(self.query_nearest_rows(x, y, k, z))
+
+    def query_map_coordinates(self, map: ArkMap, coords: MapCoords, tolerance: float) -> List[UUID]:
+        """Candidates for ActorTransform.is_at_map_coordinate(map, coords, tolerance).
+
+        Returns the actors inside the world space box that corresponds to the lat/long square
+        around coords, callers still apply is_at_map_coordinate for the exact test.
+        """
+        params = MapCoordinateParameters.for_map(map)
+        corner_1 = params.transform_from(coords.lat - tolerance, coords.long - tolerance, coords.sub_map_name)
+        corner_2 = params.transform_from(coords.lat + tolerance, coords.long + tolerance, coords.sub_map_name)
+        # Pad by a unit to stay on the safe side of rounding in the coordinate conversion
+        return self.query_box(min(corner_1.x, corner_2.x) - 1, min(corner_1.y, corner_2.y) - 1,
+                              max(corner_1.x, corner_2.x) + 1, max(corner_1.y, corner_2.y) + 1)
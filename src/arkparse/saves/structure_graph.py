@@ -0,0 +1,89 @@
+from typing import Collection, Dict, Iterable, List, Mapping, Set, Tuple
+from uuid import UUID
+
+from arkparse.object_model.ark_game_object import ArkGameObject
+from arkparse.parsing.struct.object_reference import ObjectReference
+
+
+class StructureGraph:
+    """Connected groups of structures, from the links between them.
+
+    Two structures are connected when one of them references the other through one of the
+    EDGE_PROPERTIES. The groups (connected components) are computed once with union-find,
+    references to objects that are not part of the graph are ignored.
+    """
+
+    EDGE_PROPERTIES = ("LinkedStructures", "PlacedOnFloorStructure")
+
+    def __init__(self, uuids: Iterable[UUID], edges: Iterable[Tuple[UUID, UUID]]):
+        self._nodes: Dict[UUID, int] = {uuid_: i for i, uuid_ in enumerate(uuids)}
+        parents = list(range(len(self._nodes)))
+
+        def find(node: int) -> int:
+            root = node
+            while parents[root] != root:
+                root = parents[root]
+            while parents[node] != root:
+                parents[node], node = root, parents[node]
+            return root
+
+        for a, b in edges:
+            node_a, node_b = self._nodes.get(a), self._nodes.get(b)
+            if node_a is None or node_b is None:
+                continue
+            root_a, root_b = find(node_a), find(node_b)
+            if root_a != root_b:
+                parents[max(root_a, root_b)] = min(root_a, root_b)
+
+        # Number the components in order of their first structure
+        component_ids: Dict[int, int] = {}
+        self._component_of: Dict[UUID, int] = {}
+        self._components: List[List[UUID]] = []
+        for uuid_, node in self._nodes.items():
+            root = find(node)
+            if root not in component_ids:
+                component_ids[root] = len(self._components)
+                self._components.append([])
+            self._component_of[uuid_] = component_ids[root]
+            self._components[component_ids[root]].append(uuid_)
+
+    @staticmethod
+    def get_edges(obj: ArkGameObject) -> List[UUID]:
+        """Uuids of the structures obj links to, only reading the EDGE_PROPERTIES."""
+        references: List[ObjectReference] = list(obj.get_array_property_value("LinkedStructures", []))
+        placed_on = obj.get_property_value("PlacedOnFloorStructure")
+        if placed_on is not None:
+            references.append(placed_on)
+        return [UUID(reference.value) for reference in references
+                if reference is not None and reference.type == ObjectReference.TYPE_UUID and reference.value is not None]
+
+    @classmethod
+    def from_objects(cls, objects: Mapping[UUID, ArkGameObject]) -> "StructureGraph":
+        edges = [(uuid_, linked) for uuid_, obj in objects.items() for linked in cls.get_edges(obj)]
+        return cls(objects.keys(), edges)
+
+    def __len__(self) -> int:
+        return len(self._nodes)
+
+    def __contains__(self, uuid_: object) -> bool:
+        return uuid_ in self._nodes
+
+    def component_of(self, uuid_: UUID) -> Collection[UUID]:
+        """All structures connected to uuid, uuid included. Empty if uuid is not in the graph."""
+        component = self._component_of.get(uuid_)
+        return self._components[component] if component is not None else []
+
+    def components(self) -> List[List[UUID]]:
+        """The connected groups of structures, each structure is in exactly one of them."""
+        return self._components
+
+    def connected(self, uuids: Iterable[UUID]) -> Set[UUID]:
+        """All structures connected to any of the uuids, the uuids in the graph included."""
+        result = set()
+        seen = set()
+        for uuid_ in uuids:
+            component = self._component_of.get(uuid_)
+            if component is not None and component not in seen:
+                seen.add(component)
+                result.update(self._components[component])
+        return result
@@ -0,0 +1,95 @@
+from typing import Collection, Dict, Iterable, Mapping, Optional, Tuple
+from uuid import UUID
+
+import numpy as np
+
+from arkparse.enums import ArkMap, SubMap
+from arkparse.parsing.struct.actor_transform import ActorTransform, MapCoordinateParameters, _resolve_sub_map_name
+from arkparse.parsing.struct.actor_transform_table import ActorTransformTable
+
+
+def create_heatmap(map: ArkMap, xs, ys, zs=None, resolution: int = 100, weights=None, mask=None, sub_map: Optional[str | SubMap] = None) -> np.ndarray:
+    """Bin world coordinates into a resolution x resolution grid over the map's lat/long range.
+
+    Cell [i][j] covers latitude i * 100 / resolution and longitude j * 100 / resolution, so with
+    the default resolution the cells are the whole lat/long degrees. Points outside the map are
+    dropped. Without weights the cells hold counts, otherwise the sum of the weights. mask
+    selects the points to include, sub_map restricts the points to one sub map of the map.
+    """
+    lats, longs, sub_map_names = MapCoordinateParameters.for_map(map).transform_to_many(xs, ys, zs)
+    keep = np.ones(len(lats), dtype=bool) if mask is None else np.asarray(mask, dtype=bool).copy()
+    if sub_map is not None:
+        keep &= sub_map_names == _resolve_sub_map_name(sub_map)
+    if weights is not None:
+        weights = np.asarray(weights, dtype=np.float64)[keep]
+
+    heatmap, _, _ = np.histogram2d(lats[keep], longs[keep], bins=resolution, range=[[0, 100], [0, 100]], weights=weights)
+    if weights is None:
+        return heatmap.astype(np.int64)
+    return heatmap
+
+
+def transform_columns(transforms: Mapping[UUID, ActorTransform], uuids: Iterable[UUID]) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """x, y, z columns for the uuids, and a mask of the uuids that have a transform (others are 0)."""
+    uuids = list(uuids)
+    xs, ys, zs = np.zeros(len(uuids)), np.zeros(len(uuids)), np.zeros(len(uuids))
+    found = np.zeros(len(uuids), dtype=bool)
+
+    pending = range(len(uuids))
+    if isinstance(transforms, ActorTransformTable):
+        rows = np.array([-1 if row is None else row for row in map(transforms.row_of, uuids)], dtype=np.intp)
+        in_table = rows >= 0
+        table = transforms.array
+        xs[in_table] = table["x"][rows[in_table]]
+        ys[in_table] = table["y"][rows[in_table]]
+        zs[in_table] = table["z"][rows[in_table]]
+        found |= in_table
+        # Transforms assigned after reading are not in the array
+        pending = np.flatnonzero(~in_table).tolist()
+
+    for i in pending:
+        transform = transforms.get(uuids[i])
+        if transform is not None:
+            xs[i], ys[i], zs[i] = transform.x, transform.y, transform.z
+            found[i] = True
+
+    return xs, ys, zs, found
+
+
+def locations_to_columns(locations: Collection[Optional[ActorTransform]]) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """x, y, z columns of parsed object locations, and a mask of the ones that are set and not in a cryopod."""
+    columns = np.array([(0.0, 0.0, 0.0) if l is None else (l.x, l.y, l.z) for l in locations], dtype=np.float64).reshape(-1, 3)
+    found = np.array([l is not None and not l.in_cryopod for l in locations], dtype=bool)
+    return columns[:, 0], columns[:, 1], columns[:, 2], found
+
+
+def downsample_heatmap(heatmap: np.ndarray, factor: int) -> np.ndarray:
+    """Sum factor x factor blocks of cells, padding the edges with empty cells when needed."""
+    heatmap = np.asarray(heatmap)
+    if factor <= 1:
+        return heatmap
+    rows = -(-heatmap.shape[0] // factor) * factor
+    cols = -(-heatmap.shape[1] // factor) * factor
+    padded = np.zeros((rows, cols), dtype=heatmap.dtype)
+    padded[:heatmap.shape[0], :heatmap.shape[1]] = heatmap
+    return padded.reshape(rows // factor, factor, cols // factor, factor).sum(axis=(1, 3))
+
+
+def heatmap_tiles(heatmap: np.ndarray, tile_size: int = 256) -> Dict[Tuple[int, int, int], np.ndarray]:
+    """Split the heatmap into tiles at every zoom level.
+
+    Level 0 is the full resolution heatmap, every next level halves the resolution by summing
+    2 x 2 blocks, up to the level that fits in a single tile. Keys are (level, row, column),
+    tiles on the right and bottom edges can be smaller than tile_size.
+    """
+    tiles = {}
+    level = 0
+    current = np.asarray(heatmap)
+    while True:
+        for row in range(0, current.shape[0], tile_size):
+            for col in range(0, current.shape[1], tile_size):
+                tiles[(level, row // tile_size, col // tile_size)] = current[row:row + tile_size, col:col + tile_size]
+        if current.shape[0] <= tile_size and current.shape[1] <= tile_size:
+            return tiles
+        current = downsample_heatmap(current, 2)
+        level += 1
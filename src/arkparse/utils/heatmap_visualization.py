@@ -1,13 +1,17 @@
 from arkparse.enums import ArkMap, SubMap
 from importlib.resources import files
 
-def draw_heatmap(heatmap, map: ArkMap, submap: SubMap, map_fade: float = 0.7):
+def draw_heatmap(heatmap, map: ArkMap, submap: SubMap = None, map_fade: float = 0.7, max_resolution: int = 1024):
     import matplotlib.pyplot as plt
     import matplotlib.image as mpimg
     import numpy as np
+    from .heatmap import downsample_heatmap
 
+    heatmap = np.asarray(heatmap)
+    if len(heatmap) > max_resolution:
+        # Large heatmaps are summed down to at most max_resolution cells per side before drawing
+        heatmap = downsample_heatmap(heatmap, -(-len(heatmap) // max_resolution))
     resolution = len(heatmap)
-    mask = heatmap == 0
     package = 'arkparse.assets'
     name = f"{map.name}_{submap.value}.PNG" if submap else f"{map.name}.PNG"
     try:
@@ -24,6 +28,6 @@ def draw_heatmap(heatmap, map: ArkMap, submap: SubMap, map_fade: float = 0.7):
     is_all_zero = np.all(heatmap == 0)
     
     if not is_all_zero:
-        heatmap_display = plt.imshow(heatmap, cmap='hot', interpolation='nearest', alpha=0.5, vmin=0.1)
-        heatmap_display.set_alpha(np.where(mask, 0, 0.9))
+        # Empty cells are masked out instead of drawn with a per-cell alpha
+        plt.imshow(np.ma.masked_equal(heatmap, 0), cmap='hot', interpolation='nearest', alpha=0.9, vmin=0.1)
     plt.show()
\ No newline at end of file
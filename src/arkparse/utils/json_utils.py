@@ -1,8 +1,12 @@
+from dataclasses import fields, is_dataclass
 from json import JSONEncoder
 
 class DefaultJsonEncoder(JSONEncoder):
     def default(self, o):
         if '__dict__' in dir(o):
             return o.__dict__
+        elif is_dataclass(o) and hasattr(o, '__slots__'):
+            # Slotted dataclasses (ArkProperty, ArkVector, ...) have no __dict__
+            return {f.name: getattr(o, f.name) for f in fields(o) if not f.name.startswith('_') and hasattr(o, f.name)}
         else:
             return o.__str__()
@@ -70,6 +70,25 @@ def __create_config_directory():
 
 CONFIG_FILE_DIR = __create_config_directory()
 
+def __create_index_directory():
+    """
+    Creates a directory for persistent save index files, next to the config directory.
+    Unlike the temp files directory, it is not cleared on startup.
+
+    Returns:
+        Path: The Path object of the created directory.
+    """
+    if os.name == 'nt':  # Windows
+        base_dir = Path(os.getenv('LOCALAPPDATA', Path.home() / 'AppData' / 'Local'))
+    else:  # Linux/macOS
+        base_dir = Path(os.getenv('XDG_CACHE_HOME', Path.home() / '.cache'))
+
+    index_dir = base_dir / 'asp' / 'index'
+    index_dir.mkdir(parents=True, exist_ok=True)
+    return index_dir
+
+INDEX_FILE_DIR = __create_index_directory()
+
 
 
 def write_config_file(filename: str, content: Union[dict, list]):
@@ -0,0 +1,60 @@
+"""Memory: bytes per parsed property for the slotted property/struct classes,
+compared to the same instances backed by a per-instance __dict__."""
+import sys
+from dataclasses import fields
+
+from arkparse import AsaSave
+from arkparse.parsing import ArkPropertyContainer
+from arkparse.parsing.ark_property import ArkProperty
+from arkparse.parsing.struct import ArkVector
+from arkparse.parsing.struct.ark_color import ArkColor
+from arkparse.parsing.struct.ark_linear_color import ArkLinearColor
+from arkparse.parsing.struct.ark_quat import ArkQuat
+from arkparse.parsing.struct.ark_rotator import ArkRotator
+from arkparse.parsing.struct.object_reference import ObjectReference
+
+COMPACT_TYPES = (ArkProperty, ArkVector, ArkRotator, ArkColor, ArkLinearColor, ArkQuat, ObjectReference)
+
+
+def _dict_backed_size(instance, cache: dict) -> int:
+    """Size the instance would have as a regular object with a __dict__ holding the same attributes."""
+    cls = type(instance)
+    if cls not in cache:
+        twin = type(f"DictBacked{cls.__name__}", (), {})()
+        for f in fields(instance):
+            setattr(twin, f.name, getattr(instance, f.name, None))
+        cache[cls] = sys.getsizeof(twin) + sys.getsizeof(twin.__dict__)
+    return cache[cls]
+
+
+def _walk(value, found: list):
+    if isinstance(value, ArkPropertyContainer):
+        for prop in value.properties:
+            _walk(prop, found)
+    elif isinstance(value, list):
+        for item in value:
+            _walk(item, found)
+    elif isinstance(value, COMPACT_TYPES):
+        found.append(value)
+        if isinstance(value, ArkProperty):
+            _walk(value.value, found)
+
+
+def test_bytes_per_property(save: AsaSave):
+    instances = []
+    nr_of_properties = 0
+    for obj in save.get_game_objects().values():
+        nr_of_properties += len(obj.properties)
+        _walk(obj, instances)
+    assert nr_of_properties > 0, "Expected parsed properties"
+
+    for cls in COMPACT_TYPES:
+        assert "__slots__" in cls.__dict__, f"{cls.__name__} should use __slots__"
+
+    cache = {}
+    compact = sum(sys.getsizeof(instance) for instance in instances)
+    dict_backed = sum(_dict_backed_size(instance, cache) for instance in instances)
+    print(f"Compact instances: {len(instances)} for {nr_of_properties} top-level properties")
+    print(f"Bytes per property (instance overhead): {dict_backed / nr_of_properties:.1f} with __dict__, "
+          f"{compact / nr_of_properties:.1f} with __slots__")
+    assert compact < dict_backed
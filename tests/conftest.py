@@ -176,3 +176,24 @@ def rag_limited():
     resource = AsaSave(save_path(ArkMap.RAGNAROK, "set_2"))
     yield resource
     _dispose_save(resource)
+
+@pytest.fixture
+def rag_limited_db(rag_limited: AsaSave, temp_file_folder: Path, request: pytest.FixtureRequest) -> Path:
+    """
+    Stores a copy of the rag_limited save as a database file of its own, for tests
+    that edit a save or open it with other options.
+    """
+    path = temp_file_folder / f"{request.function.__name__}.db"
+    rag_limited.store_db(path)
+    return path
+
+@pytest.fixture
+def rag_limited_copy(rag_limited_db: Path, request: pytest.FixtureRequest):
+    """
+    Yields a writable save opened from rag_limited_db and closes it after the test.
+    Options for AsaSave can be passed with indirect parametrization, e.g.
+    @pytest.mark.parametrize("rag_limited_copy", [{"use_index": True}], indirect=True)
+    """
+    save = AsaSave(path=rag_limited_db, **getattr(request, "param", {}))
+    yield save
+    save.close()
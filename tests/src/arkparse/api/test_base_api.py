@@ -318,3 +318,19 @@ def test_turret_ammo(rag_limited: AsaSave, temp_file_folder: Path, resource_path
 
     
 
+
+def test_connected_bases(rag_limited: AsaSave, temp_file_folder: Path):
+    """
+    Test that the structure graph groups every structure once and that bases follow its groups.
+    """
+    base_api = get_base_api(rag_limited, temp_file_folder)
+    graph = base_api.get_structure_graph()
+    assert graph is base_api.get_structure_graph(), "Structure graph should be cached while the save is unchanged"
+    assert graph is base_api.save.get_structure_graph(), "Structure graph should be cached on the save"
+    assert not any(obj.partially_decoded for obj in base_api.save.object_cache.values()), "Building the graph should not cache partially decoded objects"
+    assert sum(len(component) for component in graph.components()) == len(graph)
+
+    bases = base_api.get_all_bases(only_connected=True, min_structures=2)
+    for base in bases:
+        structures = {key: base.structures[key] for key in list(base.structures)[:1]}
+        assert set(base_api.get_connected_structures(structures).keys()) == set(base.structures.keys())
@@ -3,7 +3,7 @@ import pytest
 from typing import Dict
 
 from arkparse import AsaSave
-from arkparse.api import StructureApi
+from arkparse.api import DinoApi, ScanCoordinator, StackableApi, StructureApi
 from arkparse.enums import ArkMap
 
 def structures_per_map(map: ArkMap) -> int:
@@ -35,3 +35,67 @@ def test_structure_retrieval(map_save):
 
     # Maps without an explicit expectation fall back to "greater than zero".
     assert len(structures) >= max(structures_per_map(map), 1), f"Expected at least {max(structures_per_map(map), 1)} structures, got {len(structures)}"
+
+def test_structures_at_location(ragnarok_save: AsaSave):
+    """
+    Test that the spatial index based location query returns the same structures as checking every structure.
+    """
+    structures = StructureApi(ragnarok_save).get_all()
+    located = [structure for structure in structures.values() if structure.location is not None]
+    assert len(located) > 0, "Expected structures with a location"
+
+    for structure in located[::max(1, len(located) // 5)]:
+        coords = structure.location.as_map_coords(ArkMap.RAGNAROK)
+        for radius in (0.05, 0.3):
+            expected = {key for key, s in structures.items() if s.location is not None and s.location.is_at_map_coordinate(ArkMap.RAGNAROK, coords, tolerance=radius)}
+            found = StructureApi(ragnarok_save).get_at_location(ArkMap.RAGNAROK, coords, radius)
+            assert set(found.keys()) == expected
+            assert structure.object.uuid in found
+
+def test_structure_heatmap(ragnarok_save: AsaSave):
+    """
+    Test that the heatmap built from the raw objects matches the one built from the parsed structures.
+    """
+    api = StructureApi(ragnarok_save)
+    heatmap = api.create_heatmap(ArkMap.RAGNAROK)
+    structures = api.get_all()
+
+    assert heatmap.shape == (100, 100)
+    assert heatmap.sum() > 0, "Expected structures on the heatmap"
+    assert (heatmap == api.create_heatmap(ArkMap.RAGNAROK, structures=structures)).all()
+    assert (api.create_heatmap(ArkMap.RAGNAROK, weights=lambda structure: 2) == 2 * heatmap).all()
+
+def test_scan_coordinator_matches_separate_scans(ragnarok_save: AsaSave):
+    """
+    Test that a single coordinated scan hands every api the same objects as its own scan.
+    """
+    expected = [set(api.get_all_objects().keys()) for api in (StructureApi(ragnarok_save), DinoApi(ragnarok_save), StackableApi(ragnarok_save))]
+
+    scan = ScanCoordinator(ragnarok_save)
+    apis = [scan.add(StructureApi(ragnarok_save)), scan.add(DinoApi(ragnarok_save)), scan.add(StackableApi(ragnarok_save))]
+    scan.run()
+    assert [set(api.get_all_objects().keys()) for api in apis] == expected
+
+def test_owner_change_keeps_positions_aligned(ragnarok_save: AsaSave):
+    from arkparse.object_model.ark_game_object import ArkGameObject
+    from arkparse.object_model.misc.object_owner import ObjectOwner
+    from arkparse.parsing import ArkBinaryParser
+
+    structures = [s for s in StructureApi(ragnarok_save).get_all().values() if s.object.has_property("OwnerName")][:20]
+    assert len(structures) > 0, "Save should have owned structures"
+    for structure in structures:
+        new_owner = ObjectOwner()
+        new_owner.set_tribe(1234, "A tribe name of a different length")
+        new_owner.set_player(5678, "Player")
+        structure.owner.replace_self_with(new_owner, structure.binary)
+
+        reparsed = ArkGameObject(uuid=structure.object.uuid, blueprint=structure.object.blueprint,
+                                 binary_reader=ArkBinaryParser(structure.binary.byte_buffer, ragnarok_save.save_context))
+        assert reparsed.get_property_value("OwnerName") == "A tribe name of a different length"
+        assert [(p.name, p.value_position) for p in structure.object.properties] == [(p.name, p.value_position) for p in reparsed.properties]
+
+        # The unsaved edits don't move the positions of the object the save hands out
+        cached = ragnarok_save.get_game_object_by_id(structure.object.uuid)
+        stored = ArkGameObject(uuid=structure.object.uuid, blueprint=structure.object.blueprint,
+                               binary_reader=ragnarok_save.get_parser_for_game_object(structure.object.uuid))
+        assert [(p.name, p.value_position) for p in cached.properties] == [(p.name, p.value_position) for p in stored.properties]
@@ -1,9 +1,9 @@
 import pytest
-import time
 from pathlib import Path
 from uuid import UUID, uuid4
 
 from arkparse import AsaSave
+from arkparse.parsing import GameObjectReaderConfiguration
 from arkparse.parsing.struct import ActorTransform, ArkVector
 from arkparse.logging import ArkSaveLogger
 
@@ -62,4 +62,438 @@ def test_modify_actor_transform(rag_limited: AsaSave, temp_file_folder: Path):
     print(f"Modified actor transform distance: {at.get_distance_to(modified_location)}")
     assert at.get_distance_to(modified_location) < 100, (
         f"Actor transform should be close to the modified location, got {at.get_distance_to(modified_location)}"
-    )
\ No newline at end of file
+    )
+
+def test_copy_on_write_keeps_source_untouched(rag_limited_db: Path):
+    source = rag_limited_db
+    original_bytes = source.read_bytes()
+
+    save = AsaSave(path=source, copy_on_write=True)
+    assert save.save_connection.is_attached_to_source, "Save should be attached to the source file until the first write"
+    assert len(save.get_game_objects()) > 0, "Attached save should be readable"
+
+    save.add_actor_transform(uuid4(), ActorTransform(vector=ArkVector(x=1.0, y=2.0, z=3.0)).to_bytes())
+    assert not save.save_connection.is_attached_to_source, "First write should switch to a working copy"
+    assert source.read_bytes() == original_bytes, "Source save file should not be modified by writes"
+    save.close()
+
+    read_only_save = AsaSave(path=source, read_only=True)
+    assert not read_only_save.save_connection.is_attached_to_source, "Read only saves should read a private copy"
+    read_only_save.close()
+
+
+def test_in_memory_save_from_contents(rag_limited: AsaSave, temp_file_folder: Path):
+    contents = rag_limited.get_bytes()
+    save = AsaSave(contents=contents)
+    assert save.save_connection.is_in_memory, "Saves loaded from contents should be deserialized in memory"
+    assert save.save_connection.sqlite_db is None, "In-memory saves should not create a temp file"
+    assert len(save.get_all_present_classes()) == len(rag_limited.get_all_present_classes())
+
+    new_uuid: UUID = uuid4()
+    new_location = ActorTransform(vector=ArkVector(x=118368.11, y=172509.7, z=-10290))
+    save.add_actor_transform(new_uuid, new_location.to_bytes())
+
+    reparse_save = AsaSave(contents=save.get_bytes())
+    at = reparse_save.save_context.get_actor_transform(new_uuid)
+    assert at is not None, "Actor transform should survive serializing the in-memory save"
+    assert at.get_distance_to(new_location) < 100
+
+
+@pytest.mark.parametrize("rag_limited_copy", [{"lazy": True, "copy_on_write": True}], indirect=True)
+def test_lazy_initialization(rag_limited: AsaSave, rag_limited_copy: AsaSave):
+    save = rag_limited_copy
+    assert save.get_game_object_count() == len(rag_limited.save_connection.get_obj_uuids())
+    assert save.save_context.current_day == rag_limited.save_context.current_day
+    assert save.save_context.current_time == rag_limited.save_context.current_time
+    assert len(save.save_context.actor_transforms) == len(rag_limited.save_context.actor_transforms)
+
+
+def test_save_index_matches_full_scan(rag_limited_db: Path):
+    from arkparse.saves.save_index import SaveIndex
+
+    source = rag_limited_db
+    SaveIndex.default_path(source).unlink(missing_ok=True)
+
+    config = GameObjectReaderConfiguration(
+        blueprint_name_filter=lambda name: name is not None and "Structures" in name,
+        property_names=["MaxHealth"],
+    )
+    reference = AsaSave(path=source, read_only=True)
+    expected = set(reference.save_connection.get_game_objects(config).keys())
+
+    for _ in range(2):  # first run builds the index, second run loads it from disk
+        save = AsaSave(path=source, read_only=True, use_index=True)
+        assert set(save.save_connection.get_game_objects(config).keys()) == expected
+        assert save.get_all_present_classes() == reference.get_all_present_classes()
+        assert SaveIndex.default_path(source).exists(), "Index should be stored next to the other cache files"
+        save.close()
+    reference.close()
+
+
+def test_skipped_classes_are_counted_once_per_object(rag_limited: AsaSave, rag_limited_db: Path):
+    from arkparse.saves.save_connection import SaveConnection
+
+    source = rag_limited_db
+    class_name = next(iter(rag_limited.get_game_objects().values())).blueprint
+    configs = [GameObjectReaderConfiguration(), GameObjectReaderConfiguration(blueprint_name_filter=lambda name: name == class_name)]
+
+    previous = SaveConnection.failed_parses.get(class_name)
+    faulty = []
+    try:
+        for use_index in (False, True):
+            SaveConnection.failed_parses[class_name] = 6
+            save = AsaSave(path=source, read_only=True, use_index=use_index)
+            save.get_game_objects_multi(configs)
+            faulty.append(save.save_connection.faulty_objects)
+            save.close()
+            assert SaveConnection.failed_parses[class_name] > 6, "Objects of the class should have been skipped"
+    finally:
+        if previous is None:
+            SaveConnection.failed_parses.pop(class_name, None)
+        else:
+            SaveConnection.failed_parses[class_name] = previous
+    assert faulty[0] == faulty[1], "The index and the scan should count a skipped object once"
+
+
+def test_iter_game_objects_streams_without_caching(rag_limited: AsaSave):
+    expected = set(rag_limited.get_game_objects().keys())
+    rag_limited.reset_caching()
+
+    streamed = set()
+    for obj_uuid, obj in rag_limited.iter_game_objects(batch_size=500):
+        assert obj.uuid == obj_uuid
+        streamed.add(obj_uuid)
+
+    assert streamed == expected, "Streaming should yield the same objects as get_game_objects"
+    assert len(rag_limited.save_connection.parsed_objects) == 0, "Streamed objects should not be cached by default"
+
+
+def test_object_cache_budget_keeps_pinned_objects(rag_limited: AsaSave):
+    from arkparse.object_model.misc.__parsed_object_base import ParsedObjectBase
+
+    objects = rag_limited.get_game_objects()
+    pinned_uuid = next(iter(objects))
+    wrapper = ParsedObjectBase(pinned_uuid, rag_limited)
+    del objects
+
+    try:
+        rag_limited.set_object_cache_budget(max_entries=10)
+        cache = rag_limited.object_cache
+        assert len(cache) <= 10
+        assert pinned_uuid in cache, "Objects wrapped by a live ParsedObjectBase should not be evicted"
+        assert rag_limited.cache_stats.evictions > 0
+
+        hits = rag_limited.cache_stats.hits
+        assert rag_limited.get_game_object_by_id(pinned_uuid) is wrapper.object
+        assert rag_limited.cache_stats.hits == hits + 1
+    finally:
+        rag_limited.set_object_cache_budget()
+
+
+def test_process_pool_parsing_matches_sequential(rag_limited: AsaSave, rag_limited_copy: AsaSave):
+    save = rag_limited_copy
+    save.use_process_pool(max_workers=2, chunk_size=128)
+    objects = save.get_game_objects()
+    expected = rag_limited.get_game_objects()
+
+    assert set(objects.keys()) == set(expected.keys())
+    for obj_uuid, obj in objects.items():
+        assert obj.blueprint == expected[obj_uuid].blueprint
+        assert len(obj.properties) == len(expected[obj_uuid].properties)
+
+
+def test_decode_only_matches_full_decoding(rag_limited: AsaSave, rag_limited_copy: AsaSave):
+    save = rag_limited_copy
+    objects = save.get_game_objects(GameObjectReaderConfiguration(decode_only={"MaxHealth"}))
+    expected = rag_limited.get_game_objects()
+
+    assert set(objects.keys()) == set(expected.keys())
+    assert any(obj.partially_decoded for obj in objects.values())
+    for obj_uuid, obj in objects.items():
+        full = expected[obj_uuid]
+        for name in full.property_names:
+            assert obj.has_property(name)
+        # reading all property names completes the decoding of skipped properties
+        assert obj.property_names == full.property_names
+        assert [(p.name, p.position, p.name_position) for p in obj.properties] == \
+               [(p.name, p.position, p.name_position) for p in full.properties]
+        assert not obj.partially_decoded
+
+
+def test_missing_property_lookup_keeps_projection(rag_limited: AsaSave, rag_limited_copy: AsaSave):
+    save = rag_limited_copy
+    objects = save.get_game_objects(GameObjectReaderConfiguration(decode_only={"MaxHealth"}))
+    expected = rag_limited.get_game_objects()
+
+    checked = 0
+    for obj_uuid, obj in objects.items():
+        full = expected[obj_uuid]
+        simple = [p.name for p in full.properties if p.name != "MaxHealth" and p.type not in ("Struct", "Array", "Map")]
+        if not obj.partially_decoded or len(simple) == 0:
+            continue
+        # Only skipped properties that can hold nested ones are decoded for a missing name
+        assert obj.get_property_value("NotAPropertyOfAnyObject") is None
+        assert obj.partially_decoded
+        assert obj.get_property_value(simple[0]) == full.get_property_value(simple[0])
+        checked += 1
+    assert checked > 0
+
+
+def test_lazy_properties_decode_on_first_access(rag_limited: AsaSave, rag_limited_copy: AsaSave):
+    save = rag_limited_copy
+    objects = save.get_game_objects(GameObjectReaderConfiguration(lazy_properties=True))
+    expected = rag_limited.get_game_objects()
+
+    assert set(objects.keys()) == set(expected.keys())
+    lazy = [obj for obj in objects.values() if obj.partially_decoded]
+    assert len(lazy) > 0, "Objects should only read their header in lazy mode"
+    for obj in lazy:
+        full = expected[obj.uuid]
+        assert obj.blueprint == full.blueprint
+        assert obj.names == full.names
+        assert [(p.name, p.position) for p in obj.properties] == [(p.name, p.position) for p in full.properties]
+        assert not obj.partially_decoded
+
+
+def test_tracked_lazy_object_survives_inserts(rag_limited: AsaSave):
+    from arkparse.parsing import ArkBinaryParser
+    from arkparse.object_model.ark_game_object import ArkGameObject
+    for obj_uuid in list(rag_limited.get_obj_uuids())[:200]:
+        full = rag_limited.get_game_object_by_id(obj_uuid)
+        if full is None or len(full.properties) < 2:
+            continue
+        data = rag_limited.save_connection.get_game_obj_binary(obj_uuid)
+        for options in ({"decode_only": [full.properties[0].name]}, {"lazy": True}):
+            # The skipped properties are read from the parser that is edited
+            parser = ArkBinaryParser(data, rag_limited.save_context)
+            obj = ArkGameObject(uuid=obj_uuid, blueprint=full.blueprint, binary_reader=parser, **options)
+            parser.track_positions(obj)
+            parser.insert_bytes(bytes(4), position=full.properties[0].end_position)
+            assert [p.name for p in obj.properties] == [p.name for p in full.properties]
+            assert obj.properties[1].name_position == full.properties[1].name_position + 4
+
+def test_property_bytes_are_spans_of_the_object_blob(rag_limited: AsaSave):
+    objects = rag_limited.get_game_objects()
+    obj_uuid, obj = next((u, o) for u, o in objects.items() if len(o.properties) > 0)
+    blob = rag_limited.save_connection.get_game_obj_binary(obj_uuid)
+
+    for prop in obj.properties:
+        assert prop.bytes == blob[prop.name_position:prop.end_position]
+        assert prop.byte_span.tobytes() == prop.bytes
+
+
+def test_actor_transform_table(rag_limited: AsaSave):
+    from arkparse.parsing.struct import ActorTransformTable
+
+    table = rag_limited.save_context.actor_transforms
+    assert isinstance(table, ActorTransformTable)
+    assert len(table) == len(table.array) > 0
+    assert table.locations.shape == (len(table), 3)
+
+    blob = rag_limited.get_custom_value("ActorTransforms").byte_buffer
+    positions = rag_limited.save_context.actor_transform_positions
+    for row, obj_uuid in zip(range(100), table):
+        transform = rag_limited.save_context.get_actor_transform(obj_uuid)
+        assert transform is table[obj_uuid], "Views should be created once and reused"
+        assert (transform.x, transform.y, transform.z) == tuple(table.locations[row])
+        assert blob[positions[obj_uuid]:positions[obj_uuid] + 16] == obj_uuid.bytes
+
+def test_actor_transform_edits_in_batch(rag_limited: AsaSave, rag_limited_copy: AsaSave, temp_file_folder: Path):
+    save = rag_limited_copy
+    transforms = save.save_context.actor_transforms
+    existing = list(transforms)[:2]
+    new_uuids = [uuid4() for _ in range(5)]
+    moved = ActorTransform(vector=ArkVector(x=7777.0, y=7777.0, z=-7777))
+
+    with save.batch():
+        save.add_actor_transforms(b"".join(new_uuid.bytes + moved.to_bytes() for new_uuid in new_uuids))
+        save.modify_actor_transform(existing[0], moved.to_bytes())
+        save.remove_actor_transform(existing[1])
+        save.remove_actor_transform(new_uuids[0])
+        # Edits are visible without reading the actor transforms again
+        assert save.save_context.get_actor_transform(existing[0]).get_distance_to(moved) < 1
+        assert all(save.save_context.get_actor_transform(new_uuid) is not None for new_uuid in new_uuids[1:])
+        assert existing[1] not in transforms and new_uuids[0] not in transforms
+
+    blob = save.get_custom_value("ActorTransforms").byte_buffer
+    positions = save.save_context.actor_transform_positions
+    for obj_uuid in new_uuids[1:] + existing[:1]:
+        assert blob[positions[obj_uuid]:positions[obj_uuid] + 16] == obj_uuid.bytes
+
+    save.store_db(temp_file_folder / "test_actor_transform_edits.db")
+    reparse_save = AsaSave(path=temp_file_folder / "test_actor_transform_edits.db", read_only=True)
+    assert len(reparse_save.save_context.actor_transforms) == len(rag_limited.save_context.actor_transforms) + len(new_uuids) - 2
+    assert reparse_save.save_context.get_actor_transform(existing[0]).get_distance_to(moved) < 1
+    assert reparse_save.save_context.get_actor_transform(existing[1]) is None
+    reparse_save.close()
+
+def test_spatial_index_follows_moved_actors(rag_limited_copy: AsaSave):
+    save = rag_limited_copy
+    obj_uuid = next(iter(save.save_context.actor_transforms))
+    assert save.get_spatial_index().query_radius(900000.0, 900000.0, 10) == []
+
+    save.modify_actor_transform(obj_uuid, ActorTransform(vector=ArkVector(x=900000.0, y=900000.0, z=0.0)).to_bytes())
+    assert save.get_spatial_index().query_radius(900000.0, 900000.0, 10) == [obj_uuid]
+
+def test_vectorized_map_coordinates(rag_limited: AsaSave):
+    from arkparse.enums import ArkMap
+    from arkparse.parsing.struct import MapCoordinateParameters
+
+    parameters = MapCoordinateParameters.for_map(ArkMap.RAGNAROK)
+    assert parameters is MapCoordinateParameters.for_map(ArkMap.RAGNAROK)
+
+    table = rag_limited.save_context.actor_transforms
+    lats, longs, sub_map_names = parameters.transform_to_many(table.array["x"], table.array["y"], table.array["z"])
+    xs, ys = parameters.transform_from_many(lats, longs, sub_map_names)
+    for row, obj_uuid in zip(range(100), table):
+        coords = table[obj_uuid].as_map_coords(ArkMap.RAGNAROK)
+        assert (coords.lat, coords.long, coords.sub_map_name) == pytest.approx((lats[row], longs[row], sub_map_names[row]))
+        assert (xs[row], ys[row]) == pytest.approx((table[obj_uuid].x, table[obj_uuid].y))
+
+def test_ownership_index_matches_containers(rag_limited: AsaSave):
+    config = GameObjectReaderConfiguration()
+    config.property_names = ["MyInventoryComponent"]
+    containers = rag_limited.get_game_objects(config)
+    assert len(containers) > 0, "Expected objects with an inventory"
+
+    index = rag_limited.get_ownership_index()
+    assert index is rag_limited.get_ownership_index(), "Ownership index should be cached while the save is unchanged"
+    for obj_uuid, container in list(containers.items())[:100]:
+        inv_uuid = UUID(container.get_property_value("MyInventoryComponent").value)
+        assert index.get_container_of_inventory(inv_uuid) == obj_uuid
+        assert rag_limited.get_container_of_inventory(inv_uuid).uuid == obj_uuid
+
+
+def test_batched_class_lookup(rag_limited: AsaSave, rag_limited_copy: AsaSave):
+    save = rag_limited_copy
+    uuids = list(save.get_obj_uuids())[:2000]
+    missing = uuid4()
+    classes = save.get_classes_of_uuids(uuids + [missing])
+    assert missing not in classes, "Objects that are not in the save should be left out"
+    assert len(classes) == len(uuids)
+
+    for obj_uuid in uuids[:200]:
+        assert classes[obj_uuid] == rag_limited.get_class_of_uuid(obj_uuid)
+
+
+def test_get_game_objects_by_ids(rag_limited: AsaSave, rag_limited_copy: AsaSave):
+    save = rag_limited_copy
+    uuids = list(save.get_obj_uuids())[:2000]
+    missing = uuid4()
+    objects = save.get_game_objects_by_ids(uuids + [missing])
+    assert missing not in objects, "Objects that are not in the save should be left out"
+    wanted = set(uuids)
+    expected = rag_limited.get_game_objects(GameObjectReaderConfiguration(uuid_filter=lambda obj_uuid: obj_uuid in wanted))
+    assert set(objects.keys()) == set(expected.keys())
+    for obj_uuid, obj in list(objects.items())[:200]:
+        assert save.get_game_object_by_id(obj_uuid) is obj, "Objects should be cached after a batch fetch"
+        assert obj.blueprint == rag_limited.get_game_object_by_id(obj_uuid).blueprint
+
+
+def test_inventory_items_are_wrapped_from_one_batch(rag_limited: AsaSave, rag_limited_copy: AsaSave):
+    from arkparse.object_model.misc.inventory import Inventory
+    save = rag_limited_copy
+    inv_uuid = next(obj_uuid for obj_uuid, obj in rag_limited.get_game_objects().items()
+                    if len(obj.get_array_property_value("InventoryItems", [])) > 2)
+    # The batch of items does not fit the cache, the wrappers use the batch result instead
+    save.set_object_cache_budget(max_entries=1)
+    inventory = Inventory(inv_uuid, save)
+    lookups = []
+    is_in_db = save.is_in_db
+    save.is_in_db = lambda obj_uuid: lookups.append(obj_uuid) or is_in_db(obj_uuid)
+
+    items = inventory.items
+    assert len(items) == len(inventory.item_classes) > 2
+    assert all(item.object is not None and item.object.uuid == item_uuid for item_uuid, item in items.items())
+    assert lookups == [], "Items should not be looked up one by one"
+
+
+def test_write_batch(rag_limited_copy: AsaSave, temp_file_folder: Path):
+    save = rag_limited_copy
+    uuids = list(save.get_obj_uuids())[:100]
+    binaries = save.save_connection.get_game_obj_binaries(uuids)
+    new_uuid = uuid4()
+    fingerprint = save.fingerprint
+    with save.batch():
+        for obj_uuid in uuids:
+            save.modify_game_obj(obj_uuid, binaries[obj_uuid])
+        save.add_obj_to_db(new_uuid, binaries[uuids[0]])
+        assert save.is_in_db(new_uuid), "Queued writes should be visible inside the batch"
+        assert save.get_game_object_by_id(new_uuid).blueprint == save.get_game_object_by_id(uuids[0]).blueprint
+    assert save.fingerprint == fingerprint + len(uuids) + 1
+
+    save.store_db(temp_file_folder / "test_write_batch.db")
+    reparse_save = AsaSave(path=temp_file_folder / "test_write_batch.db", read_only=True)
+    assert reparse_save.is_in_db(new_uuid)
+    assert reparse_save.save_connection.get_game_obj_binaries(uuids) == binaries
+    reparse_save.close()
+
+def test_failed_write_batch_is_rolled_back(rag_limited_copy: AsaSave):
+    save = rag_limited_copy
+    uuids = list(save.get_obj_uuids())[:100]
+    binaries = save.save_connection.get_game_obj_binaries(uuids)
+    actor_transforms = save.get_custom_value("ActorTransforms").byte_buffer
+    new_uuid = uuid4()
+    with pytest.raises(RuntimeError):
+        with save.batch():
+            for obj_uuid in uuids:
+                save.modify_game_obj(obj_uuid, binaries[uuids[0]])
+            save.add_obj_to_db(new_uuid, binaries[uuids[0]])
+            save.add_actor_transform(new_uuid, ActorTransform(vector=ArkVector(x=1.0, y=2.0, z=3.0)).to_bytes())
+            raise RuntimeError("Failed halfway")
+
+    assert not save.is_in_db(new_uuid)
+    assert save.save_connection.get_game_obj_binaries(uuids) == binaries
+    assert save.get_custom_value("ActorTransforms").byte_buffer == actor_transforms
+    assert save.save_context.get_actor_transform(new_uuid) is None
+
+def test_patch_fixed_size_values_in_place(rag_limited_copy: AsaSave, temp_file_folder: Path):
+    from arkparse.api import StructureApi
+    save = rag_limited_copy
+    structures = [s for s in StructureApi(save).get_all().values() if s.object.find_property("MaxHealth") is not None][:20]
+    assert len(structures) > 0, "Save should have structures with a MaxHealth"
+    for structure in structures:
+        structure.set_max_health(1234.0)
+        assert structure.binary.patches == [], "Fixed size edits should have been written as patches"
+        assert save.get_game_object_by_id(structure.object.uuid).get_property_value("MaxHealth") == 1234.0
+
+    save.store_db(temp_file_folder / "test_patch_in_place.db")
+    reparse_save = AsaSave(path=temp_file_folder / "test_patch_in_place.db", read_only=True)
+    for structure in structures:
+        assert reparse_save.save_connection.get_game_obj_binary(structure.object.uuid) == structure.binary.byte_buffer
+    reparse_save.close()
+
+def test_property_serializer_round_trip(rag_limited: AsaSave, rag_limited_copy: AsaSave):
+    from arkparse.api import StructureApi
+    from arkparse.parsing import ArkPropertySerializer
+    save = rag_limited_copy
+    serializer = ArkPropertySerializer(rag_limited.save_context)
+    uuids = list(rag_limited.get_obj_uuids())
+    for start in range(0, len(uuids), 2000):
+        chunk = uuids[start:start + 2000]
+        binaries = rag_limited.save_connection.get_game_obj_binaries(chunk)
+        for obj_uuid, obj in rag_limited.get_game_objects_by_ids(chunk).items():
+            assert serializer.encode_object(obj, binaries[obj_uuid]) == binaries[obj_uuid], f"Encoding {obj.blueprint} changed its binary"
+
+    structure = next(s for s in StructureApi(save).get_all().values() if s.object.find_property("OwnerName") is not None and s.object.find_property("MaxHealth") is not None)
+    structure.object.find_property("OwnerName").value = "A tribe name that is longer than before"
+    structure.object.find_property("MaxHealth").value = 4321.0
+    structure.store_properties()
+    stored = save.get_game_object_by_id(structure.object.uuid)
+    assert stored.get_property_value("OwnerName") == "A tribe name that is longer than before"
+    assert stored.get_property_value("MaxHealth") == 4321.0
+
+@pytest.mark.parametrize("rag_limited_copy", [{"use_index": True}], indirect=True)
+def test_patched_class_change_updates_index(rag_limited_copy: AsaSave):
+    from arkparse.api import StructureApi
+    save = rag_limited_copy
+    structure = next(iter(StructureApi(save).get_all().values()))
+    old_class = structure.object.blueprint
+    new_class = next(class_name for class_name in save.get_all_present_classes() if class_name != old_class)
+    structure.object.change_class(new_class, structure.binary, renumber=False, save=save)
+    assert len(structure.binary.patches) == 1, "A class id change should be a single in place patch"
+    structure.update_binary()
+
+    assert save.save_connection.get_class_of_uuid(structure.object.uuid) == new_class
+    assert structure.object.uuid in save.get_game_objects(GameObjectReaderConfiguration(blueprint_name_filter=lambda name: name == new_class))
+    assert structure.object.uuid not in save.get_game_objects(GameObjectReaderConfiguration(blueprint_name_filter=lambda name: name == old_class))